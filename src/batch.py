@@ -0,0 +1,527 @@
+from typing import Dict, Optional
+import numpy as np
+from config import GAME_CONFIG, RoleType, check_config
+from knowledge import ROLE_INDEX, NUM_ROLES, prior_table
+from events import WinCause
+
+WOLF = ROLE_INDEX[RoleType.WEREWOLF]
+VILLAGER = ROLE_INDEX[RoleType.VILLAGER]
+SEER = ROLE_INDEX[RoleType.SEER]
+WITCH = ROLE_INDEX[RoleType.WITCH]
+HUNTER = ROLE_INDEX[RoleType.HUNTER]
+IDIOT = ROLE_INDEX[RoleType.IDIOT]
+
+# Winner codes
+ONGOING = 0
+GOOD = 1
+WEREWOLVES = 2
+WINNER_NAMES = {GOOD: "Good", WEREWOLVES: "Werewolves"}
+
+# Werewolf.calculate_kill_score weights on the role distribution
+KILL_WEIGHTS = np.zeros(NUM_ROLES)
+KILL_WEIGHTS[SEER] = 1000
+KILL_WEIGHTS[WITCH] = 800
+KILL_WEIGHTS[HUNTER] = 500
+KILL_WEIGHTS[IDIOT] = 500
+
+# Roles that run for Sheriff (Role.sheriff_candidacy_prob > 0.5)
+CANDIDATE_ROLES = (SEER, WITCH)
+
+
+class BatchedGame:
+    """
+    Vectorized engine that plays B games in lockstep.
+
+    Mirrors the strategies of the object engine (`WerewolfGame` + `roles/`)
+    phase by phase, but keeps every game as rows of arrays:
+
+        role[b, p]          role id of player p in game b
+        alive[b, p]         alive mask
+        know[b, i, j, r]    listener i's belief that player j has role r
+
+    Finished games are dropped from the active set at the end of each day.
+    """
+
+    def __init__(self, batch_size: int, seed: Optional[int] = None, config: Dict = GAME_CONFIG):
+        check_config(config)
+        counts = config["role_counts"]
+        for role_type in (RoleType.SEER, RoleType.WITCH, RoleType.HUNTER):
+            if counts.get(role_type, 0) > 1:
+                raise ValueError(f"Batched engine supports at most one {role_type.name}")
+        if config.get("beliefs", "independent") != "independent":
+            raise ValueError("Batched engine only models independent beliefs")
+
+        self.config = config
+        self.rng = np.random.default_rng(seed)
+        self.batch_size = batch_size
+        self.deck = np.array([ROLE_INDEX[r] for r, c in counts.items() for _ in range(c)], dtype=np.int8)
+        self.num_players = len(self.deck)
+        self.offdiag = ~np.eye(self.num_players, dtype=bool)
+
+        # Results for every game of the batch, indexed by original game position
+        P = self.num_players
+        self.winners = np.zeros(batch_size, dtype=np.int8)
+        self.win_causes = np.zeros(batch_size, dtype=np.int8)
+        self.days = np.zeros(batch_size, dtype=np.int16)
+        # Player ids (seat + 1) in order of death / of holding the badge, 0-padded
+        self.death_order = np.zeros((batch_size, P), dtype=np.int16)
+        self.num_deaths = np.zeros(batch_size, dtype=np.int16)
+        self.sheriff_history = np.zeros((batch_size, P), dtype=np.int16)
+        self.num_sheriffs = np.zeros(batch_size, dtype=np.int16)
+        # Player id saved by the antidote / poisoned by the Witch, 0 = never
+        self.witch_saved = np.zeros(batch_size, dtype=np.int16)
+        self.witch_poisoned = np.zeros(batch_size, dtype=np.int16)
+
+        self._deal()
+
+    # --- Setup ---
+
+    def _deal(self):
+        B, P = self.batch_size, self.num_players
+        order = self.rng.random((B, P)).argsort(axis=1)
+        self.role = self.deck[order]
+        self.ids = np.arange(B)
+        self.day_count = 0
+
+        self.alive = np.ones((B, P), dtype=bool)
+        self.saved = np.zeros((B, P), dtype=bool)
+        self.poisoned = np.zeros((B, P), dtype=bool)
+        self.gold = np.zeros((B, P), dtype=bool)
+        self.checked = np.zeros((B, P), dtype=bool)
+        self.idiot_revealed = np.zeros((B, P), dtype=bool)
+        self.hunter_revealed = np.zeros(B, dtype=bool)
+        self.has_antidote = np.ones(B, dtype=bool)
+        self.has_poison = np.ones(B, dtype=bool)
+        self.sheriff = np.full(B, -1)
+        self.badge_flow = np.full(B, -1)
+
+        self.seer = self._seat_of(SEER)
+        self.witch = self._seat_of(WITCH)
+        self.hunter = self._seat_of(HUNTER)
+
+        self.know = self._initial_knowledge()
+
+    def _seat_of(self, role_id: int) -> np.ndarray:
+        is_role = self.role == role_id
+        return np.where(is_role.any(axis=1), is_role.argmax(axis=1), -1)
+
+    def _initial_knowledge(self) -> np.ndarray:
+        # Same shared priors as KnowledgeMatrix.from_deal: good players see
+        # the full deck minus their own card, wolves see the non-wolf deck
+        # and know their teammates.
+        priors = prior_table(self.config)
+        know = np.broadcast_to(priors[self.role][:, :, None, :], (*self.role.shape, self.num_players, NUM_ROLES)).copy()
+        wolf = self.role == WOLF
+        teammates = wolf[:, :, None] & wolf[:, None, :]
+        know[teammates] = np.eye(NUM_ROLES)[WOLF]
+        know[:, ~self.offdiag] = 0.0
+        return know
+
+    # --- Primitives ---
+
+    def _ties(self, score: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        """
+        Mask of valid entries achieving the maximum score along the last axis.
+        """
+        s = np.where(valid, score, -np.inf)
+        return valid & (s == s.max(axis=-1, keepdims=True))
+
+    def _pick(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Uniform choice among True entries of the last axis (random.choice), -1 if none.
+        """
+        r = np.where(mask, self.rng.random(mask.shape), -1.0)
+        idx = r.argmax(axis=-1)
+        return np.where(mask.any(axis=-1), idx, -1)
+
+    def _onehot(self, seat: np.ndarray, games: np.ndarray) -> np.ndarray:
+        mask = np.zeros(self.alive.shape, dtype=bool)
+        rows = np.flatnonzero(games & (seat >= 0))
+        mask[rows, seat[rows]] = True
+        return mask
+
+    def _seats(self, games: np.ndarray, seat: np.ndarray):
+        """
+        (game, seat) index pairs for the games in the mask that have a seat.
+        """
+        b = np.flatnonzero(games & (seat >= 0))
+        return b, seat[b]
+
+    def _mark_certain(self, b: np.ndarray, j: np.ndarray, role_id: int):
+        """
+        Player.mark_role_certain for every listener, on targets (b, j).
+        """
+        self.know[b, :, j] = np.eye(NUM_ROLES)[role_id]
+        self.know[b, j, j] = 0.0
+
+    def _rule_out(self, b: np.ndarray, j: np.ndarray, role_id: int):
+        """
+        Player.rule_out_role for every listener, on targets (b, j).
+        """
+        if not len(b):
+            return
+        rows = self.know[b, :, j]
+        p = rows[..., role_id]
+        partial = (p > 0) & (p < 0.999)
+        p[...] = 0.0
+        rows[partial] /= rows[partial].sum(axis=-1, keepdims=True)
+        self.know[b, :, j] = rows
+
+    def _badge_flow_target(self) -> np.ndarray:
+        """
+        WerewolfGame.get_badge_flow_target: only while the Seer is alive and Sheriff.
+        """
+        active = (self.seer >= 0) & (self.sheriff == self.seer) & self._alive_at(self.seer)
+        return np.where(active, self.badge_flow, -1)
+
+    def _alive_at(self, seat: np.ndarray) -> np.ndarray:
+        safe = np.maximum(seat, 0)
+        return (seat >= 0) & self.alive[np.arange(len(seat)), safe]
+
+    def _wolf_prob(self, listener: np.ndarray) -> np.ndarray:
+        return self.know[np.arange(len(listener)), np.maximum(listener, 0), :, WOLF]
+
+    # --- Night ---
+
+    def _die(self, b: np.ndarray, seats: np.ndarray):
+        """
+        Player.die for one player in each of games b, recording the death order.
+        """
+        self.alive[b, seats] = False
+        g = self.ids[b]
+        self.death_order[g, self.num_deaths[g]] = seats + 1
+        self.num_deaths[g] += 1
+
+    def _record_sheriff(self, b: np.ndarray, seats: np.ndarray):
+        g = self.ids[b]
+        self.sheriff_history[g, self.num_sheriffs[g]] = seats + 1
+        self.num_sheriffs[g] += 1
+
+    def run_night(self, live: np.ndarray):
+        self.day_count += 1
+        B, P = self.alive.shape
+        games = np.arange(B)
+
+        # 1. Werewolves: each wolf picks its best kill score, then majority vote
+        wb, wi = np.nonzero(self.alive & (self.role == WOLF) & live[:, None])
+        prey = self.alive & (self.role != WOLF)
+        sheriff_bonus = self._onehot(self.sheriff, live) * 100.0
+        bonus = self.saved * 200.0 + self.gold * 300.0 + sheriff_bonus
+        scores = self.know[wb, wi] @ KILL_WEIGHTS + bonus[wb]
+        choice = self._pick(self._ties(scores, prey[wb]))
+        votes = np.bincount(wb * P + choice, minlength=B * P).reshape(B, P)
+        kill = self._pick(self._ties(votes, votes > 0))
+
+        # 2. Seer checks the badge flow target first, else the most suspicious unchecked player
+        seer_acts = live & self._alive_at(self.seer)
+        bf = self.badge_flow
+        bf_ok = seer_acts & (bf >= 0)
+        bf_ok[bf_ok] = self.alive[games[bf_ok], bf[bf_ok]] & ~self.checked[games[bf_ok], bf[bf_ok]]
+        candidates = self.alive & (self.role != SEER) & ~self.checked
+        fallback = self._pick(self._ties(self._wolf_prob(self.seer), candidates))
+        check = np.where(bf_ok, bf, fallback)
+        check = np.where(seer_acts, check, -1)
+        g = np.flatnonzero(check >= 0)
+        t = check[g]
+        self.checked[g, t] = True
+        fate = np.where(self.role[g, t] == WOLF, WOLF, VILLAGER)
+        self.know[g, self.seer[g], t] = np.eye(NUM_ROLES)[fate]
+
+        # 3. Witch saves the night kill if she still can, otherwise poisons
+        deaths_kill = kill.copy()
+        deaths_poison = np.full(B, -1)
+        witch_acts = live & self._alive_at(self.witch)
+        save = witch_acts & (kill >= 0) & self.has_antidote
+        self.has_antidote[save] = False
+        self.saved[games[save], kill[save]] = True
+        self.witch_saved[self.ids[save]] = kill[save] + 1
+        deaths_kill[save] = -1
+
+        may_poison = witch_acts & ~save & self.has_poison
+        targets = self.alive & ~self._onehot(self.witch, live) & ~self._onehot(self._badge_flow_target(), live)
+        wp = self._wolf_prob(self.witch)
+        valid = targets & (wp > 0)
+        top = self._ties(wp, valid)
+        best = np.where(valid, wp, 0.0).max(axis=1)
+        poison = np.where(may_poison & (best > 0.25), self._pick(top), -1)
+        poisoned = poison >= 0
+        self.has_poison[poisoned] = False
+        self.poisoned[games[poisoned], poison[poisoned]] = True
+        self.witch_poisoned[self.ids[poisoned]] = poison[poisoned] + 1
+        deaths_poison[poisoned] = poison[poisoned]
+        # A poisoned night kill is a single death
+        deaths_kill[deaths_kill == deaths_poison] = -1
+
+        return deaths_kill, deaths_poison
+
+    # --- Day ---
+
+    def run_day(self, live: np.ndarray, deaths_kill: np.ndarray, deaths_poison: np.ndarray):
+        # 1. Sheriff Election (Day 1 only if enabled)
+        if self.day_count == 1 and self.config.get("sheriff_enabled", False):
+            self.run_sheriff_election(live)
+
+        # 2. Announce Deaths
+        order = [deaths_kill, deaths_poison]
+        for dead in order:
+            d = np.flatnonzero(dead >= 0)
+            self._die(d, dead[d])
+        for dead in order:
+            self._resolve_death(dead, live)
+
+        # 3. Discussion
+        self.share_information(live, self.alive)
+
+        # 4. Voting (an execution resolves its deaths and win check itself)
+        self.run_voting_phase(live)
+
+    def run_sheriff_election(self, live: np.ndarray):
+        candidates = np.zeros(self.alive.shape, dtype=bool)
+        for role_id in CANDIDATE_ROLES:
+            candidates |= self.role == role_id
+        candidates &= self.alive & live[:, None]
+
+        # Candidates share information in seat order
+        self.share_information(live, candidates)
+
+        seers = candidates & (self.role == SEER)
+        pool = np.where(seers.any(axis=1)[:, None], seers, candidates)
+        elected = self._pick(pool)
+        self.sheriff = np.where(live & (elected >= 0), elected, self.sheriff)
+        e = np.flatnonzero(live & (elected >= 0))
+        self._record_sheriff(e, elected[e])
+
+    def share_information(self, live: np.ndarray, speakers: np.ndarray):
+        """
+        Seer, Witch and Hunter share_information for the speaking players.
+        Only the order of the Seer's claims relative to the Witch's and (under
+        "day1", where the Hunter's claim can come before the badge flow pick)
+        the Hunter's affects the outcome, so speakers go in seat order
+        relative to the Seer.
+        """
+        seer_speaks = live & self._speaks(self.seer, speakers)
+        witch_speaks = live & self._speaks(self.witch, speakers)
+        hunter_speaks = live & self._speaks(self.hunter, speakers)
+        seer_first = self.seer < self.witch
+        # Otherwise the Hunter only reveals once the Seer is dead, which no claim changes
+        hunter_first = (self.hunter < self.seer) & (self.config.get("hunter_reveal", "seer_dead") == "day1")
+
+        self._hunter_share(hunter_speaks & hunter_first)
+        self._seer_share(seer_speaks & seer_first)
+        self._witch_share(witch_speaks)
+        self._seer_share(seer_speaks & ~seer_first)
+        self._hunter_share(hunter_speaks & ~hunter_first)
+
+    def _speaks(self, seat: np.ndarray, speakers: np.ndarray) -> np.ndarray:
+        safe = np.maximum(seat, 0)
+        return (seat >= 0) & speakers[np.arange(len(seat)), safe]
+
+    def _seer_share(self, games: np.ndarray):
+        if not games.any():
+            return
+        B, P = self.alive.shape
+        rows = self.know[np.arange(B), np.maximum(self.seer, 0)]
+        certain = rows.max(axis=-1) >= 0.99
+        known = rows.argmax(axis=-1)
+
+        # 1. Share results of previous checks
+        self._mark_certain(*np.nonzero(games[:, None] & certain & (known == WOLF)), WOLF)
+        gold = games[:, None] & certain & (known == VILLAGER)
+        self._rule_out(*np.nonzero(gold), WOLF)
+        self.gold |= gold
+
+        # 2. Badge Flow Announcement (Designating FUTURE target)
+        is_sheriff = games & (self.sheriff == self.seer)
+        candidates = self.alive & ~self.checked & ~self._onehot(self.seer, is_sheriff)
+        target = self._pick(self._ties(self._wolf_prob(self.seer), candidates))
+        update = is_sheriff & (target >= 0)
+        self.badge_flow = np.where(update, target, self.badge_flow)
+
+        # 3. Reveal self as Seer
+        self._mark_certain(*self._seats(games, self.seer), SEER)
+
+    def _witch_share(self, games: np.ndarray):
+        if not games.any():
+            return
+        # Everyone rules out Wolf for Silver Water, then the Witch reveals
+        self._rule_out(*np.nonzero(self.saved & games[:, None]), WOLF)
+        self._mark_certain(*self._seats(games, self.witch), WITCH)
+
+    def _hunter_share(self, games: np.ndarray):
+        rule = self.config.get("hunter_reveal", "seer_dead")
+        games = games & ~self.hunter_revealed
+        if rule == "never" or not games.any():
+            return
+        if rule == "day1":
+            reveal = games
+        else:
+            # Hunter reveals once a player it believes to be the Seer is dead
+            rows = self.know[np.arange(len(games)), np.maximum(self.hunter, 0), :, SEER]
+            seer_dead = ((rows > 0.99) & ~self.alive).any(axis=1)
+            reveal = games & seer_dead
+        self.hunter_revealed |= reveal
+        self._mark_certain(*self._seats(reveal, self.hunter), HUNTER)
+
+    def run_voting_phase(self, live: np.ndarray):
+        B, P = self.alive.shape
+        games = np.arange(B)
+        voters = self.alive & live[:, None]
+        good = self.alive & (self.role != WOLF)
+
+        # --- Identify "Leader" for Good Team Voting Coordination ---
+        seer_alive = live & self._alive_at(self.seer)
+        seer_cols = self.know[games, :, np.maximum(self.seer, 0), SEER]
+        knows_seer = (seer_cols >= 0.99) & good & ~self._onehot(self.seer, seer_alive)
+        seer_known = seer_alive & knows_seer.any(axis=1)
+        sheriff_alive = live & self._alive_at(self.sheriff)
+        leader = np.where(seer_known, self.seer, np.where(sheriff_alive, self.sheriff, -1))
+
+        # Leader's suggestion is its own draw, independent of its actual vote
+        lb, li = self._seats(live, leader)
+        suggestion = np.full(B, -1)
+        suggestion[lb] = self._own_vote(lb, li, live)
+
+        follow = (suggestion[:, None] >= 0) & (suggestion[:, None] != np.arange(P)) & (self.role != SEER)
+        vote = np.where(follow, suggestion[:, None], -1)
+        vb, vi = np.nonzero(voters & ~follow)
+        vote[vb, vi] = self._own_vote(vb, vi, live)
+
+        # Fallback if None: random other
+        vb, vi = np.nonzero(voters & (vote < 0))
+        if len(vb):
+            vote[vb, vi] = self._pick(self.alive[vb] & self.offdiag[vi])
+
+        vb, vi = np.nonzero(voters)
+        weight = np.where(vi == self.sheriff[vb], self.config.get("sheriff_vote_weight", 1.5), 1.0)
+        tally = np.bincount(vb * P + vote[vb, vi], weights=weight, minlength=B * P).reshape(B, P)
+        executed = self._pick(self._ties(tally, tally > 0))
+        executed = np.where(live, executed, -1)
+
+        # Idiot survives the first execution and flips its card
+        e = np.flatnonzero(executed >= 0)
+        idiot = np.zeros(B, dtype=bool)
+        idiot[e] = (self.role[e, executed[e]] == IDIOT) & ~self.idiot_revealed[e, executed[e]]
+        b, j = self._seats(idiot, executed)
+        self.idiot_revealed[b, j] = True
+        self._mark_certain(b, j, IDIOT)
+
+        dead = np.where(idiot, -1, executed)
+        d = np.flatnonzero(dead >= 0)
+        self._die(d, dead[d])
+        self._resolve_death(dead, live)
+
+    def _own_vote(self, b: np.ndarray, i: np.ndarray, live: np.ndarray) -> np.ndarray:
+        """
+        Role.vote / Seer.vote without a suggestion for voters (b, i): highest
+        wolf probability among the living. Good players other than the Seer
+        skip the badge flow target.
+        """
+        valid = self.alive[b].copy()
+        badge = self._badge_flow_target()[b]
+        skips = (badge >= 0) & (self.role[b, i] != WOLF) & (self.role[b, i] != SEER)
+        valid[np.flatnonzero(skips), badge[skips]] = False
+        return self._pick(self._ties(self.know[b, i, :, WOLF], valid))
+
+    # --- Deaths ---
+
+    def _resolve_death(self, dead: np.ndarray, live: np.ndarray):
+        """
+        WerewolfGame.resolve_deaths for dead[b] (if >= 0), already killed:
+        games the death decides are recorded and leave `live`, the others go
+        on to handle_sheriff_death followed by Role.on_death.
+        """
+        live &= ~self.check_win_condition(live & (dead >= 0))
+        dead = np.where(live, dead, -1)
+        self._transfer_badge(dead)
+
+        # Hunter shoots unless poisoned
+        games = np.arange(len(dead))
+        safe = np.maximum(dead, 0)
+        shoots = (dead >= 0) & (dead == self.hunter) & ~self.poisoned[games, safe]
+        if not shoots.any():
+            return
+        badge = self._onehot(self._badge_flow_target(), shoots)
+        targets = self.alive & ~badge & shoots[:, None]
+        shot = self._pick(self._ties(self._wolf_prob(self.hunter), targets))
+        s = np.flatnonzero(shot >= 0)
+        self._die(s, shot[s])
+        self._resolve_death(shot, live)
+
+    def _transfer_badge(self, dead: np.ndarray):
+        t = np.flatnonzero((dead >= 0) & (self.sheriff == dead))
+        if not len(t):
+            return
+        d = dead[t]
+        dead_role = self.role[t, d]
+        alive = self.alive[t]
+        successor = np.full(len(t), -1)
+
+        # Seer Badge Flow: reveal the announced target to everyone
+        bf = self.badge_flow[t]
+        seer_flow = (dead_role == SEER) & (bf >= 0)
+        flow_good = seer_flow & (self.know[t, d, np.maximum(bf, 0), WOLF] < 0.01)
+        flow_wolf = seer_flow & ~flow_good
+        self._rule_out(t[flow_good], bf[flow_good], WOLF)
+        self._mark_certain(t[flow_wolf], bf[flow_wolf], WOLF)
+        keep = flow_good & alive[np.arange(len(t)), np.maximum(bf, 0)]
+        successor[keep] = bf[keep]
+
+        # Role-specific preferred successors
+        rows = self.know[t, d]
+        known_good = (rows[..., WOLF] < 0.01) & (np.delete(rows, WOLF, axis=-1) > 0.9).any(axis=-1)
+        preferred = (dead_role == SEER)[:, None] & known_good
+        preferred |= (dead_role == WOLF)[:, None] & (self.role[t] == WOLF)
+        preferred |= (dead_role == WITCH)[:, None] & self.saved[t]
+        preferred &= alive
+        pool = np.where(preferred.any(axis=1)[:, None], preferred, alive)
+
+        successor = np.where(successor >= 0, successor, self._pick(pool))
+        self.sheriff[t] = successor
+        k = successor >= 0
+        self._record_sheriff(t[k], successor[k])
+
+    # --- Win condition ---
+
+    def check_win_condition(self, live: np.ndarray) -> np.ndarray:
+        alive_roles = np.where(self.alive, self.role, -1)
+        wolves = (alive_roles == WOLF).any(axis=1)
+        villagers = (alive_roles == VILLAGER).any(axis=1)
+        gods = (self.alive & (self.role != WOLF) & (self.role != VILLAGER)).any(axis=1)
+
+        winner = np.where(~wolves, GOOD, np.where(~villagers | ~gods, WEREWOLVES, ONGOING))
+        cause = np.where(~wolves, WinCause.ALL_WOLVES_DEAD,
+                         np.where(~villagers, WinCause.ALL_VILLAGERS_DEAD, WinCause.ALL_GODS_DEAD))
+        done = live & (winner != ONGOING)
+        self.winners[self.ids[done]] = winner[done]
+        self.win_causes[self.ids[done]] = cause[done]
+        self.days[self.ids[done]] = self.day_count
+        return done
+
+    # --- Main loop ---
+
+    def _compact(self, keep: np.ndarray):
+        for name in ("role", "ids", "alive", "saved", "poisoned", "gold", "checked", "idiot_revealed",
+                     "hunter_revealed", "has_antidote", "has_poison", "sheriff", "badge_flow",
+                     "seer", "witch", "hunter", "know"):
+            setattr(self, name, getattr(self, name)[keep])
+
+    def run(self) -> np.ndarray:
+        """
+        Play every game of the batch to the end. Returns winner codes per game.
+        """
+        while len(self.ids):
+            live = np.ones(len(self.ids), dtype=bool)
+            deaths_kill, deaths_poison = self.run_night(live)
+            self.run_day(live, deaths_kill, deaths_poison)
+            self._compact(self.winners[self.ids] == ONGOING)
+        return self.winners
+
+    def results(self) -> Dict[str, int]:
+        counts = np.bincount(self.winners, minlength=len(WINNER_NAMES) + 1)
+        return {name: int(counts[code]) for code, name in WINNER_NAMES.items() if counts[code]}
+
+
+def run_batch(batch_size: int, seed: Optional[int] = None, config: Dict = GAME_CONFIG) -> Dict[str, int]:
+    game = BatchedGame(batch_size, seed=seed, config=config)
+    game.run()
+    return game.results()
@@ -0,0 +1,381 @@
+import functools
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from config import RoleType
+from knowledge import KnowledgeMatrix, ROLE_INDEX, NUM_ROLES
+
+# Exact beliefs. A fact ("target is a Seer", "target is not a wolf") narrows
+# what a target's card can be to a set of roles, kept as a bitmask (bit r =
+# role index r still possible). A listener's posterior is uniform over the
+# deals consistent with every fact they know, so P(target has r) is the
+# share of those deals giving the target an r-card.
+#
+# Players only differ by their mask, so deals are counted per group of
+# players sharing a mask (role_marginals) instead of per permutation: the
+# deck is handed out one role at a time, k of a group's remaining players
+# taking k of the role's cards in C(remaining, k) ways, and the state is
+# just the players each group still has to seat. Every player of a group
+# gets the same row.
+
+ALL_ROLES = (1 << NUM_ROLES) - 1
+_WOLF = ROLE_INDEX[RoleType.WEREWOLF]
+_WOLF_MASK = 1 << _WOLF
+_VILLAGER = ROLE_INDEX[RoleType.VILLAGER]
+_ONEHOT = np.eye(NUM_ROLES)
+# Role indices allowed by each mask
+_MASK_ROLES = tuple(tuple(r for r in range(NUM_ROLES) if mask >> r & 1) for mask in range(ALL_ROLES + 1))
+# Canonical group order (role_marginals' cache key): most constrained first
+_GROUP_ORDER = tuple(len(roles) * (ALL_ROLES + 1) + mask for mask, roles in enumerate(_MASK_ROLES))
+
+
+def deck_counts(config: Dict) -> Tuple[int, ...]:
+    """
+    Cards per role index in the config's deck.
+    """
+    counts = [0] * NUM_ROLES
+    for r, c in config["role_counts"].items():
+        counts[ROLE_INDEX[r]] += c
+    return tuple(counts)
+
+
+def _splits(cards: int, caps: Tuple[int, ...], takers: Sequence[int], closing: Sequence[bool]):
+    """
+    Ways to hand `cards` alike cards to the groups `takers`, at most caps[g]
+    each and exactly caps[g] for the groups `closing` (this is the last role
+    they can take): (caps after, cards per taker, number of ways).
+    """
+    def place(i: int, left: int, caps: Tuple[int, ...], taken: Tuple[int, ...], ways: int):
+        if i == len(takers):
+            if left == 0:
+                yield caps, taken, ways
+            return
+        g = takers[i]
+        room = caps[g]
+        options = (room,) if closing[i] else range(min(room, left) + 1)
+        for k in options:
+            if k <= left:
+                yield from place(i + 1, left - k, caps[:g] + (room - k,) + caps[g + 1:], taken + (k,),
+                                 ways * math.comb(room, k))
+    return place(0, cards, caps, (), 1)
+
+
+@functools.lru_cache(maxsize=1 << 12)
+def role_marginals(pool: Tuple[int, ...], groups: Tuple[Tuple[int, int], ...]) -> np.ndarray:
+    """
+    Posterior role distribution of a player, by their mask: row `mask` of a
+    (masks x roles) table, for the deck `pool` (cards per role index) dealt
+    to `groups` of (mask, players), sorted as group_masks sorts them. Rows
+    of masks not in `groups` are zero. Cached and read-only.
+
+    One forward pass counts the partial deals reaching each state, one
+    backward pass the ways to finish from it; together they give the
+    expected cards of each role per group, which shared by the group's
+    players are the marginals.
+
+    Claims can be false (a dead Seer names an unchecked badge flow target
+    as a wolf), and facts no deal satisfies fall back to each row on its
+    own: the cards nobody is known to hold (or the whole deck), restricted
+    to the mask.
+    """
+    table = np.zeros((ALL_ROLES + 1, NUM_ROLES))
+    # Scarce roles first keeps the states few; each group closes on its last role
+    order = sorted((r for r in range(NUM_ROLES) if pool[r]), key=lambda r: pool[r])
+    last = {g: max((i for i, r in enumerate(order) if mask >> r & 1), default=-1)
+            for g, (mask, _) in enumerate(groups)}
+    steps = []
+    states = {tuple(n for _, n in groups): 1}
+    for i, r in enumerate(order):
+        takers = [g for g, (mask, _) in enumerate(groups) if mask >> r & 1]
+        closing = [last[g] == i for g in takers]
+        moves = {caps: list(_splits(pool[r], caps, takers, closing)) for caps in states}
+        steps.append((r, takers, states, moves))
+        reached: Dict[Tuple[int, ...], int] = {}
+        for caps, ways in states.items():
+            for after, _, w in moves[caps]:
+                reached[after] = reached.get(after, 0) + ways * w
+        states = reached
+    done = (0,) * len(groups)
+    total = states.get(done, 0)
+    if not total:
+        for mask, _ in groups:
+            table[mask] = _fallback_row(pool, groups, mask)
+        table.flags.writeable = False
+        return table
+
+    finish = {done: 1}
+    for r, takers, before, moves in reversed(steps):
+        expected = [0] * len(takers)
+        back: Dict[Tuple[int, ...], int] = {}
+        for caps, ways in before.items():
+            from_here = 0
+            for after, taken, w in moves[caps]:
+                rest = finish.get(after)
+                if rest:
+                    from_here += w * rest
+                    for j, k in enumerate(taken):
+                        expected[j] += ways * w * rest * k
+            if from_here:
+                back[caps] = from_here
+        for j, g in enumerate(takers):
+            mask, n = groups[g]
+            table[mask, r] = expected[j] / (total * n)
+        finish = back
+    table.flags.writeable = False
+    return table
+
+
+def _fallback_row(pool: Tuple[int, ...], groups: Tuple[Tuple[int, int], ...], mask: int) -> np.ndarray:
+    allowed = list(_MASK_ROLES[mask])
+    row = np.zeros(NUM_ROLES)
+    if len(allowed) == 1:
+        row[allowed] = 1.0
+        return row
+    unclaimed = list(pool)
+    for m, n in groups:
+        if len(_MASK_ROLES[m]) == 1:
+            r = _MASK_ROLES[m][0]
+            unclaimed[r] = max(unclaimed[r] - n, 0)
+    for counts in (unclaimed, pool):
+        row[allowed] = [counts[r] for r in allowed]
+        if row.sum() > 0:
+            return row / row.sum()
+    return row
+
+
+def group_masks(masks: Iterable[int]) -> Tuple[Tuple[int, int], ...]:
+    """
+    role_marginals groups of a sequence of masks (one per player).
+    """
+    return tuple(sorted(Counter(masks).items(), key=lambda g: _GROUP_ORDER[g[0]]))
+
+
+@functools.lru_cache(maxsize=1 << 12)
+def _moved(groups: Tuple[Tuple[int, int], ...], mask: int, to: int) -> Tuple[Tuple[int, int], ...]:
+    """
+    `groups` with one player's mask changed from `mask` to `to`.
+    """
+    counts = dict(groups)
+    counts[mask] -= 1
+    counts[to] = counts.get(to, 0) + 1
+    return tuple(sorted(((m, n) for m, n in counts.items() if n), key=lambda g: _GROUP_ORDER[g[0]]))
+
+
+class ExactKnowledgeMatrix(KnowledgeMatrix):
+    """
+    KnowledgeMatrix with exact posteriors (config "beliefs": "exact").
+
+    The facts are kept as role masks: masks[t] for what everyone knows
+    about seat t, secrets[listener][t] for what only that listener knows
+    (the Seer's checks). Every write re-derives the affected beliefs from
+    the masks with role_marginals, so ruling a target out raises suspicion
+    on everyone still unknown, and marking the last wolf clears the rest.
+
+    The beliefs are stored exactly where KnowledgeMatrix keeps them, so
+    views and roles read them unchanged, but a public layer is now the
+    beliefs of the listeners sharing an own role and own public mask (all
+    wolves share one): `roles` maps a listener seat to their layer, and
+    listeners with secrets hold private rows about every target. A fact
+    about one target can move the beliefs about all of them, so writes
+    touch every seat.
+    """
+
+    def __init__(self, roles: Sequence[int], pool: Tuple[int, ...]):
+        # Up to one public layer per seat, all filled in by _refresh
+        super().__init__(roles, np.zeros((len(roles), NUM_ROLES)))
+        self.pool = pool
+        # Listener seat -> own role index; `roles` is their public layer here
+        self.deal = tuple(int(r) for r in roles)
+        self.roles = np.zeros(self.num_players, dtype=int)
+        self.masks = [ALL_ROLES] * self.num_players
+        self.secrets: Dict[int, Dict[int, int]] = {}
+        # Listener seat -> {target seat: role index they take the target for}, overriding their row
+        self.labels: Dict[int, Dict[int, int]] = {}
+        self._wolves = [seat for seat, r in enumerate(self.deal) if r == _WOLF]
+        self._refresh()
+
+    @classmethod
+    def from_deal(cls, roles: Sequence[int], config: Dict) -> 'ExactKnowledgeMatrix':
+        return cls(roles, deck_counts(config))
+
+    def redeal(self, roles: Sequence[int], config: Dict):
+        self.pool = deck_counts(config)
+        self.deal = tuple(int(r) for r in roles)
+        self._wolves = [seat for seat, r in enumerate(self.deal) if r == _WOLF]
+        self.private.clear()
+        self._holders.clear()
+        self.versions[:] = [0] * self.num_players
+        self.journal.clear()
+        self._announced.clear()
+        self.masks[:] = [ALL_ROLES] * self.num_players
+        self.secrets.clear()
+        self.labels.clear()
+        self._refresh()
+
+    def copy(self) -> 'ExactKnowledgeMatrix':
+        matrix = super().copy()
+        matrix.pool = self.pool
+        matrix.deal = self.deal
+        matrix._wolves = self._wolves
+        matrix.masks = self.masks.copy()
+        matrix.secrets = {seat: facts.copy() for seat, facts in self.secrets.items()}
+        matrix.labels = {seat: labels.copy() for seat, labels in self.labels.items()}
+        return matrix
+
+    # --- Deriving beliefs from the masks ---
+
+    def _refresh(self, listeners: Optional[Iterable[int]] = None):
+        """
+        Recompute the public layers and every private listener's rows, or
+        only the private rows of `listeners`.
+        """
+        if listeners is None:
+            self._refresh_layers()
+            listeners = self.secrets
+        for seat in listeners:
+            self._refresh_listener(seat)
+        self._touch(range(self.num_players))
+
+    def _refresh_layers(self):
+        masks = self.masks
+        public_masks = np.array(masks)
+        public_groups = group_masks(masks)
+        layers: Dict[int, int] = {}
+        roles = []
+        for seat, c in enumerate(self.deal):
+            if seat in self.secrets:
+                # Reads its private rows only
+                roles.append(0)
+                continue
+            # Wolves all know the same (each other), good players their own card
+            key = -1 if c == _WOLF else c * (ALL_ROLES + 1) + masks[seat]
+            layer = layers.get(key)
+            if layer is None:
+                layer = layers[key] = len(layers)
+                if c == _WOLF:
+                    known = public_masks.copy()
+                    known[self._wolves] = _WOLF_MASK
+                    groups = group_masks(known.tolist())
+                else:
+                    # Rows by public mask: every listener of the layer reads the
+                    # others' (its own row, the one it knows, is never read)
+                    known = public_masks
+                    groups = _moved(public_groups, masks[seat], 1 << c)
+                role_marginals(self.pool, groups).take(known, axis=0, out=self.public[layer])
+            roles.append(layer)
+        if roles != self.roles.tolist():
+            # A new array: copies (snapshots) share `roles` with this matrix
+            self.roles = np.array(roles)
+
+    def _refresh_listener(self, seat: int):
+        known = list(self.masks)
+        for t, mask in self.secrets[seat].items():
+            known[t] &= mask
+        c = self.deal[seat]
+        if c == _WOLF:
+            for w in self._wolves:
+                known[w] = _WOLF_MASK
+        else:
+            known[seat] = 1 << c
+        rows = role_marginals(self.pool, group_masks(known))[known]
+        for t, r in self.labels.get(seat, {}).items():
+            rows[t] = _ONEHOT[r]
+        self.private[seat] = {t: rows[t] for t in range(self.num_players) if t != seat}
+
+    def _set_secret(self, seat: int, t: int, mask: int, label: Optional[int] = None):
+        facts = self.secrets.get(seat, {})
+        old = facts.get(t, ALL_ROLES)
+        labels = self.labels.get(seat, {})
+        if seat == t or ((self.masks[t] & mask) == (self.masks[t] & old) and labels.get(t) == label):
+            # Adds nothing to what the listener already knows
+            return
+        new_listener = seat not in self.secrets
+        facts[t] = mask
+        self.secrets[seat] = facts
+        if label is not None:
+            labels[t] = label
+            self.labels[seat] = labels
+        else:
+            labels.pop(t, None)
+        if new_listener:
+            self._holders_changed()
+            # Its old layer may be gone
+            self._refresh_layers()
+        self._refresh((seat,))
+
+    def _holders_changed(self):
+        self._holders = {t: {s for s in self.secrets if s != t} for t in range(self.num_players)}
+        self._holders = {t: h for t, h in self._holders.items() if h}
+
+    # --- Single listener updates (secrets) ---
+
+    def _drop_listener(self, seat: int):
+        del self.secrets[seat]
+        self.labels.pop(seat, None)
+        del self.private[seat]
+        self._holders_changed()
+
+    def reset_listener(self, listener_id: int):
+        seat = listener_id - 1
+        if seat in self.secrets:
+            self._drop_listener(seat)
+            self._refresh()
+
+    def mark_certain(self, listener_id: int, target_id: int, role: RoleType):
+        self._set_secret(listener_id - 1, target_id - 1, 1 << ROLE_INDEX[role])
+
+    def rule_out(self, listener_id: int, target_id: int, role: RoleType):
+        seat, t = listener_id - 1, target_id - 1
+        mask = self.secrets.get(seat, {}).get(t, ALL_ROLES)
+        self._set_secret(seat, t, mask & ~(1 << ROLE_INDEX[role]))
+
+    def record_check(self, listener_id: int, target_id: int, is_wolf: bool):
+        """
+        Only what the check shows (wolf or not) is counted; the Seer still
+        reads a good target as a villager, so gold water claims are made as
+        with independent beliefs.
+        """
+        mask = _WOLF_MASK if is_wolf else ALL_ROLES & ~_WOLF_MASK
+        self._set_secret(listener_id - 1, target_id - 1, mask, None if is_wolf else _VILLAGER)
+
+    # --- Public announcements ---
+
+    def mark_certain_all(self, target_ids: Iterable[int], role: RoleType):
+        bit = 1 << ROLE_INDEX[role]
+        changed = False
+        for t in target_ids:
+            t -= 1
+            if self.masks[t] != bit:
+                self.masks[t] = bit
+                changed = True
+            # Secrets about the target now say the same as the public fact (or are overruled)
+            for seat, facts in list(self.secrets.items()):
+                self.labels.get(seat, {}).pop(t, None)
+                if facts.pop(t, None) is not None:
+                    changed = True
+                    if not facts:
+                        self._drop_listener(seat)
+        if changed:
+            self._refresh()
+
+    def rule_out_all(self, target_ids: Iterable[int], role: RoleType):
+        bit = 1 << ROLE_INDEX[role]
+        changed = False
+        for t in target_ids:
+            if self.masks[t - 1] & bit:
+                self.masks[t - 1] &= ~bit
+                changed = True
+        if changed:
+            self._refresh()
+
+
+# config["beliefs"] -> knowledge matrix class
+BELIEF_ENGINES = {
+    "independent": KnowledgeMatrix,
+    "exact": ExactKnowledgeMatrix,
+}
+
+
+def knowledge_class(config: Dict) -> type:
+    return BELIEF_ENGINES[config.get("beliefs", "independent")]
@@ -0,0 +1,396 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+from config import GAME_CONFIG, RoleType, scaled_role_counts
+from game import WerewolfGame
+from knowledge import ROLE_INDEX
+from player import Player
+from roles import ROLE_CLASSES
+from rng import GameRNG
+from runner import iter_games, run_chunk, run_simulation
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_HISTORY = os.path.join(SRC_DIR, os.pardir, "bench_history.jsonl")
+BENCH_SEED = 20240601
+# Flag a benchmark as slower once it takes this much longer than the baseline
+DEFAULT_THRESHOLD = 0.10
+# Table sizes for `bench.py scaling`
+DEFAULT_SEATS = (12, 24, 50, 120)
+
+
+def _best_per_call(run: Callable[[], int], repeat: int) -> float:
+    """
+    Best-of-`repeat` time per call in microseconds. `run` does the work and
+    returns how many calls it made.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        calls = run()
+        best = min(best, (time.perf_counter() - t0) / calls)
+    return best * 1e6
+
+
+def _new_games(n: int, offset: int = 0) -> List[WerewolfGame]:
+    return [WerewolfGame(rng=GameRNG.for_game(BENCH_SEED, offset + i)) for i in range(n)]
+
+
+def _after_first_day(n: int) -> List[WerewolfGame]:
+    """
+    n unfinished games at the end of day 1, with the Seer still alive.
+    """
+    games = []
+    i = 0
+    while len(games) < n:
+        game = WerewolfGame(rng=GameRNG.for_game(BENCH_SEED, 100000 + i))
+        i += 1
+        game.run_day(game.run_night())
+        seer = game.get_players_by_role(RoleType.SEER)
+        if not game.winner and seer and seer[0].is_alive:
+            games.append(game)
+    return games
+
+
+def bench_games(engine: str, games: int, repeat: int, config: Dict = GAME_CONFIG) -> float:
+    return _best_per_call(lambda: (run_chunk(BENCH_SEED, 0, games, engine, config=config), games)[1], repeat)
+
+
+def bench_new_game(states: int, repeat: int) -> float:
+    return _best_per_call(lambda: len(_new_games(states)), repeat)
+
+
+def bench_redeal_knowledge(states: int, repeat: int) -> float:
+    """
+    KnowledgeMatrix.redeal, the belief reset WerewolfGame.reset does for every new deal.
+    """
+    games = _new_games(states)
+    deals = [[ROLE_INDEX[p.role.role_type] for p in g.players] for g in games]
+
+    def run():
+        for g, roles in zip(games, deals):
+            g.knowledge.redeal(roles, g.config)
+        return len(games)
+    return _best_per_call(run, repeat)
+
+
+def bench_rule_out_role(states: int, repeat: int) -> float:
+    games = _new_games(states)
+    priors = [g.knowledge.copy() for g in games]
+
+    def run():
+        calls = 0
+        for g, prior in zip(games, priors):
+            knowledge = prior.copy()
+            for p in g.players:
+                p.attach_knowledge(knowledge)
+            for p in g.players:
+                for t in g.players:
+                    if t is not p:
+                        p.rule_out_role(t.id, RoleType.WEREWOLF)
+                        calls += 1
+        return calls
+    return _best_per_call(run, repeat)
+
+
+def bench_belief_updates(model: str, states: int, repeat: int) -> float:
+    """
+    Knowledge updates of a typical first day (the Seer checks a wolf and a
+    villager, claims, names the wolf, gives gold water) on freshly dealt
+    games with `model` beliefs.
+    """
+    config = {**GAME_CONFIG, "beliefs": model}
+    games = [WerewolfGame(rng=GameRNG.for_game(BENCH_SEED, i), config=config) for i in range(states)]
+    deals = [g.knowledge.copy() for g in games]
+
+    def run():
+        calls = 0
+        for g, deal in zip(games, deals):
+            knowledge = deal.copy()
+            seer = g.get_players_by_role(RoleType.SEER)[0].id
+            wolf = g.get_players_by_role(RoleType.WEREWOLF)[0].id
+            villager = g.get_players_by_role(RoleType.VILLAGER)[0].id
+            knowledge.record_check(seer, wolf, True)
+            knowledge.record_check(seer, villager, False)
+            knowledge.mark_certain_all([seer], RoleType.SEER)
+            knowledge.mark_certain_all([wolf], RoleType.WEREWOLF)
+            knowledge.rule_out_all([villager], RoleType.WEREWOLF)
+            calls += 5
+        return calls
+    return _best_per_call(run, repeat)
+
+
+def _bench_on_forks(states: List[WerewolfGame], method: Callable[[WerewolfGame], None], repeat: int) -> float:
+    snapshots = [g.snapshot() for g in states]
+    best = float("inf")
+    for _ in range(repeat):
+        forks = [WerewolfGame(s, GameRNG.for_game(BENCH_SEED, i)) for i, s in enumerate(snapshots)]
+        t0 = time.perf_counter()
+        for g in forks:
+            method(g)
+        best = min(best, (time.perf_counter() - t0) / len(forks))
+    return best * 1e6
+
+
+def _seer_share(game: WerewolfGame):
+    seer = game.get_players_by_role(RoleType.SEER)[0]
+    seer.role.share_information(seer, game.players)
+
+
+# name -> runner(size, repeat). All results are microseconds per call (per game for game.*).
+BENCHMARKS: Dict[str, Callable[[int, int], float]] = {
+    "game.object": lambda size, repeat: bench_games("object", size, repeat),
+    "game.batch": lambda size, repeat: bench_games("batch", size * 8, repeat),
+    "game.exact": lambda size, repeat: bench_games("object", size, repeat, {**GAME_CONFIG, "beliefs": "exact"}),
+    "new_game": bench_new_game,
+    "knowledge.redeal": bench_redeal_knowledge,
+    "rule_out_role": bench_rule_out_role,
+    "beliefs.independent": lambda size, repeat: bench_belief_updates("independent", size, repeat),
+    "beliefs.exact": lambda size, repeat: bench_belief_updates("exact", size, repeat),
+    "run_night": lambda size, repeat: _bench_on_forks(_new_games(size), WerewolfGame.run_night, repeat),
+    "run_voting_phase": lambda size, repeat: _bench_on_forks(_after_first_day(size), WerewolfGame.run_voting_phase, repeat),
+    "seer.share_information": lambda size, repeat: _bench_on_forks(_after_first_day(size), _seer_share, repeat),
+    "check_win_condition": lambda size, repeat: _bench_on_forks(_after_first_day(size), WerewolfGame.check_win_condition, repeat),
+}
+
+
+def bench_scaling(seats: int, games: int) -> Tuple[float, float]:
+    """
+    (games/sec, mean days per game) of the object engine at a table of
+    `seats` players with proportional roles (config.scaled_role_counts).
+    """
+    config = {**GAME_CONFIG, "role_counts": scaled_role_counts(seats)}
+    days = 0
+    t0 = time.perf_counter()
+    for i in range(games):
+        game = WerewolfGame(rng=GameRNG.for_game(BENCH_SEED, i), config=config)
+        run_simulation(game)
+        days += game.day_count
+    return games / (time.perf_counter() - t0), days / games
+
+
+def run_scaling(seats: List[int], size: int):
+    """
+    Games/sec against table size. Games last longer at bigger tables, so
+    the cost per day is printed as well: it should grow no faster than the
+    seat count (flat or falling us/seat-day).
+    """
+    print(f"{'seats':>6} {'games/sec':>10} {'days/game':>10} {'ms/day':>8} {'us/seat-day':>12}")
+    for n in seats:
+        # About the same number of player-games per table size
+        rate, days = bench_scaling(n, max(10, size * 12 // n))
+        ms_per_day = 1e3 / rate / days
+        print(f"{n:>6} {rate:>10.1f} {days:>10.2f} {ms_per_day:>8.3f} {ms_per_day * 1e3 / n:>12.2f}", flush=True)
+
+
+def _live_bytes(build: Callable[[], list]) -> float:
+    """
+    Bytes still allocated per item of the list `build` returns (tracemalloc),
+    i.e. what keeping that many objects alive costs.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        items = build()
+        # Games are cyclic (players point back at them): drop the ones build() discarded
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before) / len(items)
+
+
+def run_memory(size: int):
+    """
+    Bytes per live game: freshly dealt, in progress after day 1, as a
+    GameSnapshot, and its players with their roles alone.
+    """
+    deck = [r for r, count in GAME_CONFIG["role_counts"].items() for _ in range(count)]
+    rows = [
+        ("new game", lambda: _new_games(size)),
+        ("game after day 1", lambda: _after_first_day(size)),
+        ("snapshot", lambda: [g.snapshot() for g in _after_first_day(size)]),
+        ("players + roles", lambda: [[Player(i + 1, ROLE_CLASSES[r]()) for i, r in enumerate(deck)]
+                                     for _ in range(size)]),
+    ]
+    for name, build in rows:
+        print(f"{name:<24} {_live_bytes(build):10.0f} bytes/game", flush=True)
+
+
+def _play(games: int, reuse: bool):
+    if reuse:
+        for game in iter_games(BENCH_SEED, 0, games):
+            run_simulation(game)
+    else:
+        for i in range(games):
+            run_simulation(WerewolfGame(rng=GameRNG.for_game(BENCH_SEED, i)))
+
+
+def bench_pooling(games: int, reuse: bool) -> Tuple[float, float, float]:
+    """
+    (games/sec, garbage collector passes per 1000 games, objects per game
+    left for the cycle collector) playing every game on a new WerewolfGame
+    or on one reset between games.
+    """
+    gc.collect()
+    passes = sum(s["collections"] for s in gc.get_stats())
+    t0 = time.perf_counter()
+    _play(games, reuse)
+    rate = games / (time.perf_counter() - t0)
+    passes = sum(s["collections"] for s in gc.get_stats()) - passes
+
+    # A discarded game is a reference cycle (players point back at it), freed only by the collector
+    gc.disable()
+    try:
+        _play(games, reuse)
+        garbage = gc.collect()
+    finally:
+        gc.enable()
+    return rate, passes * 1000 / games, garbage / games
+
+
+def run_pooling(size: int):
+    print(f"{'':<16} {'games/sec':>10} {'gc passes/1k':>13} {'cyclic objs/game':>17}")
+    for name, reuse in (("new game each", False), ("reset", True)):
+        rate, passes, garbage = bench_pooling(size, reuse)
+        print(f"{name:<16} {rate:>10.0f} {passes:>13.1f} {garbage:>17.1f}", flush=True)
+
+
+def git_commit() -> Dict[str, object]:
+    def git(*args) -> Optional[str]:
+        try:
+            return subprocess.run(["git", *args], cwd=SRC_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    # Uncommitted changes are recorded apart from the commit they started from
+    if git("status", "--porcelain", "--untracked-files=no"):
+        commit += "-dirty"
+    return {"commit": commit}
+
+
+def run_benchmarks(names: List[str], size: int, repeat: int) -> Dict[str, float]:
+    results = {}
+    for name in names:
+        results[name] = BENCHMARKS[name](size, repeat)
+        print(f"{name:<24} {format_result(name, results[name])}", flush=True)
+    return results
+
+
+def format_result(name: str, us: float) -> str:
+    if name.startswith("game."):
+        return f"{1e6 / us:10.0f} games/sec"
+    return f"{us:10.2f} us/call"
+
+
+def load_history(path: str) -> Dict[str, Dict]:
+    """
+    History entries keyed by commit, in order of their latest run. Runs of
+    the same commit are merged, later measurements replacing earlier ones.
+    """
+    history = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    previous = history.pop(entry["commit"], None)
+                    if previous is not None:
+                        entry["results"] = {**previous["results"], **entry["results"]}
+                    history[entry["commit"]] = entry
+    return history
+
+
+def compare(base: Dict, head: Dict, threshold: float) -> List[str]:
+    """
+    Print base vs head per benchmark and return the names that got slower by more than threshold.
+    """
+    slower = []
+    print(f"{'benchmark':<24} {base['commit']:>12} {head['commit']:>12}   change")
+    for name, head_us in head["results"].items():
+        base_us = base["results"].get(name)
+        if base_us is None:
+            continue
+        change = head_us / base_us - 1
+        flag = "  SLOWER" if change > threshold else ""
+        print(f"{name:<24} {base_us:12.2f} {head_us:12.2f}   {change * 100:+6.1f}%{flag}")
+        if change > threshold:
+            slower.append(name)
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Werewolf Simulator speed benchmarks (results in microseconds per call)")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON lines history file keyed by git commit")
+    sub = parser.add_subparsers(dest="command")
+
+    run = sub.add_parser("run", help="Run the benchmarks and record them for the current commit (default)")
+    run.add_argument("-k", "--only", nargs="*", choices=list(BENCHMARKS), default=None, help="Benchmarks to run (default all)")
+    run.add_argument("--size", type=int, default=200, help="Games / game states per measurement")
+    run.add_argument("--repeat", type=int, default=5, help="Measurements per benchmark; the best one is kept")
+    run.add_argument("--no-save", action="store_true", help="Don't append to the history file")
+
+    cmp = sub.add_parser("compare", help="Compare two commits from the history file")
+    cmp.add_argument("base", nargs="?", default=None, help="Baseline commit (default: the one before head)")
+    cmp.add_argument("head", nargs="?", default=None, help="Commit to check (default: the latest entry)")
+    cmp.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Relative slowdown that fails the comparison (default 0.10)")
+
+    scaling = sub.add_parser("scaling", help="Games/sec against table size (proportional role counts, object engine)")
+    scaling.add_argument("--seats", type=int, nargs="+", default=list(DEFAULT_SEATS), help="Table sizes to measure")
+    scaling.add_argument("--size", type=int, default=200, help="12-seat games' worth of players per table size")
+
+    memory = sub.add_parser("memory", help="Bytes per live game, snapshot and player set (tracemalloc)")
+    memory.add_argument("--size", type=int, default=200, help="Games kept alive per measurement")
+
+    pooling = sub.add_parser("pooling", help="Games/sec and garbage with a new WerewolfGame per game vs WerewolfGame.reset")
+    pooling.add_argument("--size", type=int, default=5000, help="Games per measurement")
+
+    args = parser.parse_args()
+
+    if args.command == "pooling":
+        run_pooling(args.size)
+        return
+
+    if args.command == "memory":
+        run_memory(args.size)
+        return
+
+    if args.command == "scaling":
+        run_scaling(args.seats, args.size)
+        return
+
+    if args.command == "compare":
+        history = load_history(args.history)
+        commits = list(history)
+        head = args.head or (commits[-1] if commits else None)
+        base = args.base or (commits[-2] if len(commits) > 1 else None)
+        if head not in history or base not in history:
+            sys.exit(f"Need two recorded commits in {args.history}, have: {', '.join(commits) or 'none'}")
+        slower = compare(history[base], history[head], args.threshold)
+        if slower:
+            print(f"\n{len(slower)} benchmark(s) slower by more than {args.threshold * 100:.0f}%: {', '.join(slower)}")
+            sys.exit(1)
+        return
+
+    size = getattr(args, "size", 200)
+    repeat = getattr(args, "repeat", 5)
+    names = getattr(args, "only", None) or list(BENCHMARKS)
+    entry = git_commit()
+    print(f"Benchmarking {entry['commit']} on Python {platform.python_version()}")
+    entry["results"] = run_benchmarks(names, size, repeat)
+    entry["time"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    entry["python"] = platform.python_version()
+    if not getattr(args, "no_save", False):
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import json
+import os
+import time
+from typing import Dict, Optional
+from runner import RunSummary
+from store import ResultsWriter
+from sweep import config_from_json, config_to_json
+
+# Seconds between two checkpoints of a run
+DEFAULT_CHECKPOINT_EVERY = 30.0
+
+CHECKPOINT_VERSION = 1
+
+
+class Checkpoint:
+    """
+    Where a main.py run stands: its settings, the merged win counts and the
+    seed cursor (the next game index). Game i only depends on (master seed,
+    i), and chunks are merged in order, so a run continued from a cursor
+    plays exactly the games the uninterrupted run would have played next.
+    """
+
+    def __init__(self, settings: Dict, config: Dict, results: Optional[Dict[str, int]] = None,
+                 games: int = 0, elapsed: float = 0.0, records: int = 0, finished: bool = False):
+        # seed, engine, chunk_size, max_games, target_ci, time_budget, records directory
+        self.settings = settings
+        self.config = config
+        self.results = results or {}
+        # Games played = index of the next game to play
+        self.games = games
+        self.elapsed = elapsed
+        # Rows of the records directory that belong to those games
+        self.records = records
+        # The run hit a stop condition; resuming only reports it
+        self.finished = finished
+
+    @property
+    def summary(self) -> RunSummary:
+        return RunSummary(dict(self.results), self.games, self.elapsed)
+
+    def to_json(self) -> Dict:
+        return {
+            "version": CHECKPOINT_VERSION,
+            "settings": self.settings,
+            "config": config_to_json(self.config),
+            "results": self.results,
+            "games": self.games,
+            "elapsed": round(self.elapsed, 3),
+            "records": self.records,
+            "finished": self.finished,
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict) -> 'Checkpoint':
+        if data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {data.get('version')}")
+        return cls(data["settings"], config_from_json(data["config"]), data["results"],
+                   data["games"], data["elapsed"], data["records"], data["finished"])
+
+    def save(self, path: str):
+        """
+        Write to a temporary file next to `path` and rename it over `path`,
+        so an interruption leaves either the old checkpoint or the new one.
+        """
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+def load_checkpoint(path: str) -> Checkpoint:
+    with open(path, encoding="utf-8") as f:
+        return Checkpoint.from_json(json.load(f))
+
+
+class Checkpointer:
+    """
+    run_until chunk callback that keeps the latest chunk-aligned state of a
+    run and saves it to `path` at most every `every` seconds, so the cost
+    is one small JSON write per interval whatever the chunk rate. save()
+    writes the latest state now (e.g. on Ctrl+C), finish() the final state
+    of a run that stopped on its own.
+    """
+
+    def __init__(self, path: str, checkpoint: Checkpoint, every: float = DEFAULT_CHECKPOINT_EVERY,
+                 store: Optional[ResultsWriter] = None):
+        self.path = path
+        self.checkpoint = checkpoint
+        self.every = every
+        self.store = store
+        self.latest = checkpoint.summary
+        self.latest_records = checkpoint.records
+        self.last_saved = time.monotonic()
+
+    def __call__(self, summary: RunSummary):
+        # run_until keeps merging into summary.results, so take a copy
+        self.latest = RunSummary(dict(summary.results), summary.games, summary.elapsed)
+        self.latest_records = self.store.rows if self.store is not None else 0
+        if time.monotonic() - self.last_saved >= self.every:
+            self.save()
+
+    def save(self):
+        checkpoint = self.checkpoint
+        checkpoint.results = self.latest.results
+        checkpoint.games = self.latest.games
+        checkpoint.elapsed = self.latest.elapsed
+        checkpoint.records = self.latest_records
+        checkpoint.save(self.path)
+        self.last_saved = time.monotonic()
+
+    def finish(self, summary: RunSummary):
+        self(summary)
+        self.checkpoint.finished = True
+        self.save()
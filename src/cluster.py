@@ -0,0 +1,341 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+from config import GAME_CONFIG
+from runner import run_chunk, merge_results, default_workers, _init_worker, DEFAULT_CHUNK_SIZE, BATCH_CHUNK_SIZE, ENGINES
+from stats import wilson_interval
+from sweep import expand_grid, config_to_json, config_from_json, iter_work_items
+from utils import logger, parse_duration, parse_seed
+
+# Hand an in-flight unit to an idle worker as well once it has run this long
+# without a result, so a slow or hung machine can't hold up the end of a run.
+DEFAULT_STEAL_AFTER = 30.0
+# How long an idle worker waits for something to free up before asking again
+IDLE_WAIT = 1.0
+
+# Wire format: one JSON object per line in both directions.
+#   worker -> coordinator: {"type": "hello", "name": ...}
+#                          {"type": "next"}
+#                          {"type": "result", "unit": id, "results": {faction: wins}}
+#   coordinator -> worker: {"type": "unit", "unit": id, "seed": ..., "start": ..., "count": ...,
+#                           "engine": ..., "config": config_to_json(...)}
+#                          {"type": "done"}
+
+
+def _send(stream, message: Dict):
+    stream.write((json.dumps(message) + "\n").encode("utf-8"))
+    stream.flush()
+
+
+def _receive(stream) -> Optional[Dict]:
+    line = stream.readline()
+    return json.loads(line) if line else None
+
+
+class Coordinator:
+    """
+    Splits a sweep into (config, seed range) work units and hands them to
+    workers as they ask for more, so fast workers simply take more units.
+
+    A unit that has been out for steal_after seconds is given to idle
+    workers too (work stealing); whichever copy finishes first counts.
+    Units of a worker whose connection drops go back to the front of the
+    queue. Every unit is played from the master seed alone, and the merged
+    results are summed in unit order, so they are the same as sweep.py's
+    for that seed and chunk size whoever ran what.
+    """
+
+    def __init__(self, configs: List[Dict], games_per_config: int, master_seed: int,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, engine: str = "object",
+                 steal_after: float = DEFAULT_STEAL_AFTER):
+        self.configs = configs
+        self.games_per_config = games_per_config
+        self.master_seed = master_seed
+        self.engine = engine
+        self.steal_after = steal_after
+        self.units: List[Tuple[int, int, int]] = list(iter_work_items(len(configs), games_per_config, chunk_size))
+        self.queue = deque(range(len(self.units)))
+        # unit id -> {worker name: time it was handed out}
+        self.running: Dict[int, Dict[str, float]] = {}
+        self.results: Dict[int, Dict[str, int]] = {}
+        self.units_left = {config_id: 0 for config_id in range(len(configs))}
+        for config_id, _, _ in self.units:
+            self.units_left[config_id] += 1
+        self.retried = 0
+        self.stolen = 0
+        self.started = time.monotonic()
+        self.lock = threading.Condition()
+        self.on_config_done = None
+
+    @property
+    def finished(self) -> bool:
+        return len(self.results) == len(self.units)
+
+    def unit_message(self, unit_id: int) -> Dict:
+        config_id, start, count = self.units[unit_id]
+        return {"type": "unit", "unit": unit_id, "seed": self.master_seed, "start": start, "count": count,
+                "engine": self.engine, "config": config_to_json(self.configs[config_id])}
+
+    def next_unit(self, worker: str) -> Optional[int]:
+        """
+        Block until there is a unit for `worker`; None once every unit is done.
+        """
+        with self.lock:
+            while not self.finished:
+                while self.queue:
+                    unit_id = self.queue.popleft()
+                    if unit_id not in self.results:
+                        self.running.setdefault(unit_id, {})[worker] = time.monotonic()
+                        return unit_id
+                unit_id = self._steal(worker)
+                if unit_id is not None:
+                    return unit_id
+                self.lock.wait(IDLE_WAIT)
+            return None
+
+    def _steal(self, worker: str) -> Optional[int]:
+        now = time.monotonic()
+        candidates = [(len(holders), max(holders.values()), unit_id) for unit_id, holders in self.running.items()
+                      if worker not in holders and now - max(holders.values()) >= self.steal_after]
+        if not candidates:
+            return None
+        # Fewest copies first, then the one that has been waiting longest
+        _, _, unit_id = min(candidates)
+        self.running[unit_id][worker] = now
+        self.stolen += 1
+        logger.info(f"{worker} steals unit {unit_id}")
+        return unit_id
+
+    def complete(self, worker: str, unit_id: int, results: Dict[str, int]):
+        with self.lock:
+            if unit_id in self.results:
+                # A stolen copy came in second; it must agree with the first
+                if self.results[unit_id] != results:
+                    logger.warning(f"Unit {unit_id} from {worker} disagrees with an earlier copy: {results} != {self.results[unit_id]}")
+                return
+            self.results[unit_id] = results
+            self.running.pop(unit_id, None)
+            config_id = self.units[unit_id][0]
+            self.units_left[config_id] -= 1
+            if not self.units_left[config_id] and self.on_config_done:
+                self.on_config_done(config_id)
+            self.lock.notify_all()
+
+    def worker_lost(self, worker: str):
+        with self.lock:
+            for unit_id, holders in list(self.running.items()):
+                if holders.pop(worker, None) is not None and not holders:
+                    del self.running[unit_id]
+                    self.queue.appendleft(unit_id)
+                    self.retried += 1
+                    logger.info(f"{worker} lost, retrying unit {unit_id}")
+            self.lock.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        with self.lock:
+            return self.lock.wait_for(lambda: self.finished, timeout)
+
+    def config_results(self, config_id: int) -> Dict[str, int]:
+        """
+        Win counts of one config, merged in unit order.
+        """
+        total: Dict[str, int] = {}
+        for unit_id, (unit_config, _, _) in enumerate(self.units):
+            if unit_config == config_id:
+                merge_results(total, self.results[unit_id])
+        return dict(sorted(total.items()))
+
+    def config_record(self, config_id: int) -> Dict:
+        wins = self.config_results(config_id)
+        n = self.games_per_config
+        return {
+            "config_id": config_id,
+            "config": config_to_json(self.configs[config_id]),
+            "seed": self.master_seed,
+            "games": n,
+            "results": wins,
+            "ci95": {f: wilson_interval(w, n) for f, w in wins.items()},
+            "elapsed": round(time.monotonic() - self.started, 3),
+        }
+
+
+class _WorkerHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        coordinator: Coordinator = self.server.coordinator
+        hello = _receive(self.rfile)
+        if not hello or hello.get("type") != "hello":
+            return
+        # Names only need to be unique per connection
+        worker = f"{hello.get('name', 'worker')}@{self.client_address[0]}:{self.client_address[1]}"
+        logger.info(f"{worker} connected")
+        try:
+            while True:
+                message = _receive(self.rfile)
+                if message is None:
+                    break
+                if message["type"] == "result":
+                    coordinator.complete(worker, message["unit"], message["results"])
+                elif message["type"] == "next":
+                    unit_id = coordinator.next_unit(worker)
+                    if unit_id is None:
+                        _send(self.wfile, {"type": "done"})
+                        break
+                    _send(self.wfile, coordinator.unit_message(unit_id))
+        except (OSError, ValueError) as e:
+            logger.info(f"{worker}: {e}")
+        finally:
+            coordinator.worker_lost(worker)
+
+
+class CoordinatorServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Tuple[str, int], coordinator: Coordinator):
+        super().__init__(address, _WorkerHandler)
+        self.coordinator = coordinator
+
+
+def run_coordinator(coordinator: Coordinator, address: Tuple[str, int], out_path: str,
+                    ready: Optional[Callable[[int], None]] = None) -> Dict[int, Dict[str, int]]:
+    """
+    Serve work units on `address` until every unit is in, appending one JSON
+    line per config to out_path (the same records as sweep.py) as it finishes.
+    """
+    with open(out_path, "a", encoding="utf-8") as out:
+        def config_done(config_id: int):
+            record = coordinator.config_record(config_id)
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            logger.info(f"Config {config_id} done: {record['results']}")
+        coordinator.on_config_done = config_done
+
+        with CoordinatorServer(address, coordinator) as server:
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            host, port = server.server_address[:2]
+            logger.info(f"Coordinator on {host}:{port}: {len(coordinator.units)} units")
+            if ready:
+                ready(port)
+            coordinator.wait()
+            # Let idle workers pick up their "done"
+            with coordinator.lock:
+                coordinator.lock.notify_all()
+            server.shutdown()
+    logger.info(f"All units done ({coordinator.retried} retried, {coordinator.stolen} stolen)")
+    return {config_id: coordinator.config_results(config_id) for config_id in range(len(coordinator.configs))}
+
+
+def run_worker(host: str, port: int, name: Optional[str] = None, retry_for: float = 10.0) -> int:
+    """
+    Connect to a coordinator and play units until it says done. Returns the
+    number of units played.
+    """
+    _init_worker()
+    name = name or f"{socket.gethostname()}-{os.getpid()}"
+    deadline = time.monotonic() + retry_for
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+            break
+        except OSError:
+            # The coordinator may still be starting up
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.2)
+
+    played = 0
+    with sock, sock.makefile("rb") as rfile, sock.makefile("wb") as wfile:
+        _send(wfile, {"type": "hello", "name": name})
+        while True:
+            _send(wfile, {"type": "next"})
+            message = _receive(rfile)
+            if message is None or message["type"] == "done":
+                return played
+            results = run_chunk(message["seed"], message["start"], message["count"], message["engine"],
+                                config=config_from_json(message["config"]))
+            _send(wfile, {"type": "result", "unit": message["unit"], "results": results})
+            played += 1
+
+
+def start_workers(host: str, port: int, processes: int) -> List[multiprocessing.Process]:
+    workers = []
+    for i in range(processes):
+        p = multiprocessing.Process(target=run_worker, args=(host, port, f"{socket.gethostname()}-{i}"), daemon=True)
+        p.start()
+        workers.append(p)
+    return workers
+
+
+def _parse_address(text: str) -> Tuple[str, int]:
+    host, _, port = text.rpartition(":")
+    return host or "0.0.0.0", int(port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Werewolf Simulator sweeps spread over TCP workers")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_run_args(p):
+        p.add_argument("grid", nargs="?", default=None, help="JSON grid file (see sweep.expand_grid); default GAME_CONFIG")
+        p.add_argument("-n", "--num_games", type=int, default=10000, help="Games per configuration")
+        p.add_argument("-s", "--seed", type=parse_seed, default=None, help="Master seed, shared by every configuration")
+        p.add_argument("--chunk-size", type=int, default=None, help=f"Games per work unit (default {DEFAULT_CHUNK_SIZE}, {BATCH_CHUNK_SIZE} for the batch engine)")
+        p.add_argument("-e", "--engine", choices=ENGINES, default="object")
+        p.add_argument("-o", "--output", default="sweep_results.jsonl", help="JSON lines file, appended one line per finished configuration")
+        p.add_argument("--steal-after", type=parse_duration, default=DEFAULT_STEAL_AFTER, help="Give a unit to idle workers too once it has been out this long (e.g. 30s)")
+
+    coord = sub.add_parser("coordinator", help="Hand out work units and merge the results")
+    add_run_args(coord)
+    coord.add_argument("--listen", default="0.0.0.0:5555", help="host:port to accept workers on")
+
+    work = sub.add_parser("worker", help="Play units for a coordinator")
+    work.add_argument("address", help="Coordinator host:port")
+    work.add_argument("-p", "--processes", type=int, default=0, help=f"Worker processes (0 = all {default_workers()} cores)")
+
+    local = sub.add_parser("local", help="Coordinator plus worker processes on this host, over localhost")
+    add_run_args(local)
+    local.add_argument("-p", "--processes", type=int, default=0, help=f"Worker processes (0 = all {default_workers()} cores)")
+
+    args = parser.parse_args()
+    logger.setLevel(logging.INFO)
+
+    if args.command == "worker":
+        host, port = _parse_address(args.address)
+        for p in start_workers(host, port, args.processes or default_workers()):
+            p.join()
+        return
+
+    configs = [GAME_CONFIG]
+    if args.grid:
+        with open(args.grid, encoding="utf-8") as f:
+            configs = expand_grid(json.load(f))
+    seed = args.seed if args.seed is not None else random.SystemRandom().getrandbits(31)
+    chunk_size = args.chunk_size or (BATCH_CHUNK_SIZE if args.engine == "batch" else DEFAULT_CHUNK_SIZE)
+    coordinator = Coordinator(configs, args.num_games, seed, chunk_size, args.engine, args.steal_after)
+    logger.info(f"Sweeping {len(configs)} configs x {args.num_games} games (seed {seed}) -> {args.output}")
+
+    if args.command == "coordinator":
+        run_coordinator(coordinator, _parse_address(args.listen), args.output)
+        return
+
+    workers = []
+    try:
+        run_coordinator(coordinator, ("127.0.0.1", 0), args.output,
+                        ready=lambda port: workers.extend(start_workers("127.0.0.1", port, args.processes or default_workers())))
+    finally:
+        for p in workers:
+            p.join(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
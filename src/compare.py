@@ -0,0 +1,214 @@
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from runner import ChunkPlanner, iter_games, iter_planned, run_simulation, default_workers, DEFAULT_CHUNK_SIZE, MIN_GAMES_FOR_CI
+from stats import Z_95, paired_sprt
+from sweep import expand_grid
+from utils import logger, parse_seed
+
+# Pair outcomes for the compared faction: both variants win, only A, only B, neither
+BOTH, A_ONLY, B_ONLY, NEITHER = range(4)
+
+SPRT_VERDICTS = {1: "A > B", -1: "A < B", 0: "no difference"}
+
+
+def run_paired_chunk(master_seed: int, start: int, count: int, config_a: Dict, config_b: Dict,
+                     faction: str = "Good") -> List[int]:
+    """
+    Play games [start, start + count) under both configs and count the pair
+    outcomes (BOTH, A_ONLY, B_ONLY, NEITHER) for `faction` winning.
+
+    Game i of both variants runs on the same GameRNG.for_game(master seed, i)
+    stream, so they get the same deal and take the same random choices until
+    the strategies make them play differently (common random numbers). Game
+    i is also game i of a main.py run with that seed and config.
+    """
+    table = [0, 0, 0, 0]
+    games_a = iter_games(master_seed, start, count, config=config_a)
+    games_b = iter_games(master_seed, start, count, config=config_b)
+    for game_a, game_b in zip(games_a, games_b):
+        won_a = run_simulation(game_a) == faction
+        won_b = run_simulation(game_b) == faction
+        table[(not won_a) * 2 + (not won_b)] += 1
+    return table
+
+
+def _run_paired_args(args: Tuple[int, int, int, Dict, Dict, str]) -> List[int]:
+    return run_paired_chunk(*args)
+
+
+class PairedSummary:
+    """
+    Merged pair table of a comparison. d = (A won) - (B won) per game.
+    """
+
+    def __init__(self, table: List[int], elapsed: float = 0.0, verdict: Optional[int] = None):
+        self.table = table
+        self.elapsed = elapsed
+        # paired_sprt outcome, None if the run hit its game limit first
+        self.verdict = verdict
+
+    @property
+    def games(self) -> int:
+        return sum(self.table)
+
+    @property
+    def rate_a(self) -> float:
+        return (self.table[BOTH] + self.table[A_ONLY]) / max(self.games, 1)
+
+    @property
+    def rate_b(self) -> float:
+        return (self.table[BOTH] + self.table[B_ONLY]) / max(self.games, 1)
+
+    @property
+    def diff_sum(self) -> int:
+        return self.table[A_ONLY] - self.table[B_ONLY]
+
+    @property
+    def diff_sq_sum(self) -> int:
+        return self.table[A_ONLY] + self.table[B_ONLY]
+
+    @property
+    def diff(self) -> float:
+        return self.diff_sum / max(self.games, 1)
+
+    @property
+    def diff_variance(self) -> float:
+        """
+        Sample variance of a single paired difference d.
+        """
+        n = self.games
+        if n < 2:
+            return 0.0
+        return (self.diff_sq_sum - n * self.diff * self.diff) / (n - 1)
+
+    @property
+    def diff_se(self) -> float:
+        return math.sqrt(self.diff_variance / max(self.games, 1))
+
+    @property
+    def independent_se(self) -> float:
+        """
+        Standard error the same difference would have from two independent runs of as many games.
+        """
+        n = max(self.games, 1)
+        a, b = self.rate_a, self.rate_b
+        return math.sqrt((a * (1 - a) + b * (1 - b)) / n)
+
+    @property
+    def correlation(self) -> float:
+        a, b = self.rate_a, self.rate_b
+        denom = math.sqrt(a * (1 - a) * b * (1 - b))
+        if denom == 0:
+            return 0.0
+        return (self.table[BOTH] / max(self.games, 1) - a * b) / denom
+
+
+def run_compare(config_a: Dict, config_b: Dict, master_seed: int, delta: float = 0.01,
+                alpha: float = 0.05, beta: float = 0.1, max_games: Optional[int] = None,
+                workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE, faction: str = "Good",
+                progress: Optional[Callable[[PairedSummary], None]] = None) -> PairedSummary:
+    """
+    Play paired games until the SPRT on the difference of `faction`'s win
+    rate (A - B) decides, or max_games pairs have been played.
+
+    `delta` is the smallest difference worth detecting: the test stops with
+    a sign once the difference is significant, or with "no difference" once
+    it is confidently below delta. Chunks are merged in order and the test
+    runs after each one (from MIN_GAMES_FOR_CI pairs on), so a seed gives
+    the same result whatever the worker count.
+    """
+    if delta <= 0:
+        raise ValueError("delta must be positive")
+    started = time.monotonic()
+    planner = ChunkPlanner(chunk_size, max_games=max_games, workers=workers)
+    summary = PairedSummary([0, 0, 0, 0])
+    chunks = iter_planned(_run_paired_args, planner,
+                          lambda chunk: (master_seed, *chunk, config_a, config_b, faction), workers)
+    for part in chunks:
+        for k, count in enumerate(part):
+            summary.table[k] += count
+        if progress:
+            progress(summary)
+        if summary.games >= MIN_GAMES_FOR_CI:
+            summary.verdict = paired_sprt(summary.games, summary.diff_sum, summary.diff_sq_sum, delta, alpha, beta)
+            if summary.verdict is not None:
+                break
+    chunks.close()
+    summary.elapsed = time.monotonic() - started
+    return summary
+
+
+def load_variant(text: str) -> Dict:
+    """
+    A variant is a sweep grid (inline JSON or a file) with exactly one combination.
+    """
+    if os.path.exists(text):
+        with open(text, encoding="utf-8") as f:
+            grid = json.load(f)
+    else:
+        grid = json.loads(text)
+    configs = expand_grid(grid)
+    if len(configs) != 1:
+        raise ValueError(f"A variant must be a single config, {text!r} expands to {len(configs)}")
+    return configs[0]
+
+
+def print_report(summary: PairedSummary, faction: str):
+    n = summary.games
+    lo = summary.diff - Z_95 * summary.diff_se
+    hi = summary.diff + Z_95 * summary.diff_se
+    print(f"\n--- {faction} win rate, {n} paired games ---")
+    print(f"A: {summary.rate_a * 100:.2f}%   B: {summary.rate_b * 100:.2f}%")
+    print(f"A - B: {summary.diff * 100:+.2f}% (95% CI {lo * 100:+.2f}% to {hi * 100:+.2f}%, "
+          f"per-pair variance {summary.diff_variance:.4f})")
+    print(f"Pairs: both {summary.table[BOTH]}, A only {summary.table[A_ONLY]}, "
+          f"B only {summary.table[B_ONLY]}, neither {summary.table[NEITHER]}")
+    if summary.diff_se > 0:
+        # Independent runs need (se_ind / se_paired)^2 times the games for the same precision
+        ratio = (summary.independent_se / summary.diff_se) ** 2
+        print(f"Correlation {summary.correlation:.3f}: independent runs would have SE ±{summary.independent_se * 100:.2f}% "
+              f"vs ±{summary.diff_se * 100:.2f}% paired ({ratio:.1f}x the games for the same precision)")
+    verdict = SPRT_VERDICTS[summary.verdict] if summary.verdict is not None else "undecided (game limit)"
+    print(f"SPRT: {verdict}")
+    print(f"Games: {n} pairs in {summary.elapsed:.2f}s ({2 * n / summary.elapsed if summary.elapsed > 0 else 0:.0f} games/sec)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two Werewolf Simulator configs on the same seeds and deals")
+    parser.add_argument("a", help="Variant A: grid JSON (inline or file) with a single combination, e.g. '{\"hunter_reveal\": \"seer_dead\"}'")
+    parser.add_argument("b", help="Variant B, same format")
+    parser.add_argument("-n", "--num_games", type=int, default=1000000, help="Most pairs to play if the test hasn't decided")
+    parser.add_argument("-w", "--workers", type=int, default=1, help=f"Number of worker processes (0 = all {default_workers()} cores)")
+    parser.add_argument("-s", "--seed", type=parse_seed, default=None, help="Master seed, shared by both variants")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Pairs per work unit (the test runs after each)")
+    parser.add_argument("--delta", type=float, default=0.01, help="Smallest win-rate difference worth detecting (e.g. 0.01 = 1%%)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="False positive rate of the test (two-sided)")
+    parser.add_argument("--beta", type=float, default=0.1, help="Rate of missing a difference of --delta")
+    parser.add_argument("--faction", choices=("Good", "Werewolves"), default="Good", help="Whose win rate to compare")
+    args = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    config_a = load_variant(args.a)
+    config_b = load_variant(args.b)
+    workers = args.workers if args.workers > 0 else default_workers()
+    seed = args.seed if args.seed is not None else random.SystemRandom().getrandbits(31)
+    print(f"Comparing on {workers} worker(s) (seed {seed}, delta {args.delta})...")
+
+    def progress(summary: PairedSummary):
+        print(f"\rPairs: {summary.games}, A - B {summary.diff * 100:+.2f}% ± {Z_95 * summary.diff_se * 100:.2f}%",
+              end="", flush=True)
+
+    summary = run_compare(config_a, config_b, seed, args.delta, args.alpha, args.beta, args.num_games,
+                          workers, args.chunk_size, args.faction, progress)
+    print()
+    print_report(summary, args.faction)
+
+
+if __name__ == "__main__":
+    main()
@@ -19,4 +19,55 @@ GAME_CONFIG = {
         RoleType.IDIOT: 1,
     },
     "sheriff_enabled": True, # Can be toggled
+    "sheriff_vote_weight": 1.5, # The Sheriff's vote counts this much
+    "hunter_reveal": "seer_dead", # When the Hunter reveals themself, see HUNTER_REVEAL_RULES
+    "beliefs": "independent", # How players weigh what they learn, see BELIEF_MODELS
 }
+
+# seer_dead: once they believe the Seer is dead; never: keep hidden; day1: at the first discussion
+HUNTER_REVEAL_RULES = ("seer_dead", "never", "day1")
+
+# independent: each fact only renormalises its target's row (object, batch and solver engines);
+# exact: posteriors over whole deals consistent with every fact (object engine, beliefs.py)
+BELIEF_MODELS = ("independent", "exact")
+
+
+
+def check_config(config: dict):
+    """
+    Reject rule values no engine knows, before any game is dealt.
+    """
+    for key, allowed, default in (("hunter_reveal", HUNTER_REVEAL_RULES, "seer_dead"),
+                                  ("beliefs", BELIEF_MODELS, "independent")):
+        value = config.get(key, default)
+        if value not in allowed:
+            raise ValueError(f"Unknown {key} {value!r}, expected one of {', '.join(allowed)}")
+
+
+# Night actions run for the first player of these roles only (run_seer / run_witch)
+SINGLE_ROLES = (RoleType.SEER, RoleType.WITCH)
+
+
+def scaled_role_counts(players: int, base: dict = GAME_CONFIG["role_counts"]) -> dict:
+    """
+    Role counts for a table of `players` seats in the proportions of `base`
+    (largest remainder). There is still one Seer and one Witch; the rest of
+    their share goes to the other gods in turn.
+    """
+    total = sum(base.values())
+    shares = {r: players * c / total for r, c in base.items()}
+    counts = {r: int(s) for r, s in shares.items()}
+    short = players - sum(counts.values())
+    for r in sorted(shares, key=lambda r: counts[r] - shares[r])[:short]:
+        counts[r] += 1
+
+    others = [r for r in base if r not in SINGLE_ROLES and r not in (RoleType.WEREWOLF, RoleType.VILLAGER)]
+    spare = 0
+    for r in SINGLE_ROLES:
+        if counts.get(r, 0) > 1:
+            spare += counts[r] - 1
+            counts[r] = 1
+    for i in range(spare):
+        r = others[i % len(others)] if others else RoleType.VILLAGER
+        counts[r] = counts.get(r, 0) + 1
+    return {r: c for r, c in counts.items() if c > 0}
@@ -0,0 +1,179 @@
+import logging
+from enum import IntEnum
+from typing import Callable, Dict, List, Tuple
+from config import HUNTER_REVEAL_RULES
+from knowledge import ROLE_TYPES
+
+
+class EventType(IntEnum):
+    """
+    Structured game events. Every field is an int: player ids, role ids
+    (knowledge.ROLE_INDEX), counts, and probabilities in percent.
+    Fields are listed next to each type.
+    """
+    GAME_START = 1          # num_players
+    PLAYER_DEALT = 2        # player, role
+    NIGHT_START = 3         # day
+    WOLF_VOTE = 4           # wolf, target
+    WOLF_KILL = 5           # target, votes, alive_wolves
+    SEER_CHECK = 6          # seer, target, role, is_wolf
+    WITCH_SAVE = 7          # witch, target
+    WITCH_POISON = 8        # witch, target
+    DAY_START = 9           # day
+    PEACEFUL_NIGHT = 10     #
+    NIGHT_DEATH = 11        # player
+    ELECTION_START = 12     #
+    CANDIDATE = 13          # player, role
+    NO_CANDIDATES = 14      #
+    CANDIDATES_SHARE = 15   #
+    SHERIFF_ELECTED = 16    # player, role
+    SEER_CLAIM = 17         # seer, target, role
+    BADGE_FLOW = 18         # seer, target
+    SILVER_WATER = 19       # witch, target
+    HUNTER_REVEAL = 20      # hunter, rule (index in config.HUNTER_REVEAL_RULES)
+    HUNTER_SKILL = 21       # hunter
+    HUNTER_SHOT = 22        # hunter, target, wolf_prob_pct
+    VOTE_SUGGESTION = 23    # leader, role, target
+    VOTE_CAST = 24          # voter, target
+    VOTE_COUNTS = 25        # (target, half_votes) pairs, flattened
+    EXECUTED = 26           # player
+    IDIOT_FLIP = 27         # player
+    SHERIFF_DIED = 28       # player
+    SHERIFF_TRANSFER = 29   # player
+    BADGE_FLOW_REVEAL = 30  # target, is_wolf
+    GAME_OVER = 31          # winner (WINNER_CODES), cause (WinCause)
+
+
+class WinCause(IntEnum):
+    ALL_WOLVES_DEAD = 1
+    ALL_VILLAGERS_DEAD = 2
+    ALL_GODS_DEAD = 3
+
+
+WINNER_CODES = {"Good": 1, "Werewolves": 2}
+WINNER_NAMES = {code: name for name, code in WINNER_CODES.items()}
+
+Listener = Callable[[EventType, Tuple[int, ...]], None]
+
+
+class EventBus:
+    """
+    Fan-out of game events to listeners.
+
+    Emitting sites are guarded with `if bus.listening:` so that when nobody
+    is subscribed (benchmark runs) no event tuple is built and nothing is
+    formatted.
+    """
+
+    def __init__(self):
+        self.listeners: List[Listener] = []
+        self.listening = False
+
+    def subscribe(self, listener: Listener):
+        self.listeners.append(listener)
+        self.listening = True
+
+    def unsubscribe(self, listener: Listener):
+        self.listeners.remove(listener)
+        self.listening = bool(self.listeners)
+
+    def emit(self, event_type: EventType, *fields: int):
+        for listener in self.listeners:
+            listener(event_type, fields)
+
+
+bus = EventBus()
+
+
+class EventLogger:
+    """
+    Human-readable game log: formats the event stream onto a logging.Logger.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self.roles: Dict[int, int] = {}
+
+    def _player(self, player_id: int) -> str:
+        role = self.roles.get(player_id)
+        return f"Player {player_id} ({ROLE_TYPES[role].value})" if role is not None else f"Player {player_id}"
+
+    def __call__(self, event_type: EventType, fields: Tuple[int, ...]):
+        info = self.logger.info
+        E = EventType
+        if event_type == E.GAME_START:
+            self.roles = {}
+            info("Game Initialized with roles:")
+        elif event_type == E.PLAYER_DEALT:
+            self.roles[fields[0]] = fields[1]
+            info(self._player(fields[0]))
+        elif event_type == E.NIGHT_START:
+            info(f"\n--- Night {fields[0]} ---")
+        elif event_type == E.WOLF_VOTE:
+            self.logger.debug(f"Wolf {fields[0]} votes for {self._player(fields[1])}")
+        elif event_type == E.WOLF_KILL:
+            info(f"Wolves decided to kill {self._player(fields[0])} (Votes: {fields[1]}/{fields[2]})")
+        elif event_type == E.SEER_CHECK:
+            info(f"Seer {fields[0]} checked {fields[1]} ({ROLE_TYPES[fields[2]].value}). Valid: {bool(fields[3])}")
+        elif event_type == E.WITCH_SAVE:
+            info(f"Witch used antidote on {fields[1]}")
+        elif event_type == E.WITCH_POISON:
+            info(f"Witch uses poison on Player {fields[1]}")
+        elif event_type == E.DAY_START:
+            info(f"\n--- Day {fields[0]} ---")
+        elif event_type == E.PEACEFUL_NIGHT:
+            info("平安夜 (No one died last night).")
+        elif event_type == E.NIGHT_DEATH:
+            info(f"Player {fields[0]} died last night.")
+        elif event_type == E.ELECTION_START:
+            info("Running Sheriff Election...")
+        elif event_type == E.CANDIDATE:
+            info(f"Player {fields[0]} ({ROLE_TYPES[fields[1]].value}) runs for Sheriff.")
+        elif event_type == E.NO_CANDIDATES:
+            info("No candidates for Sheriff.")
+        elif event_type == E.CANDIDATES_SHARE:
+            info("Candidates share information:")
+        elif event_type == E.SHERIFF_ELECTED:
+            info(f"Sheriff is Player {fields[0]} ({ROLE_TYPES[fields[1]].value})")
+        elif event_type == E.SEER_CLAIM:
+            info(f"[Discussion] Seer {fields[0]} says: Player {fields[1]} is {ROLE_TYPES[fields[2]].value}")
+        elif event_type == E.BADGE_FLOW:
+            info(f"[Discussion] Seer {fields[0]} announces Badge Flow: Tonight will check Player {fields[1]}. If Good -> Transfer to them; If Wolf -> Transfer to previously known good.")
+        elif event_type == E.SILVER_WATER:
+            info(f"[Discussion] Witch {fields[0]} says: I saved Player {fields[1]} last night! (Silver Water)")
+        elif event_type == E.HUNTER_REVEAL:
+            reason = " because the Seer is dead" if HUNTER_REVEAL_RULES[fields[1]] == "seer_dead" else ""
+            info(f"[Discussion] Hunter {fields[0]} says: Identifying myself as the Hunter{reason}!")
+        elif event_type == E.HUNTER_SKILL:
+            info(f"Hunter {fields[0]} triggers skill!")
+        elif event_type == E.HUNTER_SHOT:
+            info(f"Hunter shoots Player {fields[1]} (Wolf Prob: {fields[2] / 100:.2f})")
+        elif event_type == E.VOTE_SUGGESTION:
+            info(f"Voting Leader {fields[0]} ({ROLE_TYPES[fields[1]].value}) suggests voting for Player {fields[2]}")
+        elif event_type == E.VOTE_CAST:
+            info(f"Player {fields[0]} votes -> {fields[1]}")
+        elif event_type == E.VOTE_COUNTS:
+            vote_details = ", ".join(f"Player {fields[i]}: {fields[i + 1] / 2}" for i in range(0, len(fields), 2))
+            info(f"Vote Counts: {vote_details}")
+        elif event_type == E.EXECUTED:
+            info(f"Voting Result: Player {fields[0]} is executed!")
+        elif event_type == E.IDIOT_FLIP:
+            info(f"Player {fields[0]} flips card: I am an IDIOT!")
+            info("Idiot survives execution.")
+        elif event_type == E.SHERIFF_DIED:
+            info(f"Sheriff {fields[0]} died. Transferring badge...")
+        elif event_type == E.SHERIFF_TRANSFER:
+            info(f"New Sheriff is Player {fields[0]}")
+        elif event_type == E.BADGE_FLOW_REVEAL:
+            if fields[1]:
+                info(f"Seer Badge Flow: Player {fields[0]} is Wolf. Revealing their role to all and transferring badge to known good.")
+            else:
+                info(f"Seer Badge Flow: Player {fields[0]} is Good. Transferring badge and revealing their role to all.")
+        elif event_type == E.GAME_OVER:
+            cause = WinCause(fields[1])
+            if cause == WinCause.ALL_WOLVES_DEAD:
+                info("Game Over! Winner: Good (All Wolves Dead)")
+            elif cause == WinCause.ALL_VILLAGERS_DEAD:
+                info("Game Over! Winner: Werewolves (All Villagers Dead - Slaughter)")
+            else:
+                info("Game Over! Winner: Werewolves (All Gods Dead - Slaughter)")
@@ -1,109 +1,322 @@
 
-import random
-from typing import List, Optional, Dict
-from config import GAME_CONFIG, RoleType
+from collections import deque
+from typing import List, Optional, Dict, Tuple
+from config import GAME_CONFIG, RoleType, check_config
+from beliefs import knowledge_class
+from knowledge import KnowledgeMatrix, ROLE_INDEX, ROLE_TYPES
 from player import Player
 from roles import *
-from utils import logger
+from roles.role import SuspectRanking
+from rng import GameRNG
+from events import bus, EventType, WinCause, WINNER_CODES
+
+
+class GameSnapshot:
+    """
+    Compact, immutable encoding of a game between two days (after run_day,
+    before the next run_night): the alive bitmask, each player's packed
+    status flags (Player.flags), role-internal state from Role.get_state and
+    a private copy of the KnowledgeMatrix.
+
+    Snapshots are small and picklable, so they can be shipped to worker
+    processes; WerewolfGame(snapshot) builds an independent game from one.
+    """
+
+    def __init__(self, config: Dict, day_count: int, winner: Optional[str], sheriff_id: Optional[int],
+                 role_classes: Tuple[type, ...], role_states: Tuple[tuple, ...], alive_mask: int,
+                 player_flags: Tuple[int, ...], knowledge: KnowledgeMatrix, history: tuple = ((), (), None, None)):
+        self.config = config
+        # (death order, sheriff history, witch saved, witch poisoned)
+        self.history = history
+        self.day_count = day_count
+        self.winner = winner
+        self.sheriff_id = sheriff_id
+        self.role_classes = role_classes
+        self.role_states = role_states
+        # Bit (id - 1) set for each alive player, as WerewolfGame.alive_mask
+        self.alive_mask = alive_mask
+        self.player_flags = player_flags
+        self.knowledge = knowledge
+        self.knowledge.public.flags.writeable = False
+
+    @property
+    def num_players(self) -> int:
+        return len(self.role_classes)
+
 
 class WerewolfGame:
-    def __init__(self):
+    def __init__(self, snapshot: Optional[GameSnapshot] = None, rng: Optional[GameRNG] = None,
+                 config: Dict = GAME_CONFIG):
+        self.config = snapshot.config if snapshot is not None else config
+        check_config(self.config)
+        # Every random decision of the game, roles included, draws from this stream
+        self.rng = rng if rng is not None else GameRNG()
         self.players: List[Player] = []
         self.day_count = 0
         self.winner: Optional[str] = None
         self.sheriff: Optional[Player] = None
-        self._init_players()
+        self.knowledge: Optional[KnowledgeMatrix] = None
+
+        # Membership indexes: bit (id - 1) is set for each member.
+        # Player.die/revive keep alive_mask current through _on_alive_change.
+        self.alive_mask = 0
+        self.role_masks: Dict[RoleType, int] = {}
+        self.god_mask = 0
+        self._players_by_role: Dict[RoleType, List[Player]] = {}
+        self._alive_players: Optional[List[Player]] = None
+
+        # Values derived from the public state, memoised until the next
+        # death, sheriff change or phase boundary (see _invalidate)
+        self._derived: Dict[str, object] = {}
+
+        # Per-game record (see store.py)
+        self.win_cause: Optional[WinCause] = None
+        self.death_order: List[int] = []
+        self.sheriff_history: List[int] = []
+        self.witch_saved: Optional[int] = None
+        self.witch_poisoned: Optional[int] = None
+        # Role objects in config order, re-dealt by reset()
+        self._deck: Optional[Tuple[Role, ...]] = None
+        if snapshot is not None:
+            self._restore(snapshot)
+        else:
+            self._init_players()
+
+    def _new_deck(self) -> Tuple[Role, ...]:
+        """
+        One role object per seat, in config order.
+        """
+        return tuple(ROLE_CLASSES[role_type]() for role_type, count in self.config["role_counts"].items()
+                     for _ in range(count))
 
     def _init_players(self):
-        roles = []
-        for role_type, count in GAME_CONFIG["role_counts"].items():
-            for _ in range(count):
-                if role_type == RoleType.WEREWOLF:
-                    roles.append(Werewolf())
-                elif role_type == RoleType.VILLAGER:
-                    roles.append(Villager())
-                elif role_type == RoleType.SEER:
-                    roles.append(Seer())
-                elif role_type == RoleType.WITCH:
-                    roles.append(Witch())
-                elif role_type == RoleType.HUNTER:
-                    roles.append(Hunter())
-                elif role_type == RoleType.IDIOT:
-                    roles.append(Idiot())
-        
-        random.shuffle(roles)
+        # Kept in config order for reset(), which re-deals the same role objects
+        self._deck = self._new_deck()
+        roles = list(self._deck)
+        self.rng.shuffle(roles)
         self.players = [Player(i+1, role) for i, role in enumerate(roles)]
+        self._build_indexes()
         
-        # Initialize Knowledge
-        for p in self.players:
-            p.initialize_knowledge(self.players, GAME_CONFIG)
-        
-        logger.info("Game Initialized with roles:")
+        # Initialize Knowledge from the config's cached priors
+        self.knowledge = knowledge_class(self.config).from_deal([ROLE_INDEX[r.role_type] for r in roles], self.config)
         for p in self.players:
-            logger.info(f"{p}")
+            p.attach_knowledge(self.knowledge)
+        self._emit_deal()
 
+    def _emit_deal(self):
+        if bus.listening:
+            bus.emit(EventType.GAME_START, len(self.players))
+            for p in self.players:
+                bus.emit(EventType.PLAYER_DEALT, p.id, ROLE_INDEX[p.role.role_type])
+
+    def reset(self, seed: Optional[object] = None):
+        """
+        Start a new game of the same config on this object: reseed the
+        stream and re-deal, reusing the players, role objects (reset in
+        place) and knowledge arrays instead of allocating new ones. Plays
+        exactly like WerewolfGame(rng=GameRNG(seed), config=self.config),
+        e.g. reset(GameRNG.seed_for_game(master_seed, i)) is game i of a run.
+        """
+        self.rng.reseed(seed)
+        self.day_count = 0
+        self.winner = None
+        self.sheriff = None
+        self.win_cause = None
+        self.death_order.clear()
+        self.sheriff_history.clear()
+        self.witch_saved = None
+        self.witch_poisoned = None
+
+        if self._deck is None:
+            # Restored from a snapshot: its roles may be mid-game objects of any deal
+            self._deck = self._new_deck()
+        for role in self._deck:
+            role.reset()
+        roles = list(self._deck)
+        self.rng.shuffle(roles)
+        for p, role in zip(self.players, roles):
+            p.role = role
+            p.is_alive = True
+            p.flags = 0
+        self._build_indexes()
+        self.knowledge.redeal([ROLE_INDEX[r.role_type] for r in roles], self.config)
+        self._emit_deal()
+
+
+
+    def snapshot(self) -> GameSnapshot:
+        """
+        Capture the current state. Take it between days: night deaths
+        returned by run_night are not part of the state until run_day.
+        """
+        return GameSnapshot(
+            self.config,
+            self.day_count,
+            self.winner,
+            self.sheriff.id if self.sheriff else None,
+            tuple(type(p.role) for p in self.players),
+            tuple(p.role.get_state() for p in self.players),
+            self.alive_mask,
+            tuple(p.flags for p in self.players),
+            self.knowledge.copy(),
+            (tuple(self.death_order), tuple(self.sheriff_history), self.witch_saved, self.witch_poisoned),
+        )
+
+    def fork(self, rng: Optional[GameRNG] = None) -> 'WerewolfGame':
+        """
+        Independent copy of this game, e.g. for counterfactual continuations.
+        The copy plays from `rng` (a fresh stream by default).
+        """
+        return WerewolfGame(self.snapshot(), rng)
+
+    def _restore(self, snapshot: GameSnapshot):
+        self.day_count = snapshot.day_count
+        self.winner = snapshot.winner
+        death_order, sheriff_history, self.witch_saved, self.witch_poisoned = snapshot.history
+        self.death_order = list(death_order)
+        self.sheriff_history = list(sheriff_history)
+        self.knowledge = snapshot.knowledge.copy()
+
+        players = []
+        for i, (role_cls, state, flags) in enumerate(zip(snapshot.role_classes, snapshot.role_states, snapshot.player_flags)):
+            role = role_cls()
+            role.set_state(state)
+            p = Player(i + 1, role)
+            p.is_alive = bool(snapshot.alive_mask >> i & 1)
+            p.flags = flags
+            p.attach_knowledge(self.knowledge)
+            players.append(p)
+        self.players = players
+        self.sheriff = players[snapshot.sheriff_id - 1] if snapshot.sheriff_id else None
+        self._build_indexes()
+
+    def _build_indexes(self):
+        role_masks = dict.fromkeys(ROLE_TYPES, 0)
+        by_role = {r: [] for r in ROLE_TYPES}
+        for p in self.players:
+            p.game = self
+            p.role.rng = self.rng
+            role_type = p.role.role_type
+            role_masks[role_type] |= 1 << (p.id - 1)
+            by_role[role_type].append(p)
+        self.role_masks = role_masks
+        self._players_by_role = by_role
+        self.alive_mask = sum(1 << (p.id - 1) for p in self.players if p.is_alive)
+        self.god_mask = ((1 << len(self.players)) - 1) & ~(
+            role_masks[RoleType.WEREWOLF] | role_masks[RoleType.VILLAGER])
+        self._alive_players = None
+        self._invalidate()
+
+    def _on_alive_change(self, player: Player):
+        """
+        Called by Player.die/revive.
+        """
+        bit = 1 << (player.id - 1)
+        if player.is_alive:
+            self.alive_mask |= bit
+            self.death_order.remove(player.id)
+        else:
+            self.alive_mask &= ~bit
+            self.death_order.append(player.id)
+        self._alive_players = None
+        self._invalidate()
 
+    def _invalidate(self):
+        if self._derived:
+            self._derived = {}
 
     def get_alive_players(self) -> List[Player]:
-        return [p for p in self.players if p.is_alive]
+        """
+        Alive players in id order. The list is shared until the next death, do not modify it.
+        """
+        if self._alive_players is None:
+            self._alive_players = [p for p in self.players if p.is_alive]
+        return self._alive_players
 
     def get_players_by_role(self, role_type: RoleType) -> List[Player]:
-        return [p for p in self.players if p.role.role_type == role_type]
+        return self._players_by_role[role_type]
 
     def check_win_condition(self) -> bool:
-        alive = self.get_alive_players()
-        wolves = [p for p in alive if p.role.role_type == RoleType.WEREWOLF]
-        villagers = [p for p in alive if p.role.role_type == RoleType.VILLAGER]
-        gods = [p for p in alive if p.role.role_type not in (RoleType.WEREWOLF, RoleType.VILLAGER)]
+        alive = self.alive_mask
         
-        if not wolves:
+        if not alive & self.role_masks[RoleType.WEREWOLF]:
             self.winner = "Good"
-            logger.info("Game Over! Winner: Good (All Wolves Dead)")
+            self.win_cause = WinCause.ALL_WOLVES_DEAD
+            if bus.listening: bus.emit(EventType.GAME_OVER, WINNER_CODES[self.winner], self.win_cause)
             return True
             
-        if not villagers:
+        if not alive & self.role_masks[RoleType.VILLAGER]:
             self.winner = "Werewolves"
-            logger.info("Game Over! Winner: Werewolves (All Villagers Dead - Slaughter)")
+            self.win_cause = WinCause.ALL_VILLAGERS_DEAD
+            if bus.listening: bus.emit(EventType.GAME_OVER, WINNER_CODES[self.winner], self.win_cause)
             return True
             
-        if not gods:
+        if not alive & self.god_mask:
             self.winner = "Werewolves"
-            logger.info("Game Over! Winner: Werewolves (All Gods Dead - Slaughter)")
+            self.win_cause = WinCause.ALL_GODS_DEAD
+            if bus.listening: bus.emit(EventType.GAME_OVER, WINNER_CODES[self.winner], self.win_cause)
             return True
             
         return False
 
-
     def run_night(self) -> Dict[Player, str]:
         self.day_count += 1
-        logger.info(f"\n--- Night {self.day_count} ---")
+        self._invalidate()
+        if bus.listening: bus.emit(EventType.NIGHT_START, self.day_count)
         
         # Dictionary to track night deaths {Player: Reason}
         deaths = {} 
         
         # 1. Werewolves Action
+        wolf_kill = self.run_wolves()
+        if wolf_kill:
+            deaths[wolf_kill] = "Wolf"
+
+        # 2. Seer Action
+        self.run_seer()
+
+        # 3. Witch Action
+        self.run_witch(deaths, wolf_kill)
+
+        return deaths
+
+    def run_wolves(self) -> Optional[Player]:
+        """
+        Wolves each pick a target; the most voted one (random among ties) is the night kill.
+        """
         wolves = self.get_players_by_role(RoleType.WEREWOLF)
         alive_wolves = [p for p in wolves if p.is_alive]
-        
-        if alive_wolves:
-            votes = {}
-            alive_players = self.get_alive_players()
-            
-            for wolf in alive_wolves:
-                # Delegate to Role
-                target = wolf.role.choose_kill_target(alive_players, wolf.knowledge_prob)
-                if target:
-                    votes[target] = votes.get(target, 0) + 1
-                    logger.debug(f"Wolf {wolf.id} votes for {target}")
+        if not alive_wolves:
+            return None
 
-            if votes:
-                max_votes = max(votes.values())
-                top_targets = [t for t, count in votes.items() if count == max_votes]
-                wolf_kill = random.choice(top_targets)
-                logger.info(f"Wolves decided to kill {wolf_kill} (Votes: {max_votes}/{len(alive_wolves)})")
-                deaths[wolf_kill] = "Wolf"
+        votes = {}
+        alive_players = self.get_alive_players()
+        # Wolves reading the shared public layer score every target alike
+        # (their own rows are zero, but they never target wolves), so the
+        # best targets are worked out once and each wolf only breaks the tie
+        shared_targets = None
 
-        # 2. Seer Action
+        for wolf in alive_wolves:
+            # Delegate to Role
+            if wolf.knowledge_prob.layer is None:
+                target = wolf.role.choose_kill_target(alive_players, wolf.knowledge_prob)
+            else:
+                if shared_targets is None:
+                    shared_targets = wolf.role.kill_candidates(alive_players, wolf.knowledge_prob)
+                target = wolf.role.rng.choice(shared_targets) if shared_targets else None
+            if target:
+                votes[target] = votes.get(target, 0) + 1
+                if bus.listening: bus.emit(EventType.WOLF_VOTE, wolf.id, target.id)
+
+        if not votes:
+            return None
+        max_votes = max(votes.values())
+        top_targets = [t for t, count in votes.items() if count == max_votes]
+        wolf_kill = self.rng.choice(top_targets)
+        if bus.listening: bus.emit(EventType.WOLF_KILL, wolf_kill.id, max_votes, len(alive_wolves))
+        return wolf_kill
+
+    def run_seer(self):
         seer_list = self.get_players_by_role(RoleType.SEER)
         seer = seer_list[0] if seer_list else None
         if seer and seer.is_alive and isinstance(seer.role, Seer):
@@ -111,13 +324,15 @@ class WerewolfGame:
             if check_target:
                 seer.role.checked_players.append(check_target.id)
                 is_wolf = check_target.role.role_type == RoleType.WEREWOLF
-                logger.info(f"Seer {seer.id} checked {check_target.id} ({check_target.role.name}). Valid: {is_wolf}")
+                if bus.listening: bus.emit(EventType.SEER_CHECK, seer.id, check_target.id, ROLE_INDEX[check_target.role.role_type], int(is_wolf))
                 
                 # Update info
-                fate = RoleType.WEREWOLF if is_wolf else RoleType.VILLAGER
-                seer.mark_role_certain(check_target.id, fate)
+                self.knowledge.record_check(seer.id, check_target.id, is_wolf)
 
-        # 3. Witch Action
+    def run_witch(self, deaths: Dict[Player, str], wolf_kill: Optional[Player]):
+        """
+        Witch saves the night kill or poisons someone, updating `deaths` in place.
+        """
         witch_list = self.get_players_by_role(RoleType.WITCH)
         witch = witch_list[0] if witch_list else None
         
@@ -126,10 +341,11 @@ class WerewolfGame:
             # Save Logic
             if wolf_kill and wolf_kill in deaths:
                 if witch.role.choose_save_decision(wolf_kill, witch.knowledge_prob):
-                    logger.info(f"Witch used antidote on {wolf_kill.id}")
+                    if bus.listening: bus.emit(EventType.WITCH_SAVE, witch.id, wolf_kill.id)
                     witch.role.use_antidote()
                     del deaths[wolf_kill]
                     wolf_kill.saved = True
+                    self.witch_saved = wolf_kill.id
                     used_drug = True
             
             # Poison Logic
@@ -137,52 +353,80 @@ class WerewolfGame:
             if not used_drug:
                 poison_target = witch.role.choose_poison_target(self, [p for p in self.get_alive_players() if p != witch], witch.knowledge_prob)
                 if poison_target:
-                    logger.info(f"Witch uses poison on Player {poison_target.id}")
+                    if bus.listening: bus.emit(EventType.WITCH_POISON, witch.id, poison_target.id)
                     witch.role.use_poison()
                     deaths[poison_target] = "Witch"
                     poison_target.poisoned = True
-
-
-        return deaths
+                    self.witch_poisoned = poison_target.id
 
 
     def run_day(self, night_deaths: Dict[Player, str]):
         # Day count matches the preceding night count
-        logger.info(f"\n--- Day {self.day_count} ---")
+        self._invalidate()
+        if bus.listening: bus.emit(EventType.DAY_START, self.day_count)
         
         # 1. Sheriff Election (Day 1 only if enabled)
-        if self.day_count == 1 and GAME_CONFIG.get("sheriff_enabled", False):
+        if self.day_count == 1 and self.config.get("sheriff_enabled", False):
             self.run_sheriff_election()
 
         # 2. Announce Deaths
-        current_deaths = []
-        if not night_deaths:
-            logger.info("平安夜 (No one died last night).")
-        else:
-            for p in night_deaths:
-                logger.info(f"Player {p.id} died last night.")
-                p.die()
-                current_deaths.append(p)
-            
-            # Transfer Sheriff if needed
-            for p in current_deaths:
-                self.handle_sheriff_death(p)
-                # Handle Role Death Actions (e.g. Hunter)
-                p.role.on_death(self, p)
-
-        if self.check_win_condition(): return
+        if self.handle_night_deaths(night_deaths): return
 
         # 3. Discussion (Simplified)
         # Verify Seer info sharing
         self.share_information()
 
-        # 4. Voting
+        # 4. Voting (an execution resolves its deaths and win check itself)
         self.run_voting_phase()
-        
-        self.check_win_condition()
+
+    def handle_night_deaths(self, night_deaths: Dict[Player, str]) -> bool:
+        """
+        Announce and resolve the night's deaths. Returns True if the game is over.
+        """
+        if not night_deaths:
+            if bus.listening: bus.emit(EventType.PEACEFUL_NIGHT)
+            return False
+        if bus.listening:
+            for p in night_deaths:
+                bus.emit(EventType.NIGHT_DEATH, p.id)
+        return self.resolve_deaths(list(night_deaths))
+
+    def resolve_deaths(self, dead: List[Player]) -> bool:
+        """
+        Kill `dead` (one round of simultaneous deaths) and resolve everything
+        that follows from a queue: each dead player's badge transfer, then
+        their death skill (Role.on_death), whose victims form a new round
+        resolved before the next player's turn (depth first, like a chain of
+        on_death calls). The win condition is checked after every round and
+        nothing more is resolved once the game is decided.
+        Returns True if the game is over.
+        """
+        pending: deque = deque()
+        while True:
+            if dead:
+                self._kill(dead)
+                if self.check_win_condition():
+                    return True
+                pending.extendleft(reversed(dead))
+            if not pending:
+                return False
+            p = pending.popleft()
+            self.handle_sheriff_death(p)
+            dead = p.role.on_death(self, p)
+
+    def _kill(self, players: List[Player]):
+        """
+        Player.die for a round of deaths, invalidating the derived state once.
+        """
+        for p in players:
+            p.is_alive = False
+            self.alive_mask &= ~(1 << (p.id - 1))
+            self.death_order.append(p.id)
+        self._alive_players = None
+        self._invalidate()
 
     def run_sheriff_election(self):
-        logger.info("Running Sheriff Election...")
+        if bus.listening: bus.emit(EventType.ELECTION_START)
         alive_players = self.get_alive_players()
         
         # 1. Identify Candidates
@@ -190,16 +434,17 @@ class WerewolfGame:
         for p in alive_players:
             if p.role.sheriff_candidacy_prob > 0.5:
                 candidates.append(p)
-                logger.info(f"Player {p.id} ({p.role.name}) runs for Sheriff.")
+                if bus.listening: bus.emit(EventType.CANDIDATE, p.id, ROLE_INDEX[p.role.role_type])
         
         if not candidates:
-            logger.info("No candidates for Sheriff.")
+            if bus.listening: bus.emit(EventType.NO_CANDIDATES)
             return
 
         # 2. Candidates Share Information
-        logger.info("Candidates share information:")
+        if bus.listening: bus.emit(EventType.CANDIDATES_SHARE)
         for c in candidates:
             c.role.share_information(c, self.players)
+        self._invalidate()
             
         # 3. Vote / Elect
         # Prompt: "最后预言家当选警长" (Seer wins)
@@ -207,19 +452,23 @@ class WerewolfGame:
         seers = [p for p in candidates if p.role.role_type == RoleType.SEER]
         
         if seers:
-            self.sheriff = random.choice(seers)
+            self.sheriff = self.rng.choice(seers)
         else:
             # If Seer is not running (dead?), pick random candidate or Witch?
             # Default to random candidate if Seer dead
-            self.sheriff = random.choice(candidates)
+            self.sheriff = self.rng.choice(candidates)
             
         self.sheriff.sheriff = True
-        logger.info(f"Sheriff is Player {self.sheriff.id} ({self.sheriff.role.name})")
+        self.sheriff_history.append(self.sheriff.id)
+        self._invalidate()
+        if bus.listening: bus.emit(EventType.SHERIFF_ELECTED, self.sheriff.id, ROLE_INDEX[self.sheriff.role.role_type])
 
     def share_information(self):
         # Delegate to roles
         for p in self.get_alive_players():
             p.role.share_information(p, self.players)
+        # Claims and badge flow announcements change the derived state
+        self._invalidate()
 
     
     def run_voting_phase(self):
@@ -231,42 +480,8 @@ class WerewolfGame:
         # Wolves vote together for a good guy (usually one with 'strongest' info or random)
         # Good guys vote for confirmed wolves or random suspects
         
-        wolves = [p for p in candidates if p.role.role_type == RoleType.WEREWOLF]
-        good = [p for p in candidates if p.role.role_type != RoleType.WEREWOLF]
-        
-        # Decide Targets
-        wolf_target = None
-        if good:
-             wolf_target = random.choice(good)
-            
-        confirmed_wolves = []
-        seers = self.get_players_by_role(RoleType.SEER)
-        if seers and seers[0].is_alive:
-            for pid, probs in seers[0].knowledge_prob.items():
-                 # Check for Wolf certainty
-                 if probs.get(RoleType.WEREWOLF, 0) >= 0.99:
-                    # Find alive player
-                     for p in candidates:
-                         if p.id == pid:
-                             confirmed_wolves.append(p)
-        
         # --- Identify "Leader" for Good Team Voting Coordination ---
-        leader = None
-        seer = seers[0] if seers and seers[0].is_alive else None
-        
-        # Check if Seer is "Known" (Publicly Revealed)
-        # We check if at least one Good player (other than Seer) knows the Seer
-        seer_known = False
-        if seer:
-            for p in good:
-                if p != seer and p.knowledge_prob.get(seer.id, {}).get(RoleType.SEER, 0.0) >= 0.99:
-                    seer_known = True
-                    break
-        
-        if seer and seer_known:
-             leader = seer
-        elif self.sheriff and self.sheriff.is_alive:
-             leader = self.sheriff
+        leader = self.get_voting_leader()
              
         # Get Leader's Suggestion
         leader_suggestion = None
@@ -274,42 +489,40 @@ class WerewolfGame:
             # Leader votes based on their own knowledge, without a suggestion (None)
             leader_suggestion = leader.role.vote(self, candidates, leader.knowledge_prob, leader)
             if leader_suggestion:
-                logger.info(f"Voting Leader {leader.id} ({leader.role.name}) suggests voting for Player {leader_suggestion.id}")
+                if bus.listening: bus.emit(EventType.VOTE_SUGGESTION, leader.id, ROLE_INDEX[leader.role.role_type], leader_suggestion.id)
 
         # Cast Votes
+        sheriff_weight = self.config.get("sheriff_vote_weight", 1.5)
         for voter in candidates:
-            # Candidates to vote FOR (usually anyone alive)
-            valid_targets = [p for p in candidates] # Everyone is a valid target
-            
-            # Delegate to Role
+            # Delegate to Role; everyone alive is a valid target (roles don't modify the list)
             # Pass leader_suggestion to all voters
             # Roles decide whether to follow (Good roles usually follow, Wolves/Seer/Sheriff might differentiate)
-            vote_target = voter.role.vote(self, valid_targets, voter.knowledge_prob, voter, leader_suggestion)
+            vote_target = voter.role.vote(self, candidates, voter.knowledge_prob, voter, leader_suggestion)
             
             # Fallback if None (e.g. no info)? Random other
             if not vote_target:
                  others = [p for p in candidates if p != voter]
                  if others:
-                     vote_target = random.choice(others)
+                     vote_target = self.rng.choice(others)
 
             
             if vote_target:
-                # Sheriff vote counts as 1.5 or 2? Standard is 1.5, allow config or assume 1.5
-                weight = 1.5 if voter.sheriff else 1.0
+                # Sheriff vote counts as 1.5 by default (config "sheriff_vote_weight")
+                weight = sheriff_weight if voter.sheriff else 1.0
                 votes[vote_target] = votes.get(vote_target, 0) + weight
-                logger.info(f"Player {voter.id} votes -> {vote_target.id}")
+                if bus.listening: bus.emit(EventType.VOTE_CAST, voter.id, vote_target.id)
 
         # Tally
         if votes:
-            # Log vote counts
-            vote_details = ", ".join([f"Player {p.id}: {c}" for p, c in votes.items()])
-            logger.info(f"Vote Counts: {vote_details}")
+            # Report vote counts (in half votes, the Sheriff counts 1.5)
+            if bus.listening:
+                bus.emit(EventType.VOTE_COUNTS, *[f for p, c in votes.items() for f in (p.id, int(c * 2))])
             
             max_votes = max(votes.values())
             executed_candidates = [p for p, c in votes.items() if c == max_votes]
-            executed = random.choice(executed_candidates)
+            executed = self.rng.choice(executed_candidates)
             
-            logger.info(f"Voting Result: Player {executed.id} is executed!")
+            if bus.listening: bus.emit(EventType.EXECUTED, executed.id)
             
             # Delegate execution handling to Role (e.g. Idiot check)
             executed.role.handle_vote_execution(self, executed)
@@ -318,8 +531,9 @@ class WerewolfGame:
         if self.sheriff != dead_player:
             return
             
-        logger.info(f"Sheriff {dead_player.id} died. Transferring badge...")
+        if bus.listening: bus.emit(EventType.SHERIFF_DIED, dead_player.id)
         self.sheriff.sheriff = False
+        self._invalidate()
         
         candidates = self.get_alive_players()
         if not candidates:
@@ -331,18 +545,63 @@ class WerewolfGame:
         if next_sheriff:
             self.sheriff = next_sheriff
             self.sheriff.sheriff = True
-            logger.info(f"New Sheriff is Player {self.sheriff.id}")
+            self.sheriff_history.append(self.sheriff.id)
+            self._invalidate()
+            if bus.listening: bus.emit(EventType.SHERIFF_TRANSFER, self.sheriff.id)
         else:
-             self.sheriff = None
+            self.sheriff = None
+            # choose_successor may have revealed the badge flow target
+            self._invalidate()
 
     def get_badge_flow_target(self) -> Optional[int]:
         """
         Find the current Seer and return their badge flow target.
         Only valid if the Seer is alive and is the Sheriff.
         """
-        for p in self.players:
-            if p.role.role_type == RoleType.SEER and p.is_alive and p.sheriff:
-                return getattr(p.role, 'badge_flow_target', None)
-        return None
-
+        derived = self._derived
+        if "badge_flow_target" not in derived:
+            target = None
+            for p in self._players_by_role[RoleType.SEER]:
+                if p.is_alive and p.sheriff:
+                    target = getattr(p.role, 'badge_flow_target', None)
+                    break
+            derived["badge_flow_target"] = target
+        return derived["badge_flow_target"]
 
+    def get_suspects(self, layer: int, skip_id: Optional[int]) -> SuspectRanking:
+        """
+        Alive players (except skip_id) ranked by public layer `layer`'s wolf
+        probability, for Role.vote.
+        """
+        key = ("suspects", layer, skip_id)
+        derived = self._derived
+        ranking = derived.get(key)
+        if ranking is None:
+            wolf_probs = self.knowledge.public[layer, :, ROLE_INDEX[RoleType.WEREWOLF]].tolist()
+            candidates = [p for p in self.get_alive_players() if p.id != skip_id]
+            ranking = derived[key] = SuspectRanking(candidates, wolf_probs)
+        return ranking
+
+    def get_voting_leader(self) -> Optional[Player]:
+        """
+        Player whose vote the good team follows: the Seer once publicly known
+        (at least one other good player is certain of them), else the Sheriff.
+        """
+        derived = self._derived
+        if "leader" not in derived:
+            seers = self._players_by_role[RoleType.SEER]
+            seer = seers[0] if seers and seers[0].is_alive else None
+            
+            seer_known = False
+            if seer:
+                seer_probs = self.knowledge.column(seer.id, RoleType.SEER)
+                seer_known = any(seer_probs[p.id - 1] >= 0.99 for p in self.get_alive_players()
+                                 if p != seer and p.role.role_type != RoleType.WEREWOLF)
+            
+            leader = None
+            if seer and seer_known:
+                leader = seer
+            elif self.sheriff and self.sheriff.is_alive:
+                leader = self.sheriff
+            derived["leader"] = leader
+        return derived["leader"]
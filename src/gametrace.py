@@ -0,0 +1,175 @@
+import os
+from typing import Iterator, List, Tuple
+from events import EventType, Listener
+
+# Compact binary game traces. A trace file is
+#
+#   MAGIC, then per game: varint master seed, varint game index,
+#                         varint config id, varint byte length, events
+#
+# and an event is varint type, then its fields as varints. Types with a
+# fixed number of fields (EVENT_FIELDS) store just the fields; the others
+# (VOTE_COUNTS) store a varint count first. Every field is a non-negative
+# int below 128 in practice, so most events take 2-4 bytes.
+# Bumped whenever an event's fields change, so old traces are rejected instead of misread
+MAGIC = b"WWTRACE2"
+
+# Fields per event type (see EventType); None = variable, count stored
+EVENT_FIELDS = {
+    EventType.GAME_START: 1,
+    EventType.PLAYER_DEALT: 2,
+    EventType.NIGHT_START: 1,
+    EventType.WOLF_VOTE: 2,
+    EventType.WOLF_KILL: 3,
+    EventType.SEER_CHECK: 4,
+    EventType.WITCH_SAVE: 2,
+    EventType.WITCH_POISON: 2,
+    EventType.DAY_START: 1,
+    EventType.PEACEFUL_NIGHT: 0,
+    EventType.NIGHT_DEATH: 1,
+    EventType.ELECTION_START: 0,
+    EventType.CANDIDATE: 2,
+    EventType.NO_CANDIDATES: 0,
+    EventType.CANDIDATES_SHARE: 0,
+    EventType.SHERIFF_ELECTED: 2,
+    EventType.SEER_CLAIM: 3,
+    EventType.BADGE_FLOW: 2,
+    EventType.SILVER_WATER: 2,
+    EventType.HUNTER_REVEAL: 2,
+    EventType.HUNTER_SKILL: 1,
+    EventType.HUNTER_SHOT: 3,
+    EventType.VOTE_SUGGESTION: 3,
+    EventType.VOTE_CAST: 2,
+    EventType.VOTE_COUNTS: None,
+    EventType.EXECUTED: 1,
+    EventType.IDIOT_FLIP: 1,
+    EventType.SHERIFF_DIED: 1,
+    EventType.SHERIFF_TRANSFER: 1,
+    EventType.BADGE_FLOW_REVEAL: 2,
+    EventType.GAME_OVER: 2,
+}
+
+
+def write_varint(out: bytearray, value: int):
+    """
+    Unsigned LEB128: 7 bits per byte, high bit set on all but the last.
+    """
+    if value < 0:
+        raise ValueError(f"Trace fields must be non-negative, got {value}")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """
+    (value, position after it)
+    """
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class TraceRecorder:
+    """
+    Event bus listener that encodes one game's events into `data`.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.events = 0
+
+    def __call__(self, event_type: EventType, fields: Tuple[int, ...]):
+        out = self.data
+        write_varint(out, event_type)
+        if EVENT_FIELDS[event_type] is None:
+            write_varint(out, len(fields))
+        elif len(fields) != EVENT_FIELDS[event_type]:
+            raise ValueError(f"{event_type.name} has {EVENT_FIELDS[event_type]} fields, got {len(fields)}")
+        for value in fields:
+            write_varint(out, value)
+        self.events += 1
+
+
+def iter_events(data: bytes) -> Iterator[Tuple[EventType, Tuple[int, ...]]]:
+    """
+    Decode the events of one game.
+    """
+    pos = 0
+    while pos < len(data):
+        code, pos = read_varint(data, pos)
+        event_type = EventType(code)
+        count = EVENT_FIELDS[event_type]
+        if count is None:
+            count, pos = read_varint(data, pos)
+        fields = []
+        for _ in range(count):
+            value, pos = read_varint(data, pos)
+            fields.append(value)
+        yield event_type, tuple(fields)
+
+
+def replay_events(data: bytes, listener: Listener):
+    """
+    Feed a stored game to a listener (e.g. events.EventLogger) as if it were being played.
+    """
+    for event_type, fields in iter_events(data):
+        listener(event_type, fields)
+
+
+class TraceWriter:
+    """
+    Appends games to a trace file (created with its header if missing).
+    An existing file must already be a trace of this format.
+    """
+
+    def __init__(self, path: str):
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new:
+            with open(path, "rb") as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    raise ValueError(f"{path} is not a {MAGIC.decode()} game trace, not appending to it")
+        self.file = open(path, "ab")
+        if new:
+            self.file.write(MAGIC)
+
+    def write_game(self, master_seed: int, game_index: int, data: bytes, config_id: int = 0):
+        header = bytearray()
+        for value in (master_seed, game_index, config_id, len(data)):
+            write_varint(header, value)
+        self.file.write(bytes(header) + bytes(data))
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self) -> 'TraceWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_trace(path: str) -> List[Tuple[int, int, int, bytes]]:
+    """
+    (master seed, game index, config id, encoded events) for every game in a trace file.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a game trace")
+    games = []
+    pos = len(MAGIC)
+    while pos < len(data):
+        seed, pos = read_varint(data, pos)
+        game, pos = read_varint(data, pos)
+        config_id, pos = read_varint(data, pos)
+        length, pos = read_varint(data, pos)
+        games.append((seed, game, config_id, data[pos:pos + length]))
+        pos += length
+    return games
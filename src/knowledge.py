@@ -0,0 +1,398 @@
+import functools
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import numpy as np
+from config import RoleType
+
+# Role ids used as the last axis of knowledge arrays follow the RoleType declaration order
+ROLE_TYPES = list(RoleType)
+ROLE_INDEX = {r: i for i, r in enumerate(ROLE_TYPES)}
+NUM_ROLES = len(ROLE_TYPES)
+
+CERTAIN = 0.99
+
+_WOLF = ROLE_INDEX[RoleType.WEREWOLF]
+# Announcement kinds (KnowledgeMatrix._announced keys)
+_MARKED, _RULED_OUT = 0, 1
+# Private rows of a listener that has none
+_NO_ROWS = MappingProxyType({})
+_ONEHOT = np.eye(NUM_ROLES)
+_ONEHOT.flags.writeable = False
+
+
+@functools.lru_cache(maxsize=None)
+def _prior_table(role_counts: Tuple[Tuple[int, int], ...]) -> np.ndarray:
+    counts = np.zeros(NUM_ROLES)
+    for r, c in role_counts:
+        counts[r] += c
+    table = np.zeros((NUM_ROLES, NUM_ROLES))
+    for r in range(NUM_ROLES):
+        # Good players see the full deck minus their own card, wolves see the
+        # non-wolf deck (their teammates are known)
+        pool = counts.copy()
+        if r == _WOLF:
+            pool[_WOLF] = 0
+        elif pool[r] > 0:
+            pool[r] -= 1
+        if pool.sum() > 0:
+            table[r] = pool / pool.sum()
+    table.flags.writeable = False
+    return table
+
+
+def prior_table(config: Dict) -> np.ndarray:
+    """
+    Prior role distribution of an unknown player, by the listener's own role:
+    row ROLE_INDEX[own role], indexed by ROLE_INDEX. Computed once per
+    role_counts and shared read-only.
+    """
+    return _prior_table(tuple((ROLE_INDEX[r], c) for r, c in config["role_counts"].items()))
+
+
+class KnowledgeMatrix:
+    """
+    Beliefs of every player about every other player for one game, in two
+    layers:
+
+    - public[c, t]: what a listener whose own role is c believes about
+      target t from the deal and public announcements alone. Listeners of
+      the same role start from the same prior and hear the same claims, so
+      one (roles x targets x roles) array serves them all and an
+      announcement is applied once per role, not once per player.
+    - private[seat]: {target seat: row} for the few pairs a listener knows
+      more about (the Seer's checks), only for listeners that have any. A private row replaces the public one
+      and public announcements about that target are applied to it too.
+
+    Player ids are 1-based; seat = id - 1. A player's beliefs about themself
+    are always zero. `probs` materialises the full (listeners x targets x
+    roles) array when one is needed.
+
+    Every write that changes what anyone believes about a target bumps
+    versions[target] and appends the target to `journal`, so listeners can
+    follow changes incrementally. announce_certain/announce_ruled_out keep
+    a record of the announcements already applied and skip those still
+    current (nothing written about the target since), which leaves the
+    beliefs exactly as re-applying them would.
+    """
+
+    def __init__(self, roles: Sequence[int], priors: np.ndarray):
+        self.num_players = len(roles)
+        # Listener seat -> own role index (the public layer it reads)
+        self.roles = np.asarray(roles)
+        self.public = np.repeat(priors[:, None, :], self.num_players, axis=1)
+        self.private: Dict[int, Dict[int, np.ndarray]] = {}
+        # Target seat -> seats holding a private row about it (targets with any)
+        self._holders: Dict[int, Set[int]] = {}
+        self.versions = [0] * self.num_players
+        # Target seats in write order
+        self.journal: List[int] = []
+        # Announcement (see _announcement_key) -> versions[target] right after it
+        self._announced: Dict[int, int] = {}
+
+    @classmethod
+    def from_deal(cls, roles: Sequence[int], config: Dict) -> 'KnowledgeMatrix':
+        """
+        Opening beliefs of a dealt game (roles[seat] = role index): every
+        listener starts from the shared prior for their role, wolves know
+        each other.
+        """
+        matrix = cls(roles, prior_table(config))
+        matrix.public[_WOLF, matrix.roles == _WOLF] = _ONEHOT[_WOLF]
+        return matrix
+
+    def redeal(self, roles: Sequence[int], config: Dict):
+        """
+        from_deal in place, for a new deal at the same table (WerewolfGame.reset).
+        """
+        # A new array: copies (snapshots) share `roles` with this matrix
+        self.roles = np.asarray(roles)
+        self.public[...] = prior_table(config)[:, None, :]
+        self.public[_WOLF, self.roles == _WOLF] = _ONEHOT[_WOLF]
+        self.private.clear()
+        self._holders.clear()
+        self.versions[:] = [0] * self.num_players
+        self.journal.clear()
+        self._announced.clear()
+
+    def copy(self) -> 'KnowledgeMatrix':
+        matrix = type(self).__new__(type(self))
+        matrix.num_players = self.num_players
+        matrix.roles = self.roles
+        matrix.public = self.public.copy()
+        matrix.private = {seat: {t: row.copy() for t, row in rows.items()} for seat, rows in self.private.items()}
+        matrix._holders = {t: set(h) for t, h in self._holders.items()}
+        matrix.versions = self.versions.copy()
+        matrix.journal = self.journal.copy()
+        matrix._announced = self._announced.copy()
+        return matrix
+
+    def view(self, player_id: int) -> 'KnowledgeView':
+        return KnowledgeView(self, player_id - 1)
+
+    @property
+    def probs(self) -> np.ndarray:
+        """
+        Full (listeners x targets x roles) array of the combined beliefs (a new array).
+        """
+        probs = self.public[self.roles]
+        for seat, rows in self.private.items():
+            for t, row in rows.items():
+                probs[seat, t] = row
+        seats = np.arange(self.num_players)
+        probs[seats, seats] = 0.0
+        return probs
+
+    def column(self, target_id: int, role: RoleType) -> np.ndarray:
+        """
+        Every listener's probability that target has `role`, indexed by listener seat.
+        """
+        t = target_id - 1
+        r = ROLE_INDEX[role]
+        col = self.public[self.roles, t, r]
+        for seat in self._holders.get(t, ()):
+            col[seat] = self.private[seat][t][r]
+        col[t] = 0.0
+        return col
+
+    def listener_rows(self, seat: int) -> np.ndarray:
+        """
+        One listener's combined beliefs about every target (targets x roles, a new array).
+        """
+        rows = self.public[self.roles[seat]].copy()
+        for t, row in self.private.get(seat, _NO_ROWS).items():
+            rows[t] = row
+        rows[seat] = 0.0
+        return rows
+
+    def _touch(self, seats: Iterable[int]):
+        versions = self.versions
+        for t in seats:
+            versions[t] += 1
+            self.journal.append(t)
+
+    # --- Single listener updates (private layer) ---
+
+    def reset_listener(self, listener_id: int):
+        """
+        Drop a listener's private rows, back to the public beliefs for their role.
+        """
+        seat = listener_id - 1
+        rows = self.private.pop(seat, ())
+        for t in rows:
+            holders = self._holders[t]
+            holders.discard(seat)
+            if not holders:
+                del self._holders[t]
+        self._touch(rows)
+
+    def _private_row(self, seat: int, t: int) -> np.ndarray:
+        rows = self.private.get(seat)
+        if rows is None:
+            rows = self.private[seat] = {}
+        row = rows.get(t)
+        if row is None:
+            row = rows[t] = self.public[self.roles[seat], t].copy()
+            self._holders.setdefault(t, set()).add(seat)
+        return row
+
+    def mark_certain(self, listener_id: int, target_id: int, role: RoleType):
+        """
+        Set target's role probability to 1.0 for the specified role, 0.0 for others.
+        """
+        if listener_id == target_id:
+            return
+        self._private_row(listener_id - 1, target_id - 1)[...] = _ONEHOT[ROLE_INDEX[role]]
+        self._touch((target_id - 1,))
+
+    def rule_out(self, listener_id: int, target_id: int, role: RoleType):
+        """
+        Set target's specified role probability to 0.0 and renormalise the rest.
+        Ruling out the only possibility (a contradiction) just zeroes it.
+        """
+        seat, t = listener_id - 1, target_id - 1
+        if seat == t:
+            return
+        r = ROLE_INDEX[role]
+        row = self.private.get(seat, _NO_ROWS).get(t)
+        p = (row if row is not None else self.public[self.roles[seat], t])[r]
+        if p == 0:
+            return
+        row = self._private_row(seat, t)
+        row[r] = 0.0
+        if p < 0.999:
+            row /= row.sum()
+        self._touch((t,))
+
+    def record_check(self, listener_id: int, target_id: int, is_wolf: bool):
+        """
+        A Seer's check: the target is a wolf, or good (gold water), which the
+        Seer takes for a villager.
+        """
+        self.mark_certain(listener_id, target_id, RoleType.WEREWOLF if is_wolf else RoleType.VILLAGER)
+
+    # --- Public announcements (common knowledge, all listeners at once) ---
+
+    def mark_certain_all(self, target_ids: Iterable[int], role: RoleType):
+        """
+        Every player marks each target as certainly having `role`.
+        """
+        seats = [t - 1 for t in target_ids]
+        if not seats:
+            return
+        self.public[:, seats] = _ONEHOT[ROLE_INDEX[role]]
+        # Private rows about these targets now say the same as the public one
+        for t in seats:
+            for seat in self._holders.pop(t, ()):
+                rows = self.private[seat]
+                del rows[t]
+                if not rows:
+                    del self.private[seat]
+        self._touch(seats)
+
+    def rule_out_all(self, target_ids: Iterable[int], role: RoleType):
+        """
+        Every player rules out `role` for each target, renormalising proportionally.
+        """
+        seats = [t - 1 for t in target_ids]
+        if not seats:
+            return
+        r = ROLE_INDEX[role]
+        # A single target is a view, updated in place; several are a copy written back
+        index = seats[0] if len(seats) == 1 else seats
+        rows = self.public[:, index]
+        p = rows[..., r].copy()
+        # A rule-out that every listener already agrees with is not a write
+        changed = bool(p.any())
+        if changed:
+            rows[..., r] = 0.0
+            partial = (p > 0) & (p < 0.999)
+            rows[partial] /= rows[partial].sum(axis=-1, keepdims=True)
+            self.public[:, index] = rows
+        for t in seats:
+            for seat in self._holders.get(t, ()):
+                row = self.private[seat][t]
+                p = row[r]
+                if p == 0:
+                    continue
+                row[r] = 0.0
+                if p < 0.999:
+                    row /= row.sum()
+                changed = True
+        if changed:
+            self._touch(seats)
+
+    # --- Announcements (public updates that roles repeat every day) ---
+
+    @staticmethod
+    def _announcement_key(kind: int, r: int, t: int) -> int:
+        # A small int rather than a tuple: the record is copied with every snapshot
+        return (t * NUM_ROLES + r) * 2 + kind
+
+    def _fresh(self, kind: int, target_ids: Iterable[int], role: RoleType) -> List[int]:
+        r = ROLE_INDEX[role]
+        announced, versions, key = self._announced, self.versions, self._announcement_key
+        return [t for t in target_ids if announced.get(key(kind, r, t - 1)) != versions[t - 1]]
+
+    def _record(self, kind: int, target_ids: List[int], role: RoleType):
+        r = ROLE_INDEX[role]
+        for t in target_ids:
+            self._announced[self._announcement_key(kind, r, t - 1)] = self.versions[t - 1]
+
+    def announce_certain(self, target_ids: Iterable[int], role: RoleType):
+        """
+        mark_certain_all for the targets this announcement hasn't been
+        applied to since their beliefs last changed.
+        """
+        fresh = self._fresh(_MARKED, target_ids, role)
+        if fresh:
+            self.mark_certain_all(fresh, role)
+            self._record(_MARKED, fresh, role)
+
+    def announce_ruled_out(self, target_ids: Iterable[int], role: RoleType):
+        """
+        rule_out_all for the targets this announcement hasn't been applied
+        to since their beliefs last changed.
+        """
+        fresh = self._fresh(_RULED_OUT, target_ids, role)
+        if fresh:
+            self.rule_out_all(fresh, role)
+            self._record(_RULED_OUT, fresh, role)
+
+
+_ZERO_ROW = np.zeros(NUM_ROLES)
+_ZERO_ROW.flags.writeable = False
+
+
+class KnowledgeView:
+    """
+    One player's beliefs: a read-only window on the game's KnowledgeMatrix
+    (their private rows over the public layer for their role), handed to
+    role strategies as `knowledge_prob`.
+    """
+
+    def __init__(self, matrix: KnowledgeMatrix, seat: int):
+        self.matrix = matrix
+        self.seat = seat
+
+    @property
+    def layer(self) -> Optional[int]:
+        """
+        The public layer (listener role index) this player's beliefs are,
+        apart from their own zero row; None once they hold private rows.
+        """
+        if self.seat in self.matrix.private:
+            return None
+        return int(self.matrix.roles[self.seat])
+
+    def prob(self, target_id: int, role: RoleType) -> float:
+        return float(self.row(target_id)[ROLE_INDEX[role]])
+
+    def row(self, target_id: int) -> np.ndarray:
+        """
+        Role distribution of one target, indexed by ROLE_INDEX.
+        """
+        t = target_id - 1
+        if t == self.seat:
+            return _ZERO_ROW
+        matrix = self.matrix
+        row = matrix.private.get(self.seat, _NO_ROWS).get(t)
+        return row if row is not None else matrix.public[matrix.roles[self.seat], t]
+
+    def probs(self, role: RoleType) -> List[float]:
+        """
+        Probability of `role` for every target, indexed by seat (target id - 1).
+        """
+        matrix = self.matrix
+        r = ROLE_INDEX[role]
+        values = matrix.public[matrix.roles[self.seat], :, r].tolist()
+        for t, row in matrix.private.get(self.seat, _NO_ROWS).items():
+            values[t] = float(row[r])
+        values[self.seat] = 0.0
+        return values
+
+    def weighted(self, weights: np.ndarray) -> List[float]:
+        """
+        Role distribution of every target dotted with per-role weights, indexed by seat.
+        """
+        return (self.matrix.listener_rows(self.seat) @ weights).tolist()
+
+    def certain_role(self, target_id: int) -> Optional[RoleType]:
+        row = self.row(target_id)
+        r = int(row.argmax())
+        return ROLE_TYPES[r] if row[r] >= CERTAIN else None
+
+    def certain_roles(self) -> List[Tuple[int, RoleType]]:
+        """
+        (target id, role) for every target whose role this player is certain of, in id order.
+        """
+        seats, roles = np.nonzero(self.matrix.listener_rows(self.seat) >= CERTAIN)
+        return [(int(s) + 1, ROLE_TYPES[r]) for s, r in zip(seats, roles)]
+
+    def to_dict(self) -> Dict[int, Dict[RoleType, float]]:
+        """
+        Old dict-of-dicts form ({target id: {role: prob}}), handy in notebooks.
+        """
+        return {
+            t + 1: {ROLE_TYPES[r]: float(p) for r, p in enumerate(row) if p > 0}
+            for t, row in enumerate(self.matrix.listener_rows(self.seat)) if t != self.seat
+        }
@@ -1,42 +1,126 @@
 import argparse
 import logging
+import random
+from utils import logger, parse_duration, parse_seed
+from runner import run_simulation, run_until, default_workers, DEFAULT_CHUNK_SIZE, BATCH_CHUNK_SIZE, ENGINES, RunSummary
+from stats import wilson_interval
 from game import WerewolfGame
-from utils import logger
+from rng import GameRNG
+from config import GAME_CONFIG, scaled_role_counts
+from store import ResultsWriter
+from profiler import PhaseProfiler
+from events import bus, EventLogger
+from checkpoint import Checkpoint, Checkpointer, load_checkpoint, DEFAULT_CHECKPOINT_EVERY
 
-def run_simulation():
-    game = WerewolfGame()
-    while not game.winner:
-        night_deaths = game.run_night()
-        game.run_day(night_deaths)
-        if game.winner:
-            return game.winner
-    return game.winner
+# Arguments a checkpoint stores and --resume restores
+RUN_SETTINGS = ("num_games", "seed", "engine", "chunk_size", "target_ci", "time_budget", "records")
+
+def print_report(summary: RunSummary):
+    print("\n--- Benchmark Results ---")
+    for faction, wins in summary.results.items():
+        percentage = (wins / summary.games) * 100
+        lo, hi = wilson_interval(wins, summary.games)
+        print(f"{faction}: {wins} wins ({percentage:.2f}%, 95% CI {lo * 100:.2f}% - {hi * 100:.2f}%, ±{(hi - lo) * 50:.2f}%)")
+    print(f"Games: {summary.games} in {summary.elapsed:.2f}s ({summary.games_per_sec:.0f} games/sec)")
 
 def main():
     parser = argparse.ArgumentParser(description="Werewolf Simulator benchmark tool")
-    parser.add_argument("-n", "--num_games", type=int, default=1, help="Number of games to simulate")
+    parser.add_argument("-n", "--num_games", type=int, default=1, help="Number of games to simulate (upper bound with --target-ci / --time-budget)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help=f"Number of worker processes (0 = all {default_workers()} cores)")
+    parser.add_argument("-s", "--seed", type=parse_seed, default=None, help="Master seed. Same seed gives the same results whatever the worker count")
+    parser.add_argument("--chunk-size", type=int, default=None, help=f"Games per work unit (default {DEFAULT_CHUNK_SIZE}, {BATCH_CHUNK_SIZE} for the batch engine)")
+    parser.add_argument("-e", "--engine", choices=ENGINES, default="object", help="object: one WerewolfGame at a time; batch: NumPy engine playing whole chunks in lockstep")
+    parser.add_argument("--target-ci", type=float, default=None, help="Stop once every faction's 95%% interval is within ± this (e.g. 0.005)")
+    parser.add_argument("--time-budget", type=parse_duration, default=None, help="Run as many games as fit in this time (e.g. 30s, 2m)")
+    parser.add_argument("--records", default=None, help="Append every game's record to this columnar results directory (read with store.open_results)")
+    parser.add_argument("--profile", nargs="?", const="profile.folded", default=None, metavar="FILE",
+                        help="Time each phase and role method and track its net change in live memory blocks (in-process, object engine); collapsed stacks for flame graphs go to FILE (default profile.folded)")
+    parser.add_argument("--players", type=int, default=None, help="Table size, with role counts scaled from the default 12-player table")
+    parser.add_argument("--checkpoint", default=None, metavar="FILE", help="Save the run's progress (results, next game index, settings) to FILE periodically")
+    parser.add_argument("--checkpoint-every", type=parse_duration, default=DEFAULT_CHECKPOINT_EVERY,
+                        help=f"Time between checkpoints (default {DEFAULT_CHECKPOINT_EVERY:.0f}s)")
+    parser.add_argument("--resume", action="store_true", help="Continue the run saved in --checkpoint with its own settings (only -w and --profile still apply)")
     args = parser.parse_args()
+    config = GAME_CONFIG
+    if args.players:
+        config = {**GAME_CONFIG, "role_counts": scaled_role_counts(args.players)}
+    resume = None
+    if args.resume:
+        if not args.checkpoint:
+            parser.error("--resume needs --checkpoint FILE")
+        resume = load_checkpoint(args.checkpoint)
+        vars(args).update(resume.settings)
+        config = resume.config
+    if args.profile and args.engine != "object":
+        parser.error("--profile instruments the object engine only")
 
-    if args.num_games > 1:
+    adaptive = args.target_ci is not None or args.time_budget is not None
+    if args.num_games > 1 or adaptive:
         # Suppress logs for benchmarking
         logger.setLevel(logging.WARNING)
-        print(f"Running {args.num_games} games...")
-        
-        results = {}
-        for i in range(args.num_games):
-            if i % 10 == 0:
-                print(f"\rProgress: {i}/{args.num_games}", end="", flush=True)
-            winner = run_simulation()
-            results[winner] = results.get(winner, 0) + 1
-        
-        print(f"\rProgress: {args.num_games}/{args.num_games}")
-        print("\n--- Benchmark Results ---")
-        for faction, wins in results.items():
-            percentage = (wins / args.num_games) * 100
-            print(f"{faction}: {wins} wins ({percentage:.2f}%)")
+        workers = args.workers if args.workers > 0 else default_workers()
+        if args.profile:
+            # Counters live in this process
+            workers = 1
+        seed = args.seed if args.seed is not None else random.SystemRandom().getrandbits(31)
+        chunk_size = args.chunk_size or (BATCH_CHUNK_SIZE if args.engine == "batch" else DEFAULT_CHUNK_SIZE)
+        max_games = args.num_games if args.num_games > 1 else None
+        target = f"{max_games} games" if max_games else "games"
+        if resume is not None and resume.finished:
+            print(f"Run in {args.checkpoint} already finished (seed {seed}, {args.engine} engine)")
+            print_report(resume.summary)
+            return
+        if resume is not None:
+            print(f"Resuming {target} at game {resume.games} on {workers} worker(s) (seed {seed}, {args.engine} engine)...")
+        else:
+            print(f"Running {target} on {workers} worker(s) (seed {seed}, {args.engine} engine)...")
+
+        def progress(done, total):
+            print(f"\rProgress: {done}/{total or '?'}", end="", flush=True)
+
+        store = None
+        if args.records:
+            store = ResultsWriter(args.records, sum(config["role_counts"].values()),
+                                  rows=resume.records if resume is not None else None)
+        checkpointer = None
+        if args.checkpoint:
+            settings = {**{name: getattr(args, name) for name in RUN_SETTINGS}, "seed": seed, "chunk_size": chunk_size}
+            checkpointer = Checkpointer(args.checkpoint, resume or Checkpoint(settings, config),
+                                        args.checkpoint_every, store)
+        profiler = PhaseProfiler() if args.profile else None
+        if profiler:
+            profiler.install()
+        try:
+            summary = run_until(seed, workers, chunk_size, args.engine, max_games=max_games,
+                                target_ci=args.target_ci, time_budget=args.time_budget, progress=progress,
+                                config=config, store=store,
+                                resume=resume.summary if resume is not None else None, checkpoint=checkpointer)
+        except KeyboardInterrupt:
+            if checkpointer is None:
+                raise
+            checkpointer.save()
+            print(f"\nInterrupted at game {checkpointer.latest.games}, continue with --checkpoint {args.checkpoint} --resume")
+            return
+        finally:
+            if profiler:
+                profiler.uninstall()
+
+        print(f"\rProgress: {summary.games}/{max_games or summary.games}")
+        if checkpointer:
+            checkpointer.finish(summary)
+        print_report(summary)
+        if profiler:
+            print("\n--- Profile ---")
+            print(profiler.report(summary.games))
+            profiler.write_collapsed(args.profile)
+            print(f"Collapsed stacks written to {args.profile}")
     else:
+        # --seed replays game 0 of a benchmark run with that master seed
+        rng = GameRNG.for_game(args.seed, 0) if args.seed is not None else None
+        # The game log is just one consumer of the event stream
+        bus.subscribe(EventLogger(logger))
         logger.info("Starting Werewolf Game Simulation...")
-        winner = run_simulation()
+        winner = run_simulation(WerewolfGame(rng=rng, config=config))
         logger.info(f"\nGame Over! Winner: {winner}")
 
 if __name__ == "__main__":
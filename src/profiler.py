@@ -0,0 +1,126 @@
+import functools
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from game import WerewolfGame
+from roles import *
+
+# Game phases and role methods that get timed. Nothing is wrapped until
+# PhaseProfiler.install(), so the counters cost nothing when profiling is off.
+GAME_PHASES = (
+    "_init_players", "reset",
+    "run_night", "run_wolves", "run_seer", "run_witch",
+    "run_day", "run_sheriff_election", "handle_night_deaths", "resolve_deaths", "share_information", "run_voting_phase",
+    "handle_sheriff_death", "check_win_condition",
+)
+ROLE_METHODS = ("vote", "choose_kill_target", "kill_candidates", "choose_check_target", "choose_poison_target",
+                "on_death", "share_information", "choose_successor")
+ROLE_CLASSES = (Role, Villager, Werewolf, Seer, Witch, Hunter, Idiot)
+
+
+class PhaseStats:
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0    # seconds, including nested phases
+        self.own = 0.0      # seconds, excluding nested phases
+        self.net_blocks = 0  # change in live memory blocks (sys.getallocatedblocks), inclusive
+
+
+class PhaseProfiler:
+    """
+    Wraps game phases and role methods with timers while installed.
+
+    Every call records wall time and the change in live memory blocks,
+    both inclusive and (for time) exclusive of nested profiled calls. Net
+    blocks are not allocation counts: blocks allocated and freed within a
+    call cancel out, and a call that frees more than it keeps (reset
+    dropping the last game's state) goes negative. The
+    exclusive times are also kept per call stack, which is the collapsed
+    format flame graph tools read ("run_day;run_voting_phase;Role.vote 123").
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, PhaseStats] = {}
+        self.stacks: Dict[str, float] = {}
+        # Open frames: [label, start, live blocks at start, time in children]
+        self._frames: List[list] = []
+        self._originals: List[Tuple[type, str, Callable]] = []
+
+    # --- Install / uninstall ---
+
+    def install(self):
+        for name in GAME_PHASES:
+            self._wrap(WerewolfGame, name, name)
+        for cls in ROLE_CLASSES:
+            for name in ROLE_METHODS:
+                # Only methods the class defines itself; inherited ones are wrapped on the base
+                if name in cls.__dict__:
+                    self._wrap(cls, name, f"{cls.__name__}.{name}")
+
+    def uninstall(self):
+        for cls, name, fn in reversed(self._originals):
+            setattr(cls, name, fn)
+        self._originals = []
+
+    def __enter__(self) -> 'PhaseProfiler':
+        self.install()
+        return self
+
+    def __exit__(self, *exc):
+        self.uninstall()
+
+    def _wrap(self, cls: type, name: str, label: str):
+        fn = cls.__dict__[name]
+        enter, leave = self._enter, self._leave
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            enter(label)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                leave()
+
+        self._originals.append((cls, name, fn))
+        setattr(cls, name, timed)
+
+    # --- Counters ---
+
+    def _enter(self, label: str):
+        self._frames.append([label, time.perf_counter(), sys.getallocatedblocks(), 0.0])
+
+    def _leave(self):
+        label, start, blocks, children = self._frames.pop()
+        elapsed = time.perf_counter() - start
+        stats = self.stats.get(label)
+        if stats is None:
+            stats = self.stats[label] = PhaseStats()
+        stats.calls += 1
+        stats.total += elapsed
+        stats.own += elapsed - children
+        stats.net_blocks += sys.getallocatedblocks() - blocks
+
+        stack = ";".join([f[0] for f in self._frames] + [label])
+        self.stacks[stack] = self.stacks.get(stack, 0.0) + elapsed - children
+        if self._frames:
+            self._frames[-1][3] += elapsed
+
+    # --- Output ---
+
+    def report(self, games: Optional[int] = None) -> str:
+        lines = [f"{'phase':<34} {'calls':>9} {'total ms':>10} {'own ms':>10} {'us/call':>9} {'net blocks':>11}"]
+        for label, s in sorted(self.stats.items(), key=lambda kv: -kv[1].total):
+            lines.append(f"{label:<34} {s.calls:>9} {s.total * 1e3:>10.1f} {s.own * 1e3:>10.1f} "
+                         f"{s.total / s.calls * 1e6:>9.2f} {s.net_blocks:>11}")
+        if games:
+            lines.append(f"({games} games; net blocks = change in live memory blocks, inclusive; not an allocation count)")
+        return "\n".join(lines)
+
+    def write_collapsed(self, path: str):
+        """
+        Exclusive time per call stack in microseconds, one "a;b;c value" line
+        per stack (flamegraph.pl / speedscope / inferno input).
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, seconds in sorted(self.stacks.items()):
+                f.write(f"{stack} {round(seconds * 1e6)}\n")
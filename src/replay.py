@@ -0,0 +1,90 @@
+import argparse
+import json
+import logging
+from typing import Dict, Optional
+from config import GAME_CONFIG, scaled_role_counts
+from events import bus, EventLogger
+from game import WerewolfGame
+from gametrace import TraceRecorder, TraceWriter, read_trace, replay_events
+from rng import GameRNG
+from runner import run_simulation
+from sweep import expand_grid
+from utils import logger, parse_seed
+
+
+def replay_game(master_seed: int, game_index: int, config: Dict = GAME_CONFIG,
+                log: bool = True, recorder: Optional[TraceRecorder] = None) -> WerewolfGame:
+    """
+    Play game `game_index` of an object-engine run with `master_seed` again,
+    exactly as the run played it (same GameRNG.for_game stream), with the
+    event log on and/or recorded.
+    """
+    listeners = []
+    if log:
+        listeners.append(EventLogger(logger))
+    if recorder is not None:
+        listeners.append(recorder)
+    for listener in listeners:
+        bus.subscribe(listener)
+    try:
+        game = WerewolfGame(rng=GameRNG.for_game(master_seed, game_index), config=config)
+        run_simulation(game)
+    finally:
+        for listener in listeners:
+            bus.unsubscribe(listener)
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay single games of a Werewolf Simulator run with the full event log")
+    parser.add_argument("-s", "--seed", type=parse_seed, default=None, help="Master seed of the run")
+    parser.add_argument("-g", "--game", type=int, nargs="+", default=[], help="Game index (or indices) within the run")
+    parser.add_argument("--players", type=int, default=None, help="Table size the run used (main.py --players)")
+    parser.add_argument("--grid", default=None, help="Grid file of a sweep.py run; use with --config-id")
+    parser.add_argument("--config-id", type=int, default=0, help="Config of the sweep grid the game belongs to")
+    parser.add_argument("--trace", default=None, help="Append the replayed games to this binary trace file")
+    parser.add_argument("--read", default=None, metavar="TRACE", help="Print the games stored in a trace file instead (filtered by --game)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="No event log, only the summary line per game")
+    args = parser.parse_args()
+    logger.setLevel(logging.WARNING if args.quiet else logging.DEBUG)
+
+    if args.read:
+        for seed, index, config_id, data in read_trace(args.read):
+            if args.game and index not in args.game:
+                continue
+            print(f"=== Seed {seed}, game {index}, config {config_id} ({len(data)} bytes) ===")
+            replay_events(data, EventLogger(logger))
+        return
+
+    if args.seed is None or not args.game:
+        parser.error("--seed and --game are required (or --read)")
+    config = GAME_CONFIG
+    if args.grid:
+        with open(args.grid, encoding="utf-8") as f:
+            config = expand_grid(json.load(f))[args.config_id]
+    elif args.players:
+        config = {**GAME_CONFIG, "role_counts": scaled_role_counts(args.players)}
+
+    writer = None
+    if args.trace:
+        try:
+            writer = TraceWriter(args.trace)
+        except ValueError as e:
+            parser.error(str(e))
+    try:
+        for index in args.game:
+            recorder = TraceRecorder() if writer else None
+            print(f"=== Seed {args.seed}, game {index} ===")
+            game = replay_game(args.seed, index, config, log=not args.quiet, recorder=recorder)
+            summary = f"Game {index}: {game.winner} on day {game.day_count} ({game.win_cause.name})"
+            if recorder is not None:
+                writer.write_game(args.seed, index, recorder.data, args.config_id)
+                summary += f", {recorder.events} events in {len(recorder.data)} bytes"
+            print(summary)
+    finally:
+        if writer:
+            writer.close()
+
+
+if __name__ == "__main__":
+    main()
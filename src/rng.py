@@ -0,0 +1,85 @@
+from typing import List, MutableSequence, Optional, Sequence, TypeVar
+import numpy as np
+
+T = TypeVar("T")
+
+# Uniform floats drawn from NumPy per refill
+BLOCK_SIZE = 128
+
+
+class GameRNG:
+    """
+    Random stream of a single game.
+
+    Uniform floats are drawn from NumPy in blocks and handed out one at a
+    time, so a tie-break in a decision path costs a list index and a
+    multiply rather than a call into the random module. Seeded from a
+    (master seed, game index) pair, any one game of a run can be replayed
+    on its own.
+    """
+
+    def __init__(self, seed: Optional[object] = None, block_size: int = BLOCK_SIZE):
+        self.block_size = block_size
+        self.reseed(seed)
+
+    def reseed(self, seed: Optional[object] = None):
+        """
+        Restart as GameRNG(seed) would, keeping this object (roles hold a reference to it).
+        """
+        self._gen = np.random.default_rng(seed)
+        self._block: List[float] = []
+        self._pos = 0
+
+    @classmethod
+    def for_game(cls, master_seed: int, game_index: int) -> 'GameRNG':
+        """
+        Independent stream for game `game_index` of a run (NumPy SeedSequence
+        spawn-key style seeding, so neighbouring games are uncorrelated).
+        """
+        return cls(cls.seed_for_game(master_seed, game_index))
+
+    @staticmethod
+    def seed_for_game(master_seed: int, game_index: int) -> List[int]:
+        """
+        Seed of for_game's stream, for reseed / WerewolfGame.reset.
+        """
+        return [master_seed, game_index]
+
+    def random(self) -> float:
+        pos = self._pos
+        if pos == len(self._block):
+            self._block = self._gen.random(self.block_size).tolist()
+            pos = 0
+        self._pos = pos + 1
+        return self._block[pos]
+
+    def below(self, n: int) -> int:
+        """
+        Uniform integer in [0, n). u < 1 guarantees int(u * n) < n: the
+        rounding error of the product is below half an ulp of n.
+        """
+        return int(self.random() * n)
+
+    def choice(self, seq: Sequence[T]) -> T:
+        # Hottest call of a game (every tie-break), so random() is inlined
+        n = len(seq)
+        if not n:
+            raise IndexError("Cannot choose from an empty sequence")
+        pos = self._pos
+        if pos == len(self._block):
+            self._block = self._gen.random(self.block_size).tolist()
+            pos = 0
+        self._pos = pos + 1
+        return seq[int(self._block[pos] * n)]
+
+    def shuffle(self, x: MutableSequence):
+        """
+        In-place Fisher-Yates shuffle.
+        """
+        for i in range(len(x) - 1, 0, -1):
+            j = self.below(i + 1)
+            x[i], x[j] = x[j], x[i]
+
+
+# Stream for roles and games created outside a seeded run
+default_rng = GameRNG()
@@ -6,3 +6,14 @@ from roles.seer import Seer
 from roles.witch import Witch
 from roles.hunter import Hunter
 from roles.idiot import Idiot
+from config import RoleType
+
+# Role class dealt for each RoleType
+ROLE_CLASSES = {
+    RoleType.WEREWOLF: Werewolf,
+    RoleType.VILLAGER: Villager,
+    RoleType.SEER: Seer,
+    RoleType.WITCH: Witch,
+    RoleType.HUNTER: Hunter,
+    RoleType.IDIOT: Idiot,
+}
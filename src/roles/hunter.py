@@ -1,10 +1,9 @@
 
 
 from roles.role import Role
-from config import RoleType
-from typing import TYPE_CHECKING, List, Dict
-import random
-from utils import logger
+from config import RoleType, HUNTER_REVEAL_RULES
+from typing import TYPE_CHECKING, List
+from events import bus, EventType
 
 if TYPE_CHECKING:
     from game import WerewolfGame
@@ -12,37 +11,52 @@ if TYPE_CHECKING:
 
 
 class Hunter(Role):
+    __slots__ = ("revealed",)
+
     def __init__(self):
         super().__init__(RoleType.HUNTER)
         self.revealed = False
 
+    def get_state(self) -> tuple:
+        return (self.revealed,)
+
+    def set_state(self, state: tuple):
+        self.revealed, = state
+
+    def reset(self):
+        self.revealed = False
+
     def share_information(self, my_player: 'Player', all_players: List['Player']):
-        # Hunter reveals if they think the Seer is dead
+        # Hunter reveals if they think the Seer is dead (config "hunter_reveal" picks the rule)
         if self.revealed:
             return
 
+        rule = my_player.game.config.get("hunter_reveal", "seer_dead") if my_player.game else "seer_dead"
+        if rule == "never":
+            return
+
         seer_dead = False
-        for pid, probs in my_player.knowledge_prob.items():
-            if probs.get(RoleType.SEER, 0.0) > 0.99:
+        if rule == "seer_dead":
+            game = my_player.game
+            dead = [game.players[i - 1] for i in game.death_order] if game else [p for p in all_players if not p.is_alive]
+            for p in dead:
                 # Found someone I believe is the Seer
-                target_p = next((p for p in all_players if p.id == pid), None)
-                if target_p and not target_p.is_alive:
+                if my_player.knowledge_prob.prob(p.id, RoleType.SEER) > 0.99:
                     seer_dead = True
                     break
         
-        if seer_dead:
+        if seer_dead or rule == "day1":
             self.revealed = True
-            logger.info(f"[Discussion] Hunter {my_player.id} says: Identifying myself as the Hunter because the Seer is dead!")
+            if bus.listening: bus.emit(EventType.HUNTER_REVEAL, my_player.id, HUNTER_REVEAL_RULES.index(rule))
             # Everyone marks me as Certain Hunter
-            for p in all_players:
-                p.mark_role_certain(my_player.id, RoleType.HUNTER)
+            my_player.knowledge.mark_certain_all([my_player.id], RoleType.HUNTER)
 
-    def on_death(self, game: 'WerewolfGame', my_player: 'Player'):
+    def on_death(self, game: 'WerewolfGame', my_player: 'Player') -> List['Player']:
         
         
         # Check if poisoned (Witch logic interaction needed, but for now allow shoot)
         if not my_player.poisoned:
-            logger.info(f"Hunter {my_player.id} triggers skill!")
+            if bus.listening: bus.emit(EventType.HUNTER_SKILL, my_player.id)
             badge_flow_target_id = game.get_badge_flow_target()
             
             targets = [p for p in game.get_alive_players() if p.id != badge_flow_target_id and p.id != my_player.id]
@@ -50,10 +64,10 @@ class Hunter(Role):
                 # Select targets with highest Wolf probability (random among ties)
                 best_targets = []
                 max_wolf_prob = -1.0
+                wolf_probs = my_player.knowledge_prob.probs(RoleType.WEREWOLF)
                 
                 for p in targets:
-                    probs = my_player.knowledge_prob.get(p.id, {})
-                    wolf_prob = probs.get(RoleType.WEREWOLF, 0.0)
+                    wolf_prob = wolf_probs[p.id - 1]
                     if wolf_prob > max_wolf_prob:
                         max_wolf_prob = wolf_prob
                         best_targets = [p]
@@ -61,12 +75,9 @@ class Hunter(Role):
                         best_targets.append(p)
                 
                 if best_targets:
-                    shot = random.choice(best_targets)
-                    logger.info(f"Hunter shoots Player {shot.id} (Wolf Prob: {max_wolf_prob:.2f})")
-                    shot.die()
-                    
-                    # Handle consequences of shot player dying
-                    game.handle_sheriff_death(shot)
-                    # Recursive death handling
-                    shot.role.on_death(game, shot)
+                    shot = self.rng.choice(best_targets)
+                    if bus.listening: bus.emit(EventType.HUNTER_SHOT, my_player.id, shot.id, round(max_wolf_prob * 100))
+                    # The game's death queue resolves the shot player's death
+                    return [shot]
+        return []
 
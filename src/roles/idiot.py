@@ -1,16 +1,27 @@
 from roles.role import Role
 from config import RoleType
 from typing import TYPE_CHECKING
-from utils import logger
+from events import bus, EventType
 
 if TYPE_CHECKING:
     from game import WerewolfGame
     from player import Player
 
 class Idiot(Role):
+    __slots__ = ("revealed",)
+
     def __init__(self):
         super().__init__(RoleType.IDIOT)
         self.revealed = False
+
+    def get_state(self) -> tuple:
+        return (self.revealed,)
+
+    def set_state(self, state: tuple):
+        self.revealed, = state
+
+    def reset(self):
+        self.revealed = False
         
     def reveal(self):
         self.revealed = True
@@ -20,14 +31,11 @@ class Idiot(Role):
             # First time voted out: Reveal and survive
             self.revealed = True
             
-            logger.info(f"Player {my_player.id} flips card: I am an IDIOT!")
+            if bus.listening: bus.emit(EventType.IDIOT_FLIP, my_player.id)
             
             # Update all players' knowledge
-            
-            for p in game.players:
-                p.mark_role_certain(my_player.id, RoleType.IDIOT)
-                
-            logger.info("Idiot survives execution.")
+            game.knowledge.mark_certain_all([my_player.id], RoleType.IDIOT)
+
             return False
         else:
             # Already revealed: Die
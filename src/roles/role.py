@@ -1,18 +1,99 @@
 
 
 from abc import ABC, abstractmethod
-from typing import List, TYPE_CHECKING, Dict, Optional
+from bisect import bisect_left
+from typing import List, TYPE_CHECKING, Dict, Optional, Sequence
 from config import RoleType
-import random
+from rng import GameRNG, default_rng
 
 if TYPE_CHECKING:
     from player import Player
     from game import WerewolfGame
+    from knowledge import KnowledgeView
+
+
+def find_player(players: List['Player'], player_id: int) -> Optional['Player']:
+    """
+    The player with this id in an id-ordered list (e.g. the alive players), or None.
+    """
+    i = bisect_left(players, player_id, key=lambda p: p.id)
+    if i < len(players) and players[i].id == player_id:
+        return players[i]
+    return None
+
+
+class _Without:
+    """
+    Read-only sequence view of `seq` without item `skip` (for rng.choice).
+    """
+
+    def __init__(self, seq: Sequence, skip: int):
+        self.seq = seq
+        self.skip = skip
+
+    def __len__(self) -> int:
+        return len(self.seq) - 1
+
+    def __getitem__(self, i: int):
+        return self.seq[i + (i >= self.skip)]
+
+
+class SuspectRanking:
+    """
+    Vote candidates ranked by one public knowledge layer's wolf probability:
+    the top tie (what Role.vote picks from) and the runner-up tie, in id order.
+
+    Every listener reading that layer sees the same ranking except for their
+    own row, which is zero to them, so pick() only corrects for the voter
+    instead of rescanning the table for each of them.
+    """
+
+    def __init__(self, candidates: List['Player'], wolf_probs: List[float]):
+        self.top: List['Player'] = []
+        self.second: List['Player'] = []
+        self.best = self.runner_up = -1.0
+        for p in candidates:
+            w = wolf_probs[p.id - 1]
+            if w > self.best:
+                self.runner_up, self.second = self.best, self.top
+                self.best, self.top = w, [p]
+            elif w == self.best:
+                self.top.append(p)
+            elif w > self.runner_up:
+                self.runner_up, self.second = w, [p]
+            elif w == self.runner_up:
+                self.second.append(p)
+        self._top_index = {p.id: i for i, p in enumerate(self.top)}
+
+    def pick(self, voter: 'Player', rng: GameRNG) -> Optional['Player']:
+        """
+        Same choice (and the same draw from rng) as scanning the candidates
+        with the voter's own probability set to zero.
+        """
+        top = self.top
+        i = self._top_index.get(voter.id)
+        if i is None or self.best == 0:
+            return rng.choice(top) if top else None
+        if len(top) > 1:
+            return rng.choice(_Without(top, i))
+        # The voter was the only top suspect: to themself, the runner-up tie
+        if not self.second:
+            return rng.choice(top)
+        if self.runner_up > 0:
+            return rng.choice(self.second)
+        # ... which is zero like their own row
+        return rng.choice(sorted(self.second + top, key=lambda p: p.id))
+
 
 class Role(ABC):
+    # Every role declares its state in __slots__ (no per-instance __dict__)
+    __slots__ = ("role_type", "sheriff_candidacy_prob", "rng")
+
     def __init__(self, role_type: RoleType):
         self.role_type = role_type
         self.sheriff_candidacy_prob = 0.0 # Probability to run for Sheriff
+        # The game's random stream (WerewolfGame assigns its own when dealing)
+        self.rng: GameRNG = default_rng
 
     @property
     def name(self):
@@ -21,6 +102,26 @@ class Role(ABC):
     def __str__(self):
         return self.name
 
+    def get_state(self) -> tuple:
+        """
+        Internal strategy state as a compact tuple (see GameSnapshot).
+        Default: stateless.
+        """
+        return ()
+
+    def set_state(self, state: tuple):
+        """
+        Restore state produced by get_state on a fresh instance.
+        """
+        pass
+
+    def reset(self):
+        """
+        Back to the state of a fresh instance, in place (WerewolfGame.reset).
+        Default: stateless.
+        """
+        pass
+
     def share_information(self, my_player: 'Player', all_players: List['Player']):
         """
         Share information during day phase.
@@ -28,23 +129,24 @@ class Role(ABC):
         """
         pass
 
-    def choose_successor(self, game: 'WerewolfGame', alive_players: List['Player'], knowledge_prob: Dict[str, any]) -> 'Player':
+    def choose_successor(self, game: 'WerewolfGame', alive_players: List['Player'], knowledge_prob: 'KnowledgeView') -> 'Player':
         """
         Choose a successor for Sheriff if this player dies as Sheriff.
         Default: Random alive player.
         """
         if not alive_players:
             return None
-        return random.choice(alive_players)
+        return self.rng.choice(alive_players)
 
-    def on_death(self, game: 'WerewolfGame', my_player: 'Player'):
+    def on_death(self, game: 'WerewolfGame', my_player: 'Player') -> Sequence['Player']:
         """
-        Handle death of the player (e.g. Hunter shoots).
+        Handle death of the player (e.g. Hunter shoots). Returns the players
+        it kills, for WerewolfGame.resolve_deaths to resolve.
         Default: Do nothing.
         """
-        pass
+        return ()
 
-    def vote(self, game: 'WerewolfGame', alive_players: List['Player'], knowledge_prob: Dict[int, Dict[RoleType, float]], my_player: 'Player', leader_suggestion: Optional['Player'] = None) -> Optional['Player']:
+    def vote(self, game: 'WerewolfGame', alive_players: List['Player'], knowledge_prob: 'KnowledgeView', my_player: 'Player', leader_suggestion: Optional['Player'] = None) -> Optional['Player']:
         """
         Vote for a player during the day.
         Priority:
@@ -59,18 +161,23 @@ class Role(ABC):
             return leader_suggestion
 
         # Default: Vote for own most suspicious target
+        badge_flow_target_id = game.get_badge_flow_target()
+        layer = knowledge_prob.layer
+        if layer is not None and alive_players is game.get_alive_players():
+            # Listeners on the same public layer share one ranking
+            skip_id = badge_flow_target_id if self.role_type != RoleType.WEREWOLF else None
+            return game.get_suspects(layer, skip_id).pick(my_player, self.rng)
+
         best_targets = []
         max_wolf_prob = -1.0
-        
-        badge_flow_target_id = game.get_badge_flow_target()
+        wolf_probs = knowledge_prob.probs(RoleType.WEREWOLF)
         
         for p in alive_players:
              # Skip badge flow target if I am Good
              if self.role_type != RoleType.WEREWOLF and badge_flow_target_id is not None and p.id == badge_flow_target_id:
                  continue
 
-             probs = knowledge_prob.get(p.id, {})
-             wolf_prob = probs.get(RoleType.WEREWOLF, 0.0)
+             wolf_prob = wolf_probs[p.id - 1]
              
              if wolf_prob > max_wolf_prob:
                  max_wolf_prob = wolf_prob
@@ -81,7 +188,7 @@ class Role(ABC):
         if not best_targets:
             return None
             
-        return random.choice(best_targets)
+        return self.rng.choice(best_targets)
 
     def handle_vote_execution(self, game: 'WerewolfGame', my_player: 'Player') -> bool:
         """
@@ -89,9 +196,7 @@ class Role(ABC):
         Returns: True if the player died, False if they survived (e.g. Idiot).
         Default: Player dies.
         """
-        my_player.die()
-        game.handle_sheriff_death(my_player)
-        self.on_death(game, my_player)
+        game.resolve_deaths([my_player])
         return True
 
 
@@ -1,28 +1,49 @@
 
 
 from typing import List, Dict, TYPE_CHECKING, Optional
-from roles.role import Role
+from roles.role import Role, find_player
 from config import RoleType
-import random
-from utils import logger
+from events import bus, EventType
+from knowledge import ROLE_INDEX
 
 if TYPE_CHECKING:
     from player import Player
     from game import WerewolfGame
+    from knowledge import KnowledgeView
 
 class Seer(Role):
+    __slots__ = ("checked_players", "badge_flow_target", "claimed", "journal_pos")
+
     def __init__(self):
         super().__init__(RoleType.SEER)
         self.checked_players = [] # List of player IDs in order of check
         self.sheriff_candidacy_prob = 1.0
         self.badge_flow_target: Optional[int] = None # Player ID
+        # What the Seer has claimed so far: player ID -> role
+        self.claimed: Dict[int, RoleType] = {}
+        # KnowledgeMatrix.journal position at the last share (None = never shared)
+        self.journal_pos: Optional[int] = None
+
+    def get_state(self) -> tuple:
+        return (tuple(self.checked_players), self.badge_flow_target, tuple(self.claimed.items()), self.journal_pos)
+
+    def set_state(self, state: tuple):
+        checked, self.badge_flow_target, claimed, self.journal_pos = state
+        self.checked_players = list(checked)
+        self.claimed = dict(claimed)
 
-    def vote(self, game: 'WerewolfGame', alive_players: List['Player'], knowledge_prob: Dict[int, Dict[RoleType, float]], my_player: 'Player', leader_suggestion: Optional['Player'] = None) -> Optional['Player']:
+    def reset(self):
+        self.checked_players.clear()
+        self.badge_flow_target = None
+        self.claimed.clear()
+        self.journal_pos = None
+
+    def vote(self, game: 'WerewolfGame', alive_players: List['Player'], knowledge_prob: 'KnowledgeView', my_player: 'Player', leader_suggestion: Optional['Player'] = None) -> Optional['Player']:
         # Seer always votes for their most suspicious target (independent)
         best_targets = []
         max_wolf_prob = -1.0
         
-        badge_flow_target_id = game.get_badge_flow_target()
+        wolf_probs = knowledge_prob.probs(RoleType.WEREWOLF)
         
         for p in alive_players:
              # Skip badge flow target if I am Good (Seer avoids voting for their own future check unless certain)
@@ -30,8 +51,7 @@ class Seer(Role):
              # But let's keep consistency: if badge flow target logic applies generally.
              # However, Seer KNOWS who they checked.
              
-             probs = knowledge_prob.get(p.id, {})
-             wolf_prob = probs.get(RoleType.WEREWOLF, 0.0)
+             wolf_prob = wolf_probs[p.id - 1]
              
              if wolf_prob > max_wolf_prob:
                  max_wolf_prob = wolf_prob
@@ -42,12 +62,12 @@ class Seer(Role):
         if not best_targets:
             return None
             
-        return random.choice(best_targets)
+        return self.rng.choice(best_targets)
 
-    def choose_check_target(self, alive_players: List['Player'], knowledge_prob: Dict[int, Dict[RoleType, float]]) -> 'Player':
+    def choose_check_target(self, alive_players: List['Player'], knowledge_prob: 'KnowledgeView') -> 'Player':
         # If there's an announced badge flow target, try to check them first
         if self.badge_flow_target:
-            target_p = next((p for p in alive_players if p.id == self.badge_flow_target), None)
+            target_p = find_player(alive_players, self.badge_flow_target)
             if target_p and target_p.id not in self.checked_players:
                 return target_p
 
@@ -61,10 +81,10 @@ class Seer(Role):
         # Prioritize highest Wolf probability (random among ties)
         best_targets = []
         max_wolf_prob = -1.0
+        wolf_probs = knowledge_prob.probs(RoleType.WEREWOLF)
         
         for p in candidates:
-            probs = knowledge_prob.get(p.id, {})
-            wolf_prob = probs.get(RoleType.WEREWOLF, 0.0)
+            wolf_prob = wolf_probs[p.id - 1]
             
             if wolf_prob > max_wolf_prob:
                 max_wolf_prob = wolf_prob
@@ -76,27 +96,42 @@ class Seer(Role):
             return None
             
         
-        return random.choice(best_targets)
+        return self.rng.choice(best_targets)
 
     def share_information(self, my_player: 'Player', all_players: List['Player']):
         
         
-        # 1. Share results of previous checks
-        for pid, probs in my_player.knowledge_prob.items():
-            known_role = next((r for r, p in probs.items() if p >= 0.99), None)
-            if not known_role: continue
-            
-            status_str = known_role.value
-            logger.info(f"[Discussion] Seer {my_player.id} says: Player {pid} is {status_str}")
-            
+        # 1. Share results of previous checks. Only players whose beliefs
+        # changed since the last share can change the claims; new claims
+        # are announced, and announce_* skips the unchanged repeats.
+        knowledge = my_player.knowledge
+        view = my_player.knowledge_prob
+        if self.journal_pos is None:
+            changed = view.certain_roles()
+        else:
+            changed = [(pid, view.certain_role(pid))
+                       for pid in sorted({t + 1 for t in knowledge.journal[self.journal_pos:]})]
+        self.journal_pos = len(knowledge.journal)
+
+        wolves, gold_water = [], []
+        for pid, known_role in changed:
+            if known_role is None:
+                self.claimed.pop(pid, None)
+                continue
+            if self.claimed.get(pid) != known_role:
+                self.claimed[pid] = known_role
+                if bus.listening: bus.emit(EventType.SEER_CLAIM, my_player.id, pid, ROLE_INDEX[known_role])
+                if known_role == RoleType.VILLAGER:
+                    all_players[pid - 1].is_gold_water = True
+
             if known_role == RoleType.WEREWOLF:
-                for p in all_players:
-                    p.mark_role_certain(pid, RoleType.WEREWOLF)
+                wolves.append(pid)
             elif known_role == RoleType.VILLAGER:
-                for p in all_players:
-                    p.rule_out_role(pid, RoleType.WEREWOLF)
-                    if p.id == pid:
-                        p.is_gold_water = True
+                gold_water.append(pid)
+
+        # Everyone believes the Seer: one bulk update per kind of claim
+        knowledge.announce_certain(wolves, RoleType.WEREWOLF)
+        knowledge.announce_ruled_out(gold_water, RoleType.WEREWOLF)
                         
         # 2. Badge Flow Announcement (Designating FUTURE target)
         if my_player.sheriff:
@@ -106,55 +141,52 @@ class Seer(Role):
             
             if candidates:
                 # Pick most suspicious for future check (random among ties)
-                max_wolf_prob = max(my_player.knowledge_prob.get(p.id, {}).get(RoleType.WEREWOLF, 0.0) for p in candidates)
-                top_candidates = [p for p in candidates if my_player.knowledge_prob.get(p.id, {}).get(RoleType.WEREWOLF, 0.0) == max_wolf_prob]
+                wolf_probs = my_player.knowledge_prob.probs(RoleType.WEREWOLF)
+                max_wolf_prob = max(wolf_probs[p.id - 1] for p in candidates)
+                top_candidates = [p for p in candidates if wolf_probs[p.id - 1] == max_wolf_prob]
                 
-                self.badge_flow_target = random.choice(top_candidates).id
-                logger.info(f"[Discussion] Seer {my_player.id} announces Badge Flow: Tonight will check Player {self.badge_flow_target}. If Good -> Transfer to them; If Wolf -> Transfer to previously known good.")
+                self.badge_flow_target = self.rng.choice(top_candidates).id
+                if bus.listening: bus.emit(EventType.BADGE_FLOW, my_player.id, self.badge_flow_target)
 
         # 3. Reveal self as Seer
-        for p in all_players:
-            p.mark_role_certain(my_player.id, RoleType.SEER)
+        knowledge.announce_certain([my_player.id], RoleType.SEER)
 
 
-    def choose_successor(self, game: 'WerewolfGame', alive_players: List['Player'], knowledge_prob: Dict[int, Dict[RoleType, float]]) -> 'Player':
+    def choose_successor(self, game: 'WerewolfGame', alive_players: List['Player'], knowledge_prob: 'KnowledgeView') -> 'Player':
         # Seer Badge Flow logic
         
         
         
         if self.badge_flow_target:
             target_id = self.badge_flow_target
-            target_p = next((p for p in game.players if p.id == target_id), None)
+            target_p = game.players[target_id - 1] if 0 < target_id <= len(game.players) else None
             
             if target_p:
-                probs = knowledge_prob.get(target_id, {})
-                wolf_prob = probs.get(RoleType.WEREWOLF, 0.0)
+                wolf_prob = knowledge_prob.prob(target_id, RoleType.WEREWOLF)
                 
                 if wolf_prob < 0.01:
                     # Target is Good!
-                    logger.info(f"Seer Badge Flow: Player {target_id} is Good. Transferring badge and revealing their role to all.")
+                    if bus.listening: bus.emit(EventType.BADGE_FLOW_REVEAL, target_id, 0)
                     # Update all players' knowledge
-                    for p in game.players:
-                        p.rule_out_role(target_id, RoleType.WEREWOLF)
+                    game.knowledge.rule_out_all([target_id], RoleType.WEREWOLF)
                     
                     if target_p.is_alive:
                         return target_p
                 else:
                     # Target is Wolf!
-                    logger.info(f"Seer Badge Flow: Player {target_id} is Wolf. Revealing their role to all and transferring badge to known good.")
+                    if bus.listening: bus.emit(EventType.BADGE_FLOW_REVEAL, target_id, 1)
                     # Update all players' knowledge
-                    for p in game.players:
-                        p.mark_role_certain(target_id, RoleType.WEREWOLF)
+                    game.knowledge.mark_certain_all([target_id], RoleType.WEREWOLF)
 
         # Fallback: choose a known Good player (Gold Water)
         known_good = []
+        wolf_probs = knowledge_prob.probs(RoleType.WEREWOLF)
         for p in alive_players:
-            probs = knowledge_prob.get(p.id, {})
-            wolf_prob = probs.get(RoleType.WEREWOLF, 0.0)
-            if wolf_prob < 0.01 and any(v > 0.9 for k, v in probs.items() if k != RoleType.WEREWOLF):
+            # Not a wolf, and some other role is (almost) certain
+            if wolf_probs[p.id - 1] < 0.01 and knowledge_prob.row(p.id).max() > 0.9:
                 known_good.append(p)
                 
         if known_good:
-            return random.choice(known_good)
+            return self.rng.choice(known_good)
             
         return super().choose_successor(game, alive_players, knowledge_prob)
@@ -3,5 +3,7 @@ from roles.role import Role
 from config import RoleType
 
 class Villager(Role):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(RoleType.VILLAGER)
@@ -1,29 +1,35 @@
 
 from typing import Dict, TYPE_CHECKING, List, Optional
+import numpy as np
 from roles.role import Role
 from config import RoleType
-import random
+from knowledge import ROLE_INDEX, NUM_ROLES
 
 if TYPE_CHECKING:
     from player import Player
     from game import WerewolfGame
+    from knowledge import KnowledgeView
+
+# Kill priority weights on the target's role distribution
+KILL_WEIGHTS = np.zeros(NUM_ROLES)
+# 1. Seer (High Priority)
+KILL_WEIGHTS[ROLE_INDEX[RoleType.SEER]] = 1000
+# 2. Witch
+KILL_WEIGHTS[ROLE_INDEX[RoleType.WITCH]] = 800
+# 3. God (Hunter/Idiot)
+KILL_WEIGHTS[ROLE_INDEX[RoleType.HUNTER]] = 500
+KILL_WEIGHTS[ROLE_INDEX[RoleType.IDIOT]] = 500
 
 
 class Werewolf(Role):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(RoleType.WEREWOLF)
 
-    def calculate_kill_score(self, target: 'Player', knowledge_prob: Dict[int, Dict[RoleType, float]]) -> float:
-        score = 0
-        probs = knowledge_prob.get(target.id, {})
-        
-        # 1. Seer (High Priority)
-        score += probs.get(RoleType.SEER, 0) * 1000
-        # 2. Witch
-        score += probs.get(RoleType.WITCH, 0) * 800
-        # 3. God (Hunter/Idiot)
-        score += probs.get(RoleType.HUNTER, 0) * 500
-        score += probs.get(RoleType.IDIOT, 0) * 500
+    def calculate_kill_score(self, target: 'Player', role_score: float) -> float:
+        # 1-3. Seer / Witch / Gods, weighted by role probability (KILL_WEIGHTS)
+        score = role_score
         
         # 4. Silver Water (Saved by witch)
         if target.saved:
@@ -41,37 +47,41 @@ class Werewolf(Role):
         
         return score
 
-    def choose_kill_target(self, alive_players: List['Player'], knowledge_prob: Dict[int, Dict[RoleType, float]]) -> Optional['Player']:
-        potential_targets = [p for p in alive_players if p.role.role_type != RoleType.WEREWOLF]
-        if not potential_targets:
+    def choose_kill_target(self, alive_players: List['Player'], knowledge_prob: 'KnowledgeView') -> Optional['Player']:
+        # Select target with highest kill score (random among ties)
+        best_targets = self.kill_candidates(alive_players, knowledge_prob)
+        if not best_targets:
             return None
             
-        # Select target with highest kill score (random among ties)
+        return self.rng.choice(best_targets)
+
+    def kill_candidates(self, alive_players: List['Player'], knowledge_prob: 'KnowledgeView') -> List['Player']:
+        """
+        Non-wolves with the highest kill score, in id order.
+        """
+        potential_targets = [p for p in alive_players if p.role.role_type != RoleType.WEREWOLF]
         max_score = -1.0
         best_targets = []
+        role_scores = knowledge_prob.weighted(KILL_WEIGHTS)
         
         for p in potential_targets:
-            score = self.calculate_kill_score(p, knowledge_prob)
+            score = self.calculate_kill_score(p, role_scores[p.id - 1])
             if score > max_score:
                 max_score = score
                 best_targets = [p]
             elif score == max_score:
                 best_targets.append(p)
-                
-        if not best_targets:
-            return None
-            
-        return random.choice(best_targets)
+        return best_targets
 
-    def choose_successor(self, game: 'WerewolfGame', alive_players: List['Player'], knowledge_prob: Dict[int, Dict[RoleType, float]]) -> 'Player':
+    def choose_successor(self, game: 'WerewolfGame', alive_players: List['Player'], knowledge_prob: 'KnowledgeView') -> 'Player':
         # Werewolf chooses a teammate
         teammates = [p for p in alive_players if p.role.role_type == RoleType.WEREWOLF]
         if teammates:
-            return random.choice(teammates)
+            return self.rng.choice(teammates)
             
         return super().choose_successor(game, alive_players, knowledge_prob)
 
     # ## 假装一下好人，按照好人的方式投票
-    # def vote(self, game: 'WerewolfGame', alive_players: List['Player'], knowledge_prob: Dict[int, Dict[RoleType, float]], my_player: 'Player', leader_suggestion: Optional['Player'] = None) -> Optional['Player']:
+    # def vote(self, game: 'WerewolfGame', alive_players: List['Player'], knowledge_prob: 'KnowledgeView', my_player: 'Player', leader_suggestion: Optional['Player'] = None) -> Optional['Player']:
     #     # Werewolf voting logic is same as kill target (strategic)
     #     return self.choose_kill_target(alive_players, knowledge_prob)
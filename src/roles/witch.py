@@ -2,19 +2,52 @@
 from typing import TYPE_CHECKING, List, Dict, Optional
 from roles.role import Role
 from config import RoleType
-import random
-from utils import logger
+from events import bus, EventType
 
 if TYPE_CHECKING:
     from player import Player
     from game import WerewolfGame
+    from knowledge import KnowledgeView
 
 class Witch(Role):
+    __slots__ = ("potions", "claimed_save")
+
+    # Bits of `potions`: what the Witch still has
+    ANTIDOTE = 1
+    POISON = 2
+
     def __init__(self):
         super().__init__(RoleType.WITCH)
-        self.has_antidote = True
-        self.has_poison = True
+        self.potions = Witch.ANTIDOTE | Witch.POISON
         self.sheriff_candidacy_prob = 1.0
+        # Silver Water already claimed
+        self.claimed_save = False
+
+    @property
+    def has_antidote(self) -> bool:
+        return bool(self.potions & Witch.ANTIDOTE)
+
+    @has_antidote.setter
+    def has_antidote(self, value: bool):
+        self.potions = self.potions | Witch.ANTIDOTE if value else self.potions & ~Witch.ANTIDOTE
+
+    @property
+    def has_poison(self) -> bool:
+        return bool(self.potions & Witch.POISON)
+
+    @has_poison.setter
+    def has_poison(self, value: bool):
+        self.potions = self.potions | Witch.POISON if value else self.potions & ~Witch.POISON
+
+    def get_state(self) -> tuple:
+        return (self.has_antidote, self.has_poison, self.claimed_save)
+
+    def set_state(self, state: tuple):
+        self.has_antidote, self.has_poison, self.claimed_save = state
+
+    def reset(self):
+        self.potions = Witch.ANTIDOTE | Witch.POISON
+        self.claimed_save = False
         
     def use_antidote(self):
         if self.has_antidote:
@@ -28,7 +61,7 @@ class Witch(Role):
             return True
         return False
 
-    def choose_save_decision(self, night_kill: 'Player', knowledge_prob: Dict[int, Dict[RoleType, float]]) -> bool:
+    def choose_save_decision(self, night_kill: 'Player', knowledge_prob: 'KnowledgeView') -> bool:
         """
         Decide whether to save the night kill target.
         """
@@ -39,7 +72,7 @@ class Witch(Role):
         # Prompt says "默认救" (Default save).
         return True
 
-    def choose_poison_target(self, game: 'WerewolfGame', alive_players: List['Player'], knowledge_prob: Dict[int, Dict[RoleType, float]]) -> Optional['Player']:
+    def choose_poison_target(self, game: 'WerewolfGame', alive_players: List['Player'], knowledge_prob: 'KnowledgeView') -> Optional['Player']:
         """
         Decide whether to poison someone and whom.
         """
@@ -53,10 +86,10 @@ class Witch(Role):
         
         best_targets = []
         max_wolf_prob = 0.0
+        wolf_probs = knowledge_prob.probs(RoleType.WEREWOLF)
         
         for p in potential_targets:
-            probs = knowledge_prob.get(p.id, {})
-            wolf_prob = probs.get(RoleType.WEREWOLF, 0.0)
+            wolf_prob = wolf_probs[p.id - 1]
             if wolf_prob > max_wolf_prob:
                 max_wolf_prob = wolf_prob
                 best_targets = [p]
@@ -64,7 +97,7 @@ class Witch(Role):
                 best_targets.append(p)
         
         if best_targets and max_wolf_prob > 0.25:
-             return random.choice(best_targets)
+             return self.rng.choice(best_targets)
              
         return None
 
@@ -88,23 +121,29 @@ class Witch(Role):
         # But for strictly following the prompt "most pass, only witch and seer update others"
         # Let's verify standard logic: Witch sees someone saved, claims credit.
         
-        for p in all_players:
-            if p.saved:
-                 logger.info(f"[Discussion] Witch {my_player.id} says: I saved Player {p.id} last night! (Silver Water)")
-                 
-                 # Everyone rules out Wolf for Silver Water
-                 for listener in all_players:
-                     listener.rule_out_role(p.id, RoleType.WEREWOLF)
+        # The antidote saves at most one player, recorded by the game
+        game = my_player.game
+        if game is not None:
+            silver_water = [game.witch_saved] if game.witch_saved else []
+        else:
+            silver_water = [p.id for p in all_players if p.saved]
+        if silver_water and not self.claimed_save:
+            self.claimed_save = True
+            if bus.listening:
+                for pid in silver_water:
+                    bus.emit(EventType.SILVER_WATER, my_player.id, pid)
+
+        # Everyone rules out Wolf for Silver Water (repeats are skipped)
+        my_player.knowledge.announce_ruled_out(silver_water, RoleType.WEREWOLF)
 
         # Reveal self as Witch
-        for p in all_players:
-            p.mark_role_certain(my_player.id, RoleType.WITCH)
+        my_player.knowledge.announce_certain([my_player.id], RoleType.WITCH)
 
-    def choose_successor(self, game: 'WerewolfGame', alive_players: List['Player'], knowledge_prob: Dict[int, Dict[RoleType, float]]) -> 'Player':
+    def choose_successor(self, game: 'WerewolfGame', alive_players: List['Player'], knowledge_prob: 'KnowledgeView') -> 'Player':
         # Witch chooses among the players she saved (Silver Water) if alive (random among ties)
         saved_alive = [p for p in alive_players if p.saved]
         if saved_alive:
-            return random.choice(saved_alive)
+            return self.rng.choice(saved_alive)
         
         return super().choose_successor(game, alive_players, knowledge_prob)
 
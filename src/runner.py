@@ -0,0 +1,308 @@
+import logging
+import os
+import time
+from collections import deque
+from multiprocessing import Pool
+from typing import Callable, Dict, Iterator, Optional, Tuple, TypeVar
+from batch import BatchedGame, run_batch
+from config import GAME_CONFIG
+from game import WerewolfGame, GameSnapshot
+from rng import GameRNG
+from stats import max_half_width
+from store import Columns, ResultsWriter, batch_columns, count_winners, game_columns
+from utils import logger
+
+T = TypeVar("T")
+
+# Games per work unit. Kept independent of the worker count so that the
+# (master seed, game index) -> game mapping never changes between runs.
+DEFAULT_CHUNK_SIZE = 500
+# The batched engine amortises its per-phase overhead over the whole chunk
+BATCH_CHUNK_SIZE = 4096
+
+ENGINES = ("object", "batch")
+
+# Longest a single adaptive chunk should run under a time budget
+MAX_CHUNK_SECONDS = 2.0
+# Don't trust an interval before this many games
+MIN_GAMES_FOR_CI = 1000
+
+
+def run_simulation(game: Optional[WerewolfGame] = None):
+    """
+    Play a game to the end: a fresh one, or continue `game` from between two days.
+    """
+    if game is None:
+        game = WerewolfGame()
+    while not game.winner:
+        night_deaths = game.run_night()
+        game.run_day(night_deaths)
+        if game.winner:
+            return game.winner
+    return game.winner
+
+
+def game_seed(master_seed: int, game_index: int) -> int:
+    """
+    Integer seed for the batched engine, which seeds a whole chunk from its
+    first game. Object-engine games use GameRNG.for_game(master seed, game
+    index) instead; either way a game's outcome does not depend on which
+    worker ran it or what ran before it.
+    """
+    return (master_seed << 32) | game_index
+
+
+def iter_games(master_seed: int, start: int, count: int, snapshot: Optional[GameSnapshot] = None,
+               config: Dict = GAME_CONFIG) -> Iterator[WerewolfGame]:
+    """
+    Games [start, start + count) of an object-engine run, ready to play.
+    New deals all reuse one WerewolfGame (reset for the next index), so
+    finish with a game before drawing the next; continuations of a
+    snapshot are separate objects.
+    """
+    game = None
+    for i in range(start, start + count):
+        if snapshot is not None:
+            yield WerewolfGame(snapshot, GameRNG.for_game(master_seed, i), config)
+        elif game is None:
+            game = WerewolfGame(rng=GameRNG.for_game(master_seed, i), config=config)
+            yield game
+        else:
+            game.reset(GameRNG.seed_for_game(master_seed, i))
+            yield game
+
+
+def run_chunk(master_seed: int, start: int, count: int, engine: str = "object",
+              snapshot: Optional[GameSnapshot] = None, config: Dict = GAME_CONFIG) -> Dict[str, int]:
+    """
+    Play games [start, start + count) of `config` and return compact win counts.
+    The batched engine plays the whole chunk as one batch seeded from its first game.
+    With a snapshot, every game is a continuation of that state instead of a new deal.
+    """
+    if engine == "batch":
+        return run_batch(count, seed=game_seed(master_seed, start), config=config)
+
+    results = {}
+    for game in iter_games(master_seed, start, count, snapshot, config):
+        winner = run_simulation(game)
+        results[winner] = results.get(winner, 0) + 1
+    return results
+
+
+def run_chunk_records(master_seed: int, start: int, count: int, engine: str = "object",
+                      snapshot: Optional[GameSnapshot] = None, config: Dict = GAME_CONFIG,
+                      config_id: int = 0) -> Columns:
+    """
+    Same games as run_chunk, returned as per-game record columns (see store.py).
+    """
+    players = sum(config["role_counts"].values())
+    if engine == "batch":
+        batch = BatchedGame(count, seed=game_seed(master_seed, start), config=config)
+        batch.run()
+        return batch_columns(batch, master_seed, start, config_id, players)
+
+    games = []
+    for i in range(start, start + count):
+        game = WerewolfGame(snapshot, GameRNG.for_game(master_seed, i), config)
+        run_simulation(game)
+        games.append(game)
+    return game_columns(games, master_seed, start, config_id, players)
+
+
+def merge_results(total: Dict[str, int], part: Dict[str, int]):
+    for faction, wins in part.items():
+        total[faction] = total.get(faction, 0) + wins
+
+
+class ChunkPlanner:
+    """
+    Hands out consecutive chunks of game indices [start, start + count).
+
+    Without a deadline every chunk has `chunk_size` games, so the game ->
+    chunk mapping is fixed. With a deadline the chunk size follows the
+    measured games/sec so that the last chunks finish close to it.
+    """
+
+    def __init__(self, chunk_size: int, max_games: Optional[int] = None, deadline: Optional[float] = None,
+                 workers: int = 1, start: int = 0):
+        self.chunk_size = chunk_size
+        self.max_games = max_games
+        self.deadline = deadline
+        self.workers = workers
+        self.next_start = start
+        self.started = time.monotonic()
+        self.done = 0
+        # Start small under a deadline until the rate is known
+        self.adaptive_size = max(1, chunk_size // 8) if deadline else chunk_size
+
+    def record(self, count: int):
+        self.done += count
+        if self.deadline is None:
+            return
+        elapsed = time.monotonic() - self.started
+        per_worker_rate = self.done / max(elapsed, 1e-9) / self.workers
+        remaining = self.deadline - time.monotonic()
+        # Aim for chunks of a fraction of the remaining time, capped at a few seconds
+        target_seconds = min(remaining / 4, MAX_CHUNK_SECONDS)
+        self.adaptive_size = int(per_worker_rate * target_seconds)
+
+    def next_chunk(self) -> Optional[Tuple[int, int]]:
+        count = self.adaptive_size
+        if self.deadline is not None and (count < 1 or time.monotonic() >= self.deadline):
+            return None
+        if self.max_games is not None:
+            count = min(count, self.max_games - self.next_start)
+            if count <= 0:
+                return None
+        chunk = (self.next_start, count)
+        self.next_start += count
+        return chunk
+
+
+class RunSummary:
+    def __init__(self, results: Dict[str, int], games: int, elapsed: float):
+        self.results = results
+        self.games = games
+        self.elapsed = elapsed
+
+    @property
+    def games_per_sec(self) -> float:
+        return self.games / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _init_worker():
+    # Workers never log; only the parent reports progress.
+    logger.setLevel(logging.WARNING)
+
+
+ChunkResult = Tuple[int, Dict[str, int], Optional[Columns]]
+
+
+def _run_chunk_args(args: Tuple[int, int, int, str, Optional[GameSnapshot], Dict, bool]) -> ChunkResult:
+    master_seed, start, count, engine, snapshot, config, record = args
+    if record:
+        columns = run_chunk_records(master_seed, start, count, engine, snapshot, config)
+        return count, count_winners(columns), columns
+    return count, run_chunk(master_seed, start, count, engine, snapshot, config), None
+
+
+def iter_planned(task: Callable[[tuple], T], planner: ChunkPlanner, args_for: Callable[[Tuple[int, int]], tuple],
+                 workers: int = 1) -> Iterator[T]:
+    """
+    Yield task(args_for(chunk)) for every chunk the planner hands out, in
+    chunk order. Only a bounded window of chunks is in flight, so the
+    consumer can stop at any point by closing the generator. `task` must be
+    a module-level function (it is pickled to the workers).
+    """
+    if workers <= 1:
+        while True:
+            chunk = planner.next_chunk()
+            if chunk is None:
+                return
+            yield task(args_for(chunk))
+
+    with Pool(processes=workers, initializer=_init_worker) as pool:
+        pending = deque()
+
+        def submit():
+            while len(pending) < 2 * workers:
+                chunk = planner.next_chunk()
+                if chunk is None:
+                    return
+                pending.append(pool.apply_async(task, (args_for(chunk),)))
+
+        submit()
+        while pending:
+            # Consume in submission order, so the merged dict is built the
+            # same way regardless of how many workers there are.
+            yield pending.popleft().get()
+            submit()
+
+
+def iter_chunk_results(master_seed: int, planner: ChunkPlanner, workers: int = 1, engine: str = "object",
+                       snapshot: Optional[GameSnapshot] = None, config: Dict = GAME_CONFIG,
+                       record: bool = False) -> Iterator[ChunkResult]:
+    """
+    Yield (games played, win counts, record columns or None) per chunk, in chunk order.
+    """
+    return iter_planned(_run_chunk_args, planner,
+                        lambda chunk: (master_seed, *chunk, engine, snapshot, config, record), workers)
+
+
+def run_until(master_seed: int, workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE, engine: str = "object",
+              max_games: Optional[int] = None, target_ci: Optional[float] = None, time_budget: Optional[float] = None,
+              progress: Optional[Callable[[int, Optional[int]], None]] = None,
+              snapshot: Optional[GameSnapshot] = None, config: Dict = GAME_CONFIG,
+              store: Optional[ResultsWriter] = None, resume: Optional[RunSummary] = None,
+              checkpoint: Optional[Callable[[RunSummary], None]] = None) -> RunSummary:
+    """
+    Run games (or continuations of `snapshot`) until one of the stop conditions holds:
+      - max_games games have been played
+      - every faction's 95% Wilson interval half-width is <= target_ci
+      - time_budget seconds have elapsed
+
+    Chunks are merged in order and the CI rule is checked after each one,
+    so a seed gives the same result whatever the worker count (the time
+    budget is the only wall-clock dependent rule).
+
+    With a store, every game's record is appended to it in chunk order.
+
+    `resume` continues an interrupted run from its merged results: play
+    resumes at game index resume.games and its elapsed time counts against
+    the time budget. `checkpoint` is called with the run so far after every
+    chunk (see checkpoint.Checkpointer).
+    """
+    if max_games is None and target_ci is None and time_budget is None:
+        raise ValueError("run_until needs at least one stop condition")
+    if snapshot is not None and engine != "object":
+        raise ValueError("snapshots can only be continued by the object engine")
+
+    started = time.monotonic()
+    previous = resume.elapsed if resume is not None else 0.0
+    deadline = started + time_budget - previous if time_budget is not None else None
+    results = dict(resume.results) if resume is not None else {}
+    done = resume.games if resume is not None else 0
+    planner = ChunkPlanner(chunk_size, max_games=max_games, deadline=deadline, workers=workers, start=done)
+
+    chunks = iter_chunk_results(master_seed, planner, workers, engine, snapshot, config, store is not None)
+    for played, part, columns in chunks:
+        merge_results(results, part)
+        if store is not None:
+            store.append(columns)
+        done += played
+        planner.record(played)
+        if progress:
+            progress(done, max_games)
+        if checkpoint:
+            checkpoint(RunSummary(results, done, previous + time.monotonic() - started))
+        if target_ci is not None and done >= MIN_GAMES_FOR_CI and max_half_width(results, done) <= target_ci:
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+    chunks.close()
+
+    return RunSummary(results, done, previous + time.monotonic() - started)
+
+
+def run_games(num_games: int, master_seed: int, workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE,
+              progress: Optional[Callable[[int, int], None]] = None, engine: str = "object") -> Dict[str, int]:
+    """
+    Run num_games games spread over `workers` processes.
+    The returned results are identical for a given seed whatever the worker count.
+    """
+    return run_until(master_seed, workers, chunk_size, engine, max_games=num_games, progress=progress).results
+
+
+def rollout(snapshot: GameSnapshot, num_games: int, master_seed: int, workers: int = 1,
+            chunk_size: int = DEFAULT_CHUNK_SIZE, target_ci: Optional[float] = None) -> RunSummary:
+    """
+    Play up to num_games independent continuations of `snapshot` and return
+    the distribution of winners. Continuation i is seeded like game i of a
+    normal run, so two snapshots rolled out with the same seed share their
+    random streams as far as their states allow (useful for "what if" pairs).
+    """
+    return run_until(master_seed, workers, chunk_size, max_games=num_games, target_ci=target_ci, snapshot=snapshot)
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
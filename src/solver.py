@@ -0,0 +1,716 @@
+import argparse
+import itertools
+import json
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from config import GAME_CONFIG, RoleType, check_config
+from knowledge import ROLE_INDEX, NUM_ROLES, CERTAIN, prior_table
+from roles.werewolf import KILL_WEIGHTS
+from sweep import expand_grid, config_to_json
+
+WOLF = ROLE_INDEX[RoleType.WEREWOLF]
+VILLAGER = ROLE_INDEX[RoleType.VILLAGER]
+SEER = ROLE_INDEX[RoleType.SEER]
+WITCH = ROLE_INDEX[RoleType.WITCH]
+HUNTER = ROLE_INDEX[RoleType.HUNTER]
+IDIOT = ROLE_INDEX[RoleType.IDIOT]
+
+# Roles with a share_information step. Their relative seat order decides who
+# speaks first, which is the only way the deal affects the outcome.
+SPEAKERS = (SEER, WITCH, HUNTER)
+# Roles that run for Sheriff (Role.sheriff_candidacy_prob > 0.5)
+CANDIDATE_ROLES = (SEER, WITCH)
+
+ONEHOT = tuple(tuple(float(i == r) for i in range(NUM_ROLES)) for r in range(NUM_ROLES))
+ZERO = (0.0,) * NUM_ROLES
+
+# Fields of a player tuple. Beliefs about a player are stored with the
+# player (the target): PUB holds one row per listener role (the public
+# knowledge layer), PRIV the Seer's private row or -1. Rows and PUB tuples
+# are interned as ints (ExactSolver.rows / pubs), which keeps states cheap
+# to hash; a dead player's PUB is -1.
+ROLE, ALIVE, SHERIFF, BADGE, CHECKED, SAVED, POISONED, GOLD, REVEALED, PENDING, PUB, PRIV = range(12)
+# PENDING night deaths, announced in this order (a poisoned kill target dies once, as the kill)
+KILLED, POISON = 1, 2
+# Any dead player other than the Seer: nothing about them matters any more
+DEAD = (-1, False, False, False, False, False, False, False, False, 0, -1, -1)
+
+# State = ((speaker order, started, has antidote, has poison), sorted player tuples).
+# Seats are positions in the sorted tuple: players that agree on every field
+# are interchangeable, so sorting merges branches that only differ by who is who.
+State = Tuple[tuple, Tuple[tuple, ...]]
+
+
+def _rule_out(row: tuple, r: int) -> tuple:
+    """
+    KnowledgeMatrix.rule_out on one row.
+    """
+    p = row[r]
+    if p == 0:
+        return row
+    row = list(row)
+    row[r] = 0.0
+    if p < 0.999:
+        total = sum(row)
+        row = [x / total for x in row]
+    return tuple(row)
+
+
+class _Script:
+    """
+    Random choices of one replay of a stage: follows `path` and takes the
+    first option past its end, recording every fan-out so the caller can
+    step to the next path (odometer order).
+    """
+
+    def __init__(self, path: List[int]):
+        self.path = path
+        self.taken: List[int] = []
+        self.fan: List[int] = []
+        self.prob = 1.0
+
+    def pick(self, options: Sequence, weights: Sequence[float]):
+        n = len(options)
+        if n == 1:
+            return options[0]
+        k = len(self.taken)
+        i = self.path[k] if k < len(self.path) else 0
+        self.taken.append(i)
+        self.fan.append(n)
+        self.prob *= weights[i]
+        return options[i]
+
+    def next_path(self) -> Optional[List[int]]:
+        k = len(self.taken) - 1
+        while k >= 0 and self.taken[k] == self.fan[k] - 1:
+            k -= 1
+        if k < 0:
+            return None
+        return self.taken[:k] + [self.taken[k] + 1]
+
+
+class _Table:
+    """
+    One state being played through a stage: mutable copies of the player
+    tuples plus the global fields. Mirrors WerewolfGame and roles/ rule by
+    rule, with every random choice going through `pick`.
+    """
+
+    def __init__(self, solver: 'ExactSolver', state: State, pick: Callable):
+        self.solver = solver
+        (self.order, self.started, self.antidote, self.poison), players = state
+        self.ps = [list(p) for p in players]
+        self._pick = pick
+
+    def pick(self, seats: List[int], weights: Optional[List[float]] = None) -> int:
+        """
+        Random choice of a seat (uniform unless weighted). Players that agree
+        on every field are interchangeable, so only one of each such group
+        becomes a branch, carrying the group's total weight.
+        """
+        if len(seats) == 1:
+            return seats[0]
+        if weights is None:
+            weights = [1.0 / len(seats)] * len(seats)
+        groups: Dict[tuple, List] = {}
+        for i, w in zip(seats, weights):
+            key = tuple(self.ps[i])
+            if key in groups:
+                groups[key][1] += w
+            else:
+                groups[key] = [i, w]
+        options = list(groups.values())
+        return self._pick([i for i, _ in options], [w for _, w in options])
+
+    def freeze(self) -> State:
+        """
+        Canonical state. Fields that can no longer affect the game are
+        cleared first so that more branches merge: dead players are
+        anonymous (except the Seer, whom the Hunter may know to be dead),
+        and belief layers of roles with nobody left alive are zeroed, as
+        is what only a living Seer would use.
+        """
+        alive_roles = {p[ROLE] for p in self.ps if p[ALIVE]}
+        seer_alive = SEER in alive_roles
+        layers = tuple(r in alive_roles for r in self.solver.layer)
+        all_layers = all(layers)
+        players = []
+        for p in self.ps:
+            if not p[ALIVE] and p[ROLE] != SEER:
+                players.append(DEAD)
+                continue
+            pub = p[PUB] if all_layers else self.solver.masked_pub(p[PUB], layers)
+            if not p[ALIVE]:
+                players.append((SEER, False, False, False, False, False, False, False, False, 0, pub, -1))
+            elif seer_alive:
+                players.append((*p[:PUB], pub, p[PRIV]))
+            else:
+                players.append((*p[:BADGE], False, False, *p[SAVED:PUB], pub, -1))
+        return (self.order, self.started, self.antidote, self.poison), tuple(sorted(players))
+
+    # --- Lookups ---
+
+    def seat(self, role: int) -> Optional[int]:
+        for i, p in enumerate(self.ps):
+            if p[ROLE] == role:
+                return i
+        return None
+
+    def alive(self) -> List[int]:
+        return [i for i, p in enumerate(self.ps) if p[ALIVE]]
+
+    def flagged(self, field: int) -> Optional[int]:
+        for i, p in enumerate(self.ps):
+            if p[field]:
+                return i
+        return None
+
+    def belief(self, listener: int, target: int) -> tuple:
+        """
+        Listener's role distribution for target (KnowledgeView.row).
+        """
+        p = self.ps[target]
+        if listener == target or p[PUB] < 0:
+            return ZERO
+        solver = self.solver
+        role = self.ps[listener][ROLE]
+        if role == SEER and p[PRIV] >= 0:
+            return solver.rows[p[PRIV]]
+        return solver.rows[solver.pubs[p[PUB]][solver.layer[role]]]
+
+    def badge_flow_target(self) -> Optional[int]:
+        """
+        WerewolfGame.get_badge_flow_target: only while the Seer is alive and Sheriff.
+        """
+        seer = self.seat(SEER)
+        if seer is not None and self.ps[seer][ALIVE] and self.ps[seer][SHERIFF]:
+            return self.flagged(BADGE)
+        return None
+
+    def ties(self, listener: int, targets: List[int], role: int = WOLF) -> List[int]:
+        probs = [self.belief(listener, t)[role] for t in targets]
+        best = max(probs, default=None)
+        return [t for t, p in zip(targets, probs) if p == best]
+
+    # --- Public announcements ---
+
+    def mark_certain_all(self, t: int, r: int):
+        p = self.ps[t]
+        if p[PUB] >= 0:
+            p[PUB] = self.solver.certain_pub(r)
+        p[PRIV] = -1
+
+    def rule_out_all(self, t: int, r: int):
+        p = self.ps[t]
+        if p[PUB] >= 0:
+            p[PUB] = self.solver.rule_out_pub(p[PUB], r)
+        if p[PRIV] >= 0:
+            p[PRIV] = self.solver.rule_out_row(p[PRIV], r)
+
+    def winner(self) -> Optional[str]:
+        alive = [p[ROLE] for p in self.ps if p[ALIVE]]
+        if WOLF not in alive:
+            return "Good"
+        if VILLAGER not in alive:
+            return "Werewolves"
+        if not any(r != WOLF and r != VILLAGER for r in alive):
+            return "Werewolves"
+        return None
+
+    # --- Sharing ---
+
+    def share(self, i: int):
+        role = self.ps[i][ROLE]
+        if role == SEER:
+            self.seer_share(i)
+        elif role == WITCH:
+            self.witch_share(i)
+        elif role == HUNTER:
+            self.hunter_share(i)
+
+    def seer_share(self, s: int):
+        # 1. Share results of previous checks
+        wolves, gold = [], []
+        for t in range(len(self.ps)):
+            row = self.belief(s, t)
+            r = row.index(max(row))
+            if row[r] >= CERTAIN:
+                if r == WOLF:
+                    wolves.append(t)
+                elif r == VILLAGER:
+                    gold.append(t)
+        for t in wolves:
+            self.mark_certain_all(t, WOLF)
+        for t in gold:
+            self.rule_out_all(t, WOLF)
+            self.ps[t][GOLD] = True
+
+        # 2. Badge Flow Announcement (Designating FUTURE target)
+        if self.ps[s][SHERIFF]:
+            candidates = [i for i in self.alive() if i != s and not self.ps[i][CHECKED]]
+            if candidates:
+                target = self.pick(self.ties(s, candidates))
+                for p in self.ps:
+                    p[BADGE] = False
+                self.ps[target][BADGE] = True
+
+        # 3. Reveal self as Seer
+        self.mark_certain_all(s, SEER)
+
+    def witch_share(self, w: int):
+        for t, p in enumerate(self.ps):
+            if p[SAVED]:
+                self.rule_out_all(t, WOLF)
+        self.mark_certain_all(w, WITCH)
+
+    def hunter_share(self, h: int):
+        rule = self.solver.config.get("hunter_reveal", "seer_dead")
+        if self.ps[h][REVEALED] or rule == "never":
+            return
+        if rule == "seer_dead":
+            if not any(self.belief(h, t)[SEER] > 0.99 and not p[ALIVE] for t, p in enumerate(self.ps)):
+                return
+        self.ps[h][REVEALED] = True
+        self.mark_certain_all(h, HUNTER)
+
+    # --- Deaths ---
+
+    def die(self, i: int):
+        self.ps[i][ALIVE] = False
+
+    def sheriff_death(self, dead: int):
+        if not self.ps[dead][SHERIFF]:
+            return
+        self.ps[dead][SHERIFF] = False
+        alive = self.alive()
+        if not alive:
+            return
+        role = self.ps[dead][ROLE]
+        preferred = []
+        if role == SEER:
+            target = self.flagged(BADGE)
+            if target is not None:
+                if self.belief(dead, target)[WOLF] < 0.01:
+                    self.rule_out_all(target, WOLF)
+                    if self.ps[target][ALIVE]:
+                        self.ps[target][SHERIFF] = True
+                        return
+                else:
+                    self.mark_certain_all(target, WOLF)
+            for i in alive:
+                row = self.belief(dead, i)
+                if row[WOLF] < 0.01 and max(row) > 0.9:
+                    preferred.append(i)
+        elif role == WOLF:
+            preferred = [i for i in alive if self.ps[i][ROLE] == WOLF]
+        elif role == WITCH:
+            preferred = [i for i in alive if self.ps[i][SAVED]]
+        self.ps[self.pick(preferred or alive)][SHERIFF] = True
+
+    def on_death(self, i: int) -> List[int]:
+        # Hunter shoots the most suspicious player unless poisoned
+        if self.ps[i][ROLE] != HUNTER or self.ps[i][POISONED]:
+            return []
+        badge = self.badge_flow_target()
+        targets = [t for t in self.alive() if t != badge and t != i]
+        if targets:
+            return [self.pick(self.ties(i, targets))]
+        return []
+
+    def resolve_deaths(self, dead: List[int]) -> Optional[str]:
+        """
+        WerewolfGame.resolve_deaths: the winner as soon as a round of deaths
+        decides the game, None if it goes on.
+        """
+        pending: deque = deque()
+        while True:
+            if dead:
+                for i in dead:
+                    self.die(i)
+                winner = self.winner()
+                if winner:
+                    return winner
+                pending.extendleft(reversed(dead))
+            if not pending:
+                return None
+            i = pending.popleft()
+            self.sheriff_death(i)
+            dead = self.on_death(i)
+
+    # --- Voting ---
+
+    def own_vote(self, i: int) -> List[int]:
+        """
+        Options of Role.vote / Seer.vote without a suggestion (uniform among them).
+        """
+        targets = self.alive()
+        role = self.ps[i][ROLE]
+        if role != SEER and role != WOLF:
+            badge = self.badge_flow_target()
+            targets = [t for t in targets if t != badge]
+        return self.ties(i, targets)
+
+    def voting_leader(self) -> Optional[int]:
+        seer = self.seat(SEER)
+        if seer is not None and self.ps[seer][ALIVE]:
+            for i in self.alive():
+                if i != seer and self.ps[i][ROLE] != WOLF and self.belief(i, seer)[SEER] >= 0.99:
+                    return seer
+        sheriff = self.flagged(SHERIFF)
+        return sheriff if sheriff is not None and self.ps[sheriff][ALIVE] else None
+
+    def execution_odds(self, suggestion: Optional[int]) -> Dict[int, float]:
+        """
+        Probability of each player being executed, given the leader's
+        suggestion. Voters with a single option are counted up front, the
+        rest one at a time over every tally reachable so far.
+        """
+        alive = self.alive()
+        weight = self.solver.config.get("sheriff_vote_weight", 1.5)
+        base = [0.0] * len(self.ps)
+        undecided = []
+        for v in alive:
+            if self.ps[v][ROLE] != SEER and suggestion is not None and suggestion != v:
+                options = [suggestion]
+            else:
+                options = self.own_vote(v) or [t for t in alive if t != v]
+            w = weight if self.ps[v][SHERIFF] else 1.0
+            if len(options) == 1:
+                base[options[0]] += w
+            elif options:
+                undecided.append((options, w))
+
+        tallies = {tuple(base): 1.0}
+        for options, w in undecided:
+            nxt: Dict[tuple, float] = {}
+            for tally, p in tallies.items():
+                q = p / len(options)
+                for t in options:
+                    key = tally[:t] + (tally[t] + w,) + tally[t + 1:]
+                    nxt[key] = nxt.get(key, 0.0) + q
+            tallies = nxt
+
+        odds: Dict[int, float] = {}
+        for tally, p in tallies.items():
+            best = max(tally)
+            top = [t for t, c in enumerate(tally) if c == best]
+            for t in top:
+                odds[t] = odds.get(t, 0.0) + p / len(top)
+        return odds
+
+
+class SolverResult:
+    def __init__(self, win_probs: Dict[str, float], expected_days: float, states: int, stage_states: int, elapsed: float):
+        self.win_probs = win_probs
+        self.expected_days = expected_days
+        # Distinct states between two days, and distinct states after any stage
+        self.states = states
+        self.stage_states = stage_states
+        self.elapsed = elapsed
+
+
+class ExactSolver:
+    """
+    Exact win probabilities and expected game length, by walking the game
+    tree of the object engine's strategies.
+
+    Every random choice (tie-breaks, elections, successors) becomes a branch
+    weighted by its probability. A day is played as a chain of stages
+    (wolves, Seer, Witch, election, deaths, discussion, voting); after each
+    stage, branches that reached the same canonical state are merged, and
+    the value of each state between two days is memoised. Players only
+    matter through their role, flags and the beliefs about them, so states
+    are sorted player tuples and symmetric branches (which villager the
+    wolves kill) collapse into one.
+
+    The deal is summarised by the seat order of the Seer, Witch and Hunter,
+    who speak in id order; every order is equally likely. Like the batched
+    engine this supports at most one Seer, Witch and Hunter.
+    """
+
+    def __init__(self, config: Dict = GAME_CONFIG):
+        check_config(config)
+        counts = config["role_counts"]
+        for role_type in (RoleType.SEER, RoleType.WITCH, RoleType.HUNTER):
+            if counts.get(role_type, 0) > 1:
+                raise ValueError(f"Solver supports at most one {role_type.name}")
+        if config.get("beliefs", "independent") != "independent":
+            raise ValueError("Solver only models independent beliefs")
+        self.config = config
+        self.deck = sorted(ROLE_INDEX[r] for r, c in counts.items() for _ in range(c))
+        # Listener role -> index of its row in PUB (one public layer per role in the deck)
+        roles = sorted(set(self.deck))
+        self.layer = {r: i for i, r in enumerate(roles)}
+        self.priors = prior_table(config)
+        self.memo: Dict[State, Tuple[float, float, float]] = {}
+        self.stage_states = 0
+        # Scratch space shared by the replays of one stage from one state
+        self.stage_cache: Dict = {}
+        # Interned belief rows and PUB tuples (tuples of row ids), with
+        # their updates cached
+        self.rows: List[tuple] = []
+        self.pubs: List[tuple] = []
+        self._ids: Dict[tuple, int] = {}
+        self._pub_ids: Dict[tuple, int] = {}
+        self._updates: Dict[tuple, int] = {}
+
+    # --- Interned beliefs ---
+
+    def row_id(self, row: tuple) -> int:
+        i = self._ids.get(row)
+        if i is None:
+            i = self._ids[row] = len(self.rows)
+            self.rows.append(row)
+        return i
+
+    def pub_id(self, pub: tuple) -> int:
+        i = self._pub_ids.get(pub)
+        if i is None:
+            i = self._pub_ids[pub] = len(self.pubs)
+            self.pubs.append(pub)
+        return i
+
+    def rule_out_row(self, row: int, r: int) -> int:
+        key = ("row", row, r)
+        i = self._updates.get(key)
+        if i is None:
+            i = self._updates[key] = self.row_id(_rule_out(self.rows[row], r))
+        return i
+
+    def rule_out_pub(self, pub: int, r: int) -> int:
+        key = ("pub", pub, r)
+        i = self._updates.get(key)
+        if i is None:
+            i = self._updates[key] = self.pub_id(tuple(self.rule_out_row(row, r) for row in self.pubs[pub]))
+        return i
+
+    def certain_pub(self, r: int) -> int:
+        return self.pub_id((self.row_id(ONEHOT[r]),) * len(self.layer))
+
+    def masked_pub(self, pub: int, layers: Tuple[bool, ...]) -> int:
+        """
+        PUB with the rows of the listener roles not in `layers` zeroed.
+        """
+        key = ("mask", pub, layers)
+        i = self._updates.get(key)
+        if i is None:
+            zero = self.row_id(ZERO)
+            i = self._updates[key] = self.pub_id(tuple(row if keep else zero for row, keep in zip(self.pubs[pub], layers)))
+        return i
+
+    def initial_states(self) -> List[Tuple[float, State]]:
+        """
+        (probability, state) per seat order of the speaking roles.
+        """
+        speakers = [r for r in SPEAKERS if r in self.deck]
+        # Unless it reveals on day 1, the Hunter only speaks once the Seer is
+        # dead and its claim commutes with the Witch's: its seat doesn't matter
+        hunter_last = HUNTER in speakers and self.config.get("hunter_reveal", "seer_dead") != "day1"
+        if hunter_last:
+            speakers.remove(HUNTER)
+        orders = [order + ((HUNTER,) if hunter_last else ()) for order in itertools.permutations(speakers)]
+
+        players = []
+        for r in self.deck:
+            pub = self.pub_id(tuple(self.row_id(ONEHOT[WOLF] if listener == WOLF and r == WOLF
+                                                else tuple(self.priors[listener].tolist()))
+                                    for listener in self.layer))
+            players.append((r, True, False, False, False, False, False, False, False, 0, pub, -1))
+        players = tuple(sorted(players))
+        return [(1 / len(orders), ((order, False, True, True), players)) for order in orders]
+
+    def solve(self) -> SolverResult:
+        start = time.perf_counter()
+        good = wolves = days = 0.0
+        for p, state in self.initial_states():
+            g, w, d = self.value(state)
+            good += p * g
+            wolves += p * w
+            days += p * d
+        return SolverResult({"Good": good, "Werewolves": wolves}, days, len(self.memo), self.stage_states,
+                            time.perf_counter() - start)
+
+    def value(self, state: State) -> Tuple[float, float, float]:
+        """
+        (P(Good wins), P(Werewolves win), expected days left) from a state between two days.
+        """
+        cached = self.memo.get(state)
+        if cached is not None:
+            return cached
+        wins, after = self.play_day(state)
+        good, wolves, days = wins.get("Good", 0.0), wins.get("Werewolves", 0.0), 1.0
+        for nxt, p in after.items():
+            g, w, d = self.value(nxt)
+            good += p * g
+            wolves += p * w
+            days += p * d
+        self.memo[state] = (good, wolves, days)
+        return good, wolves, days
+
+    def play_day(self, state: State) -> Tuple[Dict[str, float], Dict[State, float]]:
+        """
+        One night and day from `state`: winner probabilities of the games
+        that end today, and the distribution of states reached otherwise.
+        """
+        stages = [self.wolves, self.seer, self.witch]
+        if not state[0][1] and self.config.get("sheriff_enabled", False):
+            stages.append(self.election)
+        stages += [self.deaths, self.discussion, self.voting]
+
+        wins: Dict[str, float] = {}
+        dist = {state: 1.0}
+        for stage in stages:
+            nxt: Dict[State, float] = {}
+            for s, p in dist.items():
+                for out, q in self.branch(stage, s).items():
+                    target = wins if isinstance(out, str) else nxt
+                    target[out] = target.get(out, 0.0) + p * q
+            dist = nxt
+            self.stage_states += len(dist)
+        return wins, dist
+
+    def branch(self, stage: Callable[[_Table], object], state: State) -> Dict[object, float]:
+        """
+        Every outcome of a stage (a winner name or the next state) with its
+        probability, replaying the stage once per combination of choices.
+        """
+        outcomes: Dict[object, float] = {}
+        self.stage_cache = {}
+        path: Optional[List[int]] = []
+        while path is not None:
+            script = _Script(path)
+            table = _Table(self, state, script.pick)
+            out = stage(table)
+            if out is None:
+                out = table.freeze()
+            outcomes[out] = outcomes.get(out, 0.0) + script.prob
+            path = script.next_path()
+        return outcomes
+
+    # --- Stages (WerewolfGame.run_night / run_day) ---
+
+    def wolves(self, t: _Table):
+        t.started = True
+        prey = [i for i in t.alive() if t.ps[i][ROLE] != WOLF]
+        if not prey:
+            return
+        layer = self.layer[WOLF]
+        rows = np.array([self.rows[self.pubs[t.ps[i][PUB]][layer]] for i in prey])
+        scores = (rows @ KILL_WEIGHTS).tolist()
+        for k, i in enumerate(prey):
+            p = t.ps[i]
+            if p[SAVED]:
+                scores[k] += 200
+            if p[GOLD]:
+                scores[k] += 300
+            if p[SHERIFF]:
+                scores[k] += 100
+        best = max(scores)
+        # Every wolf has the same beliefs and scores, so each picks uniformly
+        # among the same ties and the majority kill is uniform among them
+        kill = t.pick([i for i, s in zip(prey, scores) if s == best])
+        t.ps[kill][PENDING] = KILLED
+
+    def seer(self, t: _Table):
+        s = t.seat(SEER)
+        if s is None or not t.ps[s][ALIVE]:
+            return
+        target = t.flagged(BADGE)
+        if target is None or not t.ps[target][ALIVE] or t.ps[target][CHECKED]:
+            candidates = [i for i in t.alive() if t.ps[i][ROLE] != SEER and not t.ps[i][CHECKED]]
+            if not candidates:
+                return
+            target = t.pick(t.ties(s, candidates))
+        t.ps[target][CHECKED] = True
+        t.ps[target][PRIV] = self.row_id(ONEHOT[WOLF if t.ps[target][ROLE] == WOLF else VILLAGER])
+
+    def witch(self, t: _Table):
+        w = t.seat(WITCH)
+        if w is None or not t.ps[w][ALIVE]:
+            return
+        kill = t.flagged(PENDING)
+        if kill is not None and t.antidote:
+            t.antidote = False
+            t.ps[kill][PENDING] = 0
+            t.ps[kill][SAVED] = True
+            return
+        if t.poison:
+            badge = t.badge_flow_target()
+            targets = [i for i in t.alive() if i != w and i != badge]
+            probs = [t.belief(w, i)[WOLF] for i in targets]
+            best = max(probs, default=0.0)
+            if best > 0.25:
+                target = t.pick([i for i, p in zip(targets, probs) if p == best])
+                t.poison = False
+                t.ps[target][POISONED] = True
+                if not t.ps[target][PENDING]:
+                    t.ps[target][PENDING] = POISON
+
+    def election(self, t: _Table):
+        candidates = [t.seat(r) for r in t.order if r in CANDIDATE_ROLES]
+        candidates = [i for i in candidates if t.ps[i][ALIVE]]
+        if not candidates:
+            return
+        for i in candidates:
+            t.share(i)
+        seers = [i for i in candidates if t.ps[i][ROLE] == SEER]
+        t.ps[t.pick(seers or candidates)][SHERIFF] = True
+
+    def deaths(self, t: _Table):
+        dead = [i for _, i in sorted((p[PENDING], i) for i, p in enumerate(t.ps) if p[PENDING])]
+        for i in dead:
+            t.ps[i][PENDING] = 0
+        return t.resolve_deaths(dead)
+
+    def discussion(self, t: _Table):
+        for r in t.order:
+            i = t.seat(r)
+            if i is not None and t.ps[i][ALIVE]:
+                t.share(i)
+
+    def voting(self, t: _Table):
+        leader = t.voting_leader()
+        suggestion = None
+        if leader is not None:
+            options = t.own_vote(leader)
+            suggestion = t.pick(options) if options else None
+        # Replays of this stage share the tally for each suggestion
+        odds = self.stage_cache.get(suggestion)
+        if odds is None:
+            odds = self.stage_cache[suggestion] = t.execution_odds(suggestion)
+        executed = list(odds)
+        e = t.pick(executed, [odds[i] for i in executed])
+
+        p = t.ps[e]
+        if p[ROLE] == IDIOT and not p[REVEALED]:
+            # Idiot survives the first execution and flips its card
+            p[REVEALED] = True
+            t.mark_certain_all(e, IDIOT)
+            return None
+        return t.resolve_deaths([e])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact Werewolf win probabilities by game tree enumeration")
+    parser.add_argument("grid", nargs="?", default=None, help="JSON grid file (see sweep.expand_grid); default GAME_CONFIG")
+    args = parser.parse_args()
+
+    configs = [GAME_CONFIG]
+    if args.grid:
+        with open(args.grid, encoding="utf-8") as f:
+            configs = expand_grid(json.load(f))
+    for config in configs:
+        result = ExactSolver(config).solve()
+        if args.grid:
+            print(json.dumps(config_to_json(config), ensure_ascii=False))
+        print("--- Exact Results ---")
+        for faction, p in result.win_probs.items():
+            print(f"{faction}: {p * 100:.4f}%")
+        print(f"Expected game length: {result.expected_days:.4f} days")
+        print(f"States: {result.states} between days, {result.stage_states} after stages ({result.elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
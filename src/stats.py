@@ -0,0 +1,63 @@
+import math
+from typing import Dict, Optional, Tuple
+
+# Two-sided 95% normal quantile
+Z_95 = 1.959963984540054
+
+
+def wilson_interval(successes: int, n: int, z: float = Z_95) -> Tuple[float, float]:
+    """
+    Wilson score interval for a binomial proportion.
+    Well behaved for small n and rates near 0 or 1, unlike the normal approximation.
+    """
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def max_half_width(results: Dict[str, int], n: int, z: float = Z_95) -> float:
+    """
+    Widest interval half-width over every faction's win rate.
+    """
+    if n == 0:
+        return 1.0
+    widths = []
+    for wins in results.values():
+        lo, hi = wilson_interval(wins, n, z)
+        widths.append((hi - lo) / 2)
+    return max(widths, default=1.0)
+
+
+def paired_sprt(n: int, total: float, total_sq: float, delta: float,
+                alpha: float = 0.05, beta: float = 0.1) -> Optional[int]:
+    """
+    Two-sided sequential probability ratio test on the mean of n paired
+    differences (given as their sum and sum of squares), normal likelihood
+    with the sample variance plugged in. Two one-sided Wald tests of mean 0
+    against +delta and -delta, each at alpha / 2:
+
+      +1 / -1  mean is positive / negative (reject 0)
+       0       |mean| < delta (both tests accept 0)
+       None    keep sampling
+    """
+    if n == 0:
+        return None
+    mean = total / n
+    # Floor the variance so that a run of identical pairs can't end the test on its own
+    var = max(total_sq / n - mean * mean, 1.0 / n)
+    upper = math.log((1 - beta) / (alpha / 2))
+    lower = math.log(beta / (1 - alpha / 2))
+    drift = n * delta * delta / 2
+    llr_pos = (delta * total - drift) / var
+    llr_neg = (-delta * total - drift) / var
+    if llr_pos >= upper:
+        return 1
+    if llr_neg >= upper:
+        return -1
+    if llr_pos <= lower and llr_neg <= lower:
+        return 0
+    return None
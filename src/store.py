@@ -0,0 +1,169 @@
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from events import WINNER_CODES
+
+# Column name -> (dtype, per-game width). Width "players" means one entry per
+# seat, 0-padded; player ids are 1-based so 0 never names a player.
+COLUMNS: Dict[str, Tuple[str, Optional[str]]] = {
+    "seed": ("<i8", None),             # master seed of the run
+    "game": ("<i8", None),             # game index within the run
+    "config_id": ("<u2", None),        # sweep config id (0 for single-config runs)
+    "winner": ("u1", None),            # events.WINNER_CODES
+    "win_cause": ("u1", None),         # events.WinCause
+    "days": ("<u2", None),             # day count when the game ended
+    "death_order": ("<u2", "players"),      # player ids in order of death
+    "sheriff_history": ("<u2", "players"),  # ids of successive Sheriffs
+    "witch_saved": ("<u2", None),      # id saved by the antidote, 0 = never
+    "witch_poisoned": ("<u2", None),   # id poisoned, 0 = never
+}
+
+META_FILE = "meta.json"
+
+Columns = Dict[str, np.ndarray]
+
+
+def _shape(width: Optional[str], players: int) -> Tuple[int, ...]:
+    return (players,) if width == "players" else ()
+
+
+def _pad(rows: List[List[int]], players: int) -> np.ndarray:
+    out = np.zeros((len(rows), players), dtype=np.int64)
+    for i, row in enumerate(rows):
+        out[i, :len(row)] = row
+    return out
+
+
+def game_columns(games: list, seed: int, start: int, config_id: int, players: int) -> Columns:
+    """
+    Columns for finished WerewolfGames number start, start + 1, ...
+    """
+    n = len(games)
+    return {
+        "seed": np.full(n, seed),
+        "game": np.arange(start, start + n),
+        "config_id": np.full(n, config_id),
+        "winner": np.array([WINNER_CODES[g.winner] for g in games]),
+        "win_cause": np.array([int(g.win_cause) for g in games]),
+        "days": np.array([g.day_count for g in games]),
+        "death_order": _pad([g.death_order for g in games], players),
+        "sheriff_history": _pad([g.sheriff_history for g in games], players),
+        "witch_saved": np.array([g.witch_saved or 0 for g in games]),
+        "witch_poisoned": np.array([g.witch_poisoned or 0 for g in games]),
+    }
+
+
+def batch_columns(batch, seed: int, start: int, config_id: int, players: int) -> Columns:
+    """
+    Columns for a finished BatchedGame whose games are numbered from start.
+    """
+    n, p = batch.death_order.shape
+    pad = ((0, 0), (0, players - p))
+    return {
+        "seed": np.full(n, seed),
+        "game": np.arange(start, start + n),
+        "config_id": np.full(n, config_id),
+        "winner": batch.winners,
+        "win_cause": batch.win_causes,
+        "days": batch.days,
+        "death_order": np.pad(batch.death_order, pad),
+        "sheriff_history": np.pad(batch.sheriff_history, pad),
+        "witch_saved": batch.witch_saved,
+        "witch_poisoned": batch.witch_poisoned,
+    }
+
+
+def count_winners(columns: Columns) -> Dict[str, int]:
+    counts = np.bincount(columns["winner"], minlength=max(WINNER_CODES.values()) + 1)
+    return {name: int(counts[code]) for name, code in WINNER_CODES.items() if counts[code]}
+
+
+class ResultsWriter:
+    """
+    Appends per-game records to a directory of fixed-width binary columns,
+    one raw little-endian file per column plus meta.json with the row count.
+
+    Appending to an existing directory continues it; a partially written
+    append (e.g. after a crash) is cut back to the last recorded row count,
+    or to `rows` when resuming a checkpointed run that had recorded that many.
+    """
+
+    def __init__(self, directory: str, players: int, rows: Optional[int] = None):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        meta = read_meta(directory)
+        if meta is None:
+            self.players = players
+            self.rows = 0
+        else:
+            self.players = meta["players"]
+            self.rows = meta["rows"]
+            if players > self.players:
+                raise ValueError(f"{directory} holds games of up to {self.players} players, not {players}")
+        if rows is not None:
+            if rows > self.rows:
+                raise ValueError(f"{directory} holds {self.rows} games, the checkpoint expects {rows}")
+            self.rows = rows
+        for name, (dtype, width) in COLUMNS.items():
+            row_bytes = np.dtype(dtype).itemsize * int(np.prod(_shape(width, self.players)))
+            with open(self._path(name), "ab") as f:
+                f.truncate(self.rows * row_bytes)
+        self._write_meta()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.bin")
+
+    def _write_meta(self):
+        meta = {
+            "rows": self.rows,
+            "players": self.players,
+            "columns": {name: [dtype, list(_shape(width, self.players))] for name, (dtype, width) in COLUMNS.items()},
+        }
+        tmp = os.path.join(self.directory, META_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.directory, META_FILE))
+
+    def append(self, columns: Columns):
+        n = len(columns["winner"])
+        if not n:
+            return
+        for name, (dtype, width) in COLUMNS.items():
+            data = np.asarray(columns[name])
+            if width == "players" and data.shape[1] < self.players:
+                data = np.pad(data, ((0, 0), (0, self.players - data.shape[1])))
+            with open(self._path(name), "ab") as f:
+                f.write(np.ascontiguousarray(data, dtype=dtype).tobytes())
+        self.rows += n
+        self._write_meta()
+
+
+def read_meta(directory: str) -> Optional[Dict]:
+    path = os.path.join(directory, META_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def open_results(directory: str) -> Columns:
+    """
+    Every column of a results directory as a read-only numpy.memmap
+    (nothing is loaded until it is scanned), e.g.
+
+        cols = open_results("results")
+        good = (cols["winner"] == WINNER_CODES["Good"]).mean()
+    """
+    meta = read_meta(directory)
+    if meta is None:
+        raise FileNotFoundError(f"No {META_FILE} in {directory}")
+    rows = meta["rows"]
+    columns = {}
+    for name, (dtype, shape) in meta["columns"].items():
+        shape = (rows, *shape)
+        if rows == 0:
+            columns[name] = np.zeros(shape, dtype=dtype)
+        else:
+            columns[name] = np.memmap(os.path.join(directory, f"{name}.bin"), dtype=dtype, mode="r", shape=shape)
+    return columns
@@ -0,0 +1,178 @@
+import argparse
+import itertools
+import json
+import logging
+import random
+import time
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, Optional, Tuple
+from config import GAME_CONFIG, BELIEF_MODELS, HUNTER_REVEAL_RULES, RoleType
+from runner import run_chunk, run_chunk_records, merge_results, default_workers, _init_worker, DEFAULT_CHUNK_SIZE, BATCH_CHUNK_SIZE, ENGINES
+from stats import wilson_interval
+from store import Columns, ResultsWriter, count_winners
+from utils import logger, parse_seed
+
+# Grid keys besides role_counts, with their allowed values (None = any)
+SWEEP_KEYS = {
+    "sheriff_enabled": (True, False),
+    "sheriff_vote_weight": None,
+    "hunter_reveal": HUNTER_REVEAL_RULES,
+    "beliefs": BELIEF_MODELS,
+}
+
+
+def _axis(value) -> list:
+    return value if isinstance(value, list) else [value]
+
+
+def expand_grid(grid: Dict) -> List[Dict]:
+    """
+    Every combination of a grid, as full game configs based on GAME_CONFIG.
+
+    A grid looks like GAME_CONFIG with role names as keys, where any value may
+    be a list of alternatives:
+
+        {"role_counts": {"WEREWOLF": [3, 4], "VILLAGER": 4},
+         "sheriff_enabled": [true, false], "hunter_reveal": ["seer_dead", "never"]}
+    """
+    axes: List[Tuple[Tuple[str, ...], list]] = []
+    for name, value in grid.get("role_counts", {}).items():
+        if name not in RoleType.__members__:
+            raise ValueError(f"Unknown role {name!r} in grid")
+        axes.append((("role_counts", name), _axis(value)))
+    for key, value in grid.items():
+        if key == "role_counts":
+            continue
+        if key not in SWEEP_KEYS:
+            raise ValueError(f"Unknown grid key {key!r}")
+        allowed = SWEEP_KEYS[key]
+        for v in _axis(value):
+            if allowed is not None and v not in allowed:
+                raise ValueError(f"{key} must be one of {allowed}, got {v!r}")
+        axes.append(((key,), _axis(value)))
+
+    configs = []
+    for combo in itertools.product(*(values for _, values in axes)):
+        config = dict(GAME_CONFIG)
+        config["role_counts"] = dict(GAME_CONFIG["role_counts"])
+        for (path, _), value in zip(axes, combo):
+            if path[0] == "role_counts":
+                config["role_counts"][RoleType[path[1]]] = value
+            else:
+                config[path[0]] = value
+        config["role_counts"] = {r: c for r, c in config["role_counts"].items() if c > 0}
+        configs.append(config)
+    return configs
+
+
+def config_to_json(config: Dict) -> Dict:
+    out = {k: v for k, v in config.items() if k != "role_counts"}
+    out["role_counts"] = {r.name: c for r, c in config["role_counts"].items()}
+    return out
+
+
+def config_from_json(data: Dict) -> Dict:
+    config = dict(data)
+    config["role_counts"] = {RoleType[name]: c for name, c in data["role_counts"].items()}
+    return config
+
+
+def iter_work_items(num_configs: int, games_per_config: int, chunk_size: int) -> Iterator[Tuple[int, int, int]]:
+    """
+    (config id, start, count) work items, round-robin over configs: chunk 0 of
+    every config, then chunk 1 of every config, ... so all configs advance together.
+    """
+    for start in range(0, games_per_config, chunk_size):
+        count = min(chunk_size, games_per_config - start)
+        for config_id in range(num_configs):
+            yield config_id, start, count
+
+
+def _run_item(args: Tuple[int, int, int, int, str, Dict, bool]) -> Tuple[int, int, Dict[str, int], Optional[Columns]]:
+    config_id, master_seed, start, count, engine, config, record = args
+    if record:
+        columns = run_chunk_records(master_seed, start, count, engine, config=config, config_id=config_id)
+        return config_id, count, count_winners(columns), columns
+    return config_id, count, run_chunk(master_seed, start, count, engine, config=config), None
+
+
+def run_sweep(configs: List[Dict], games_per_config: int, master_seed: int, out_path: str, workers: int = 1,
+              chunk_size: int = DEFAULT_CHUNK_SIZE, engine: str = "object",
+              store: Optional[ResultsWriter] = None) -> Dict[int, Dict[str, int]]:
+    """
+    Play games_per_config games of every config on one shared pool and append
+    one JSON line per config to out_path as soon as its last chunk is in.
+    With a store, per-game records are appended as chunks complete.
+
+    Every config uses the same master seed, so game i of two configs starts
+    from the same random stream. Per-config results do not depend on the
+    worker count or on completion order.
+    """
+    items = [(config_id, master_seed, start, count, engine, configs[config_id], store is not None)
+             for config_id, start, count in iter_work_items(len(configs), games_per_config, chunk_size)]
+    chunks_left = {config_id: 0 for config_id in range(len(configs))}
+    for item in items:
+        chunks_left[item[0]] += 1
+
+    results: Dict[int, Dict[str, int]] = {config_id: {} for config_id in range(len(configs))}
+    started = time.monotonic()
+    with open(out_path, "a", encoding="utf-8") as out:
+        def finish(config_id: int, count: int, part: Dict[str, int], columns: Optional[Columns]):
+            merge_results(results[config_id], part)
+            if store is not None:
+                store.append(columns)
+            chunks_left[config_id] -= 1
+            if chunks_left[config_id]:
+                return
+            wins = results[config_id]
+            record = {
+                "config_id": config_id,
+                "config": config_to_json(configs[config_id]),
+                "seed": master_seed,
+                "games": games_per_config,
+                "results": dict(sorted(wins.items())),
+                "ci95": {f: wilson_interval(w, games_per_config) for f, w in sorted(wins.items())},
+                "elapsed": round(time.monotonic() - started, 3),
+            }
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            logger.info(f"Config {config_id} done: {record['results']}")
+
+        if workers <= 1:
+            for item in items:
+                finish(*_run_item(item))
+        else:
+            with Pool(processes=workers, initializer=_init_worker) as pool:
+                for done in pool.imap_unordered(_run_item, items):
+                    finish(*done)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Werewolf Simulator parameter sweep")
+    parser.add_argument("grid", help="JSON grid file (see sweep.expand_grid)")
+    parser.add_argument("-n", "--num_games", type=int, default=10000, help="Games per configuration")
+    parser.add_argument("-w", "--workers", type=int, default=0, help=f"Number of worker processes (0 = all {default_workers()} cores)")
+    parser.add_argument("-s", "--seed", type=parse_seed, default=None, help="Master seed, shared by every configuration")
+    parser.add_argument("--chunk-size", type=int, default=None, help=f"Games per work unit (default {DEFAULT_CHUNK_SIZE}, {BATCH_CHUNK_SIZE} for the batch engine)")
+    parser.add_argument("-e", "--engine", choices=ENGINES, default="object")
+    parser.add_argument("-o", "--output", default="sweep_results.jsonl", help="JSON lines file, appended one line per finished configuration")
+    parser.add_argument("--records", default=None, help="Also append every game's record to this columnar results directory (see store.py)")
+    args = parser.parse_args()
+
+    with open(args.grid, encoding="utf-8") as f:
+        configs = expand_grid(json.load(f))
+    workers = args.workers if args.workers > 0 else default_workers()
+    seed = args.seed if args.seed is not None else random.SystemRandom().getrandbits(31)
+    chunk_size = args.chunk_size or (BATCH_CHUNK_SIZE if args.engine == "batch" else DEFAULT_CHUNK_SIZE)
+
+    logger.setLevel(logging.INFO)
+    logger.info(f"Sweeping {len(configs)} configs x {args.num_games} games on {workers} worker(s) (seed {seed}) -> {args.output}")
+    store = None
+    if args.records:
+        store = ResultsWriter(args.records, max(sum(c["role_counts"].values()) for c in configs))
+    run_sweep(configs, args.num_games, seed, args.output, workers, chunk_size, args.engine, store)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 
+import argparse
 import logging
 import sys
 
@@ -15,3 +16,24 @@ def setup_logger(name="WerewolfGame"):
     return logger
 
 logger = setup_logger()
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+def parse_duration(text: str) -> float:
+    """
+    Parse "30", "30s", "2m" or "1h" into seconds.
+    """
+    text = text.strip().lower()
+    unit = _DURATION_UNITS.get(text[-1:])
+    if unit:
+        return float(text[:-1]) * unit
+    return float(text)
+
+def parse_seed(text: str) -> int:
+    """
+    A master seed: a non-negative integer (traces and batch seeds store it unsigned).
+    """
+    seed = int(text)
+    if seed < 0:
+        raise argparse.ArgumentTypeError(f"seed must be non-negative, got {seed}")
+    return seed
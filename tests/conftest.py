@@ -0,0 +1,14 @@
+import logging
+import pytest
+from utils import logger
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    """
+    No game log while tests play thousands of games.
+    """
+    level = logger.level
+    logger.setLevel(logging.WARNING)
+    yield
+    logger.setLevel(level)
@@ -0,0 +1,82 @@
+import itertools
+import random
+import numpy as np
+import pytest
+from beliefs import ALL_ROLES, _fallback_row, group_masks, role_marginals
+from config import RoleType
+from knowledge import NUM_ROLES, ROLE_INDEX
+
+
+def random_deck(rnd: random.Random) -> tuple:
+    """
+    Cards per role index, 2 to 8 cards in all.
+    """
+    pool = [0] * NUM_ROLES
+    for _ in range(rnd.randint(2, 8)):
+        pool[rnd.randrange(NUM_ROLES)] += 1
+    return tuple(pool)
+
+
+def random_masks(rnd: random.Random, pool: tuple, consistent: bool) -> list:
+    """
+    One mask per card. Consistent masks always allow the card they were
+    drawn for; otherwise roles are struck at random and can leave no deal.
+    """
+    deck = [r for r, c in enumerate(pool) for _ in range(c)]
+    rnd.shuffle(deck)
+    masks = []
+    for r in deck:
+        mask = ALL_ROLES
+        for _ in range(rnd.randint(0, 4)):
+            other = rnd.randrange(NUM_ROLES)
+            if other != r or not consistent:
+                mask &= ~(1 << other)
+        if rnd.random() < 0.2:
+            mask = 1 << (r if consistent else rnd.randrange(NUM_ROLES))
+        masks.append(mask)
+    return masks
+
+
+def enumerate_marginals(pool: tuple, masks: list):
+    """
+    (role distribution per player, consistent deals) by trying every distinct deal.
+    """
+    deck = [r for r, c in enumerate(pool) for _ in range(c)]
+    counts = np.zeros((len(masks), NUM_ROLES))
+    deals = 0
+    for deal in set(itertools.permutations(deck)):
+        if all(mask >> r & 1 for mask, r in zip(masks, deal)):
+            deals += 1
+            counts[np.arange(len(deal)), deal] += 1
+    return (counts / deals if deals else counts), deals
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_role_marginals_match_enumeration(seed):
+    rnd = random.Random(seed)
+    pool = random_deck(rnd)
+    masks = random_masks(rnd, pool, consistent=seed % 3 != 0)
+    groups = group_masks(masks)
+    expected, deals = enumerate_marginals(pool, masks)
+    got = role_marginals(pool, groups)[masks]
+    if deals:
+        assert np.allclose(got, expected)
+    else:
+        assert np.allclose(got, [_fallback_row(pool, groups, mask) for mask in masks])
+
+
+def test_no_consistent_deal_falls_back():
+    # One wolf card, but two players known to be wolves and one known not to be
+    w, v, s = ROLE_INDEX[RoleType.WEREWOLF], ROLE_INDEX[RoleType.VILLAGER], ROLE_INDEX[RoleType.SEER]
+    pool = tuple(int(r in (w, v, s)) for r in range(NUM_ROLES))
+    wolf = 1 << w
+    masks = [wolf, wolf, ALL_ROLES & ~wolf]
+    assert enumerate_marginals(pool, masks)[1] == 0
+    groups = group_masks(masks)
+    table = role_marginals(pool, groups)
+    for mask in masks:
+        assert np.array_equal(table[mask], _fallback_row(pool, groups, mask))
+    assert table[wolf, w] == 1.0
+    # The third player can only hold the cards nobody is known to hold
+    assert table[ALL_ROLES & ~wolf, v] == table[ALL_ROLES & ~wolf, s] == 0.5
+    assert not table.flags.writeable
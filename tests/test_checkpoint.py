@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from checkpoint import Checkpoint, Checkpointer, load_checkpoint
+from config import GAME_CONFIG
+from runner import RunSummary, run_until
+from store import ResultsWriter, open_results
+
+SEED = 11
+GAMES = 2000
+CHUNK = {"object": 100, "batch": 256}
+PLAYERS = sum(GAME_CONFIG["role_counts"].values())
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.mark.parametrize("engine", ["object", "batch"])
+def test_resumed_run_matches_uninterrupted(tmp_path, engine):
+    chunk = CHUNK[engine]
+    full = run_until(SEED, chunk_size=chunk, engine=engine, max_games=GAMES,
+                     store=ResultsWriter(str(tmp_path / "full"), PLAYERS))
+
+    # Checkpoint after the third chunk, then keep playing (and recording)
+    # two more chunks before dying, as a crash between checkpoints would
+    path = str(tmp_path / "run.ckpt")
+    store = ResultsWriter(str(tmp_path / "part"), PLAYERS)
+    settings = {"num_games": GAMES, "seed": SEED, "engine": engine, "chunk_size": chunk}
+    checkpointer = Checkpointer(path, Checkpoint(settings, GAME_CONFIG), every=1e9, store=store)
+
+    def crash(summary: RunSummary):
+        checkpointer(summary)
+        if summary.games == 3 * chunk:
+            checkpointer.save()
+        if summary.games == 5 * chunk:
+            raise Interrupted
+
+    with pytest.raises(Interrupted):
+        run_until(SEED, chunk_size=chunk, engine=engine, max_games=GAMES, store=store, checkpoint=crash)
+
+    saved = load_checkpoint(path)
+    assert (saved.games, saved.records, saved.finished) == (3 * chunk, 3 * chunk, False)
+    store = ResultsWriter(str(tmp_path / "part"), PLAYERS, rows=saved.records)
+    resumed = run_until(saved.settings["seed"], chunk_size=saved.settings["chunk_size"], engine=saved.settings["engine"],
+                        max_games=saved.settings["num_games"], config=saved.config, store=store, resume=saved.summary)
+
+    assert resumed.games == full.games == GAMES
+    assert resumed.results == full.results
+    expected, got = open_results(str(tmp_path / "full")), open_results(str(tmp_path / "part"))
+    for name in expected:
+        assert np.array_equal(expected[name], got[name]), name
+
+
+def test_finished_checkpoint_round_trips(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    checkpointer = Checkpointer(path, Checkpoint({"seed": SEED}, GAME_CONFIG))
+    summary = run_until(SEED, chunk_size=100, max_games=300, checkpoint=checkpointer)
+    checkpointer.finish(summary)
+    saved = load_checkpoint(path)
+    assert saved.finished
+    assert saved.config == GAME_CONFIG
+    assert (saved.summary.results, saved.summary.games) == (summary.results, summary.games)
@@ -0,0 +1,61 @@
+import json
+import pytest
+from cluster import Coordinator, run_coordinator, start_workers
+from runner import run_chunk, run_until
+from sweep import config_from_json, expand_grid, run_sweep
+
+SEED = 5
+GAMES = 600
+CHUNK = 200
+CONFIGS = expand_grid({"hunter_reveal": ["seer_dead", "day1"]})
+
+
+@pytest.fixture(scope="module")
+def sweep_results(tmp_path_factory):
+    out = tmp_path_factory.mktemp("sweep") / "sweep.jsonl"
+    return run_sweep(CONFIGS, GAMES, SEED, str(out), chunk_size=CHUNK)
+
+
+def play(coordinator: Coordinator, unit_id: int):
+    message = coordinator.unit_message(unit_id)
+    return run_chunk(message["seed"], message["start"], message["count"], message["engine"],
+                     config=config_from_json(message["config"]))
+
+
+def test_sweep_matches_run_until(sweep_results):
+    for config_id, config in enumerate(CONFIGS):
+        assert sweep_results[config_id] == run_until(SEED, chunk_size=CHUNK, max_games=GAMES, config=config).results
+
+
+def test_merge_ignores_completion_order_retries_and_steals(sweep_results):
+    coordinator = Coordinator(CONFIGS, GAMES, SEED, CHUNK, steal_after=0.0)
+    # A worker takes the first unit and drops off; it goes back to the queue
+    coordinator.next_unit("lost")
+    coordinator.worker_lost("lost")
+    taken = [coordinator.next_unit("a") for _ in coordinator.units]
+    assert sorted(taken) == list(range(len(coordinator.units)))
+    # Nothing queued any more, so an idle worker steals a running unit
+    stolen = coordinator.next_unit("b")
+    coordinator.complete("b", stolen, play(coordinator, stolen))
+    for unit_id in reversed(taken):
+        coordinator.complete("a", unit_id, play(coordinator, unit_id))
+
+    assert coordinator.finished
+    assert (coordinator.retried, coordinator.stolen) == (1, 1)
+    for config_id in range(len(CONFIGS)):
+        assert coordinator.config_results(config_id) == sweep_results[config_id]
+
+
+def test_tcp_workers_match_sweep(tmp_path, sweep_results):
+    out = tmp_path / "cluster.jsonl"
+    coordinator = Coordinator(CONFIGS, GAMES, SEED, CHUNK)
+    workers = []
+    try:
+        results = run_coordinator(coordinator, ("127.0.0.1", 0), str(out),
+                                  ready=lambda port: workers.extend(start_workers("127.0.0.1", port, 2)))
+    finally:
+        for p in workers:
+            p.join(timeout=10)
+    assert results == sweep_results
+    records = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert {r["config_id"]: r["results"] for r in records} == sweep_results
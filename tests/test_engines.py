@@ -0,0 +1,38 @@
+import math
+import pytest
+from config import GAME_CONFIG, HUNTER_REVEAL_RULES
+from runner import run_until
+from solver import ExactSolver
+
+# The batched engine is cheap enough to resolve biases of a few tenths of a percent
+BATCH_GAMES = 300_000
+OBJECT_GAMES = 20_000
+# Runs are seeded, so this only has to keep a sound engine clear of the edge
+SIGMAS = 4
+SEED = 1
+
+
+def wolf_rate(config, engine: str, games: int) -> float:
+    results = run_until(SEED, engine=engine, max_games=games, config=config).results
+    return results.get("Werewolves", 0) / games
+
+
+def standard_error(p: float, games: int) -> float:
+    return math.sqrt(p * (1 - p) / games)
+
+
+@pytest.mark.parametrize("rule", HUNTER_REVEAL_RULES)
+def test_engines_agree_with_solver(rule):
+    """
+    Batched and object engine win rates against the solver's exact one,
+    for every Hunter reveal rule (seer_dead is the default config).
+    """
+    config = {**GAME_CONFIG, "hunter_reveal": rule}
+    exact = ExactSolver(config).solve().win_probs["Werewolves"]
+    batch = wolf_rate(config, "batch", BATCH_GAMES)
+    obj = wolf_rate(config, "object", OBJECT_GAMES)
+    batch_se = standard_error(exact, BATCH_GAMES)
+    object_se = standard_error(exact, OBJECT_GAMES)
+    assert abs(batch - exact) <= SIGMAS * batch_se
+    assert abs(obj - exact) <= SIGMAS * object_se
+    assert abs(batch - obj) <= SIGMAS * math.hypot(batch_se, object_se)
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+from config import GAME_CONFIG
+from runner import run_games, run_until
+from store import ResultsWriter, count_winners, open_results
+
+SEED = 7
+PLAYERS = sum(GAME_CONFIG["role_counts"].values())
+
+
+@pytest.mark.parametrize("engine, games, chunk", [("object", 2000, 250), ("batch", 20000, 2048)])
+def test_results_do_not_depend_on_worker_count(engine, games, chunk):
+    single = run_games(games, SEED, workers=1, chunk_size=chunk, engine=engine)
+    pooled = run_games(games, SEED, workers=2, chunk_size=chunk, engine=engine)
+    assert sum(single.values()) == games
+    assert single == pooled
+
+
+@pytest.mark.parametrize("engine, games, chunk", [("object", 1000, 250), ("batch", 8192, 2048)])
+def test_records_match_plain_run(tmp_path, engine, games, chunk):
+    plain = run_until(SEED, chunk_size=chunk, engine=engine, max_games=games)
+    store = ResultsWriter(str(tmp_path / "records"), PLAYERS)
+    recorded = run_until(SEED, workers=2, chunk_size=chunk, engine=engine, max_games=games, store=store)
+    assert recorded.results == plain.results
+    columns = open_results(str(tmp_path / "records"))
+    assert count_winners(columns) == plain.results
+    assert np.array_equal(columns["game"], np.arange(games))